@@ -0,0 +1,251 @@
+import math
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from loguru import logger
+from app.importer import DEFAULT_BATCH_SIZE, chunked, run_batch
+from app.metrics import observe_query
+from app.snapshot import LOAD_EDGES_QUERY
+
+AGGREGATE_FIELDS = ('directReports', 'totalReports', 'depth', 'maxDepthBelow')
+# Pre-order interval of the employee in the spanning tree; see compute_aggregates
+INTERVAL_FIELDS = ('dfsIn', 'dfsOut', 'dfsExact')
+# Spare numbers a freshly labelled subtree keeps per employee in it, for reports added later
+INTERVAL_SLACK = 1
+STORED_FIELDS = AGGREGATE_FIELDS + INTERVAL_FIELDS
+
+LOAD_AGGREGATES_QUERY = (
+    "MATCH (e:Employee) "
+    "RETURN id(e) AS id, e.directReports AS directReports, e.totalReports AS totalReports, "
+    "e.depth AS depth, e.maxDepthBelow AS maxDepthBelow, "
+    "e.dfsIn AS dfsIn, e.dfsOut AS dfsOut, e.dfsExact AS dfsExact"
+)
+
+SET_AGGREGATES = (
+    "UNWIND $rows AS row "
+    "MATCH (e:Employee) WHERE id(e) = row.id "
+    "SET e.directReports = row.directReports, e.totalReports = row.totalReports, "
+    "e.depth = row.depth, e.maxDepthBelow = row.maxDepthBelow, "
+    "e.dfsIn = row.dfsIn, e.dfsOut = row.dfsOut, e.dfsExact = row.dfsExact"
+)
+
+# Makes readers walk MANAGES edges again; for when the labels can no longer be trusted
+CLEAR_EXACT_INTERVALS = (
+    "MATCH (e:Employee) WHERE e.dfsExact = true "
+    "SET e.dfsExact = false "
+    "RETURN count(e) AS cleared"
+)
+
+
+def _fit(low: int, high: float, taken: Sequence[Tuple[int, int]], widths: Sequence[int]) -> Optional[List[int]]:
+    """First-fit blocks of ``widths`` numbers into ``(low, high]`` around the sorted ``taken`` intervals.
+
+    Returns the start of every block, or None when one does not fit.
+    """
+    gaps = []
+    start = low + 1
+    for first, last in taken:
+        if first > start:
+            gaps.append([start, first - 1])
+        start = last + 1
+    gaps.append([start, high])
+    starts = []
+    for width in widths:
+        for gap in gaps:
+            if gap[1] - gap[0] + 1 >= width:
+                starts.append(gap[0])
+                gap[0] += width
+                break
+        else:
+            return None
+    return starts
+
+
+def _arrange(low: int, high: float, children: List[int], keep: Dict, previous: Mapping[int, Tuple[int, int]],
+             width: Dict[int, int]) -> Optional[Tuple[List[int], Dict[int, int]]]:
+    """Children that keep their stored interval inside ``(low, high]`` and block starts for the others."""
+    kept = []
+    last = low
+    inside = (c for c in children if c in keep and low < previous[c][0] and previous[c][1] <= high)
+    for child in sorted(inside, key=lambda c: previous[c][0]):
+        if previous[child][0] > last:
+            kept.append(child)
+            last = previous[child][1]
+    kept_set = set(kept)
+    fresh = [c for c in children if c not in kept_set]
+    starts = _fit(low, high, [previous[c] for c in kept], [width[c] for c in fresh])
+    if starts is None:
+        return None
+    return kept, dict(zip(fresh, starts))
+
+
+def _label_intervals(order: List[int], tree_parent: Dict[int, int], tree_children: Dict[int, List[int]],
+                     total: Dict[int, int], previous: Mapping[int, Tuple[int, int]]) -> Dict[int, Tuple[int, int]]:
+    """Nested ``(dfsIn, dfsOut)`` intervals, reusing ``previous`` wherever it still nests.
+
+    A subtree labelled from scratch takes ``1 + INTERVAL_SLACK`` numbers per
+    employee; the spare numbers sit at the end of every interval. Bottom-up,
+    an employee keeps its stored interval when the children that keep theirs
+    still fit inside it and the other children's fresh blocks fit in the
+    gaps. So a new or moved report relabels only its own subtree, plus the
+    closest managers whose gaps were too small.
+    """
+    width: Dict[int, int] = {}
+    keep: Dict[int, Tuple[List[int], Dict[int, int]]] = {}
+    for i in reversed(order):
+        width[i] = 1 + sum(width[child] for child in tree_children[i]) + INTERVAL_SLACK * (1 + total[i])
+        if i in previous:
+            arrangement = _arrange(previous[i][0], previous[i][1], tree_children[i], keep, previous, width)
+            if arrangement is not None:
+                keep[i] = arrangement
+
+    # The roots share an unbounded range, so arranging them always succeeds
+    roots = [i for i in order if i not in tree_parent]
+    kept, starts = _arrange(-1, math.inf, roots, keep, previous, width)
+    labels: Dict[int, Tuple[int, int]] = {}
+    stack = [(i, None) for i in kept] + list(starts.items())
+    while stack:
+        i, start = stack.pop()
+        if start is None:
+            labels[i] = previous[i]
+            kept, starts = keep[i]
+            stack.extend((child, None) for child in kept)
+            stack.extend(starts.items())
+        else:
+            labels[i] = (start, start + width[i] - 1)
+            position = start + 1
+            for child in tree_children[i]:
+                stack.append((child, position))
+                position += width[child]
+    return labels
+
+
+def compute_aggregates(ids: Iterable[int], edges: Iterable[Tuple[int, int]],
+                       previous: Optional[Mapping[int, Tuple[Optional[int], Optional[int]]]] = None
+                       ) -> Dict[int, Dict[str, Optional[int]]]:
+    """Headcount, span of control, depth and interval labels for every employee in O(nodes + edges).
+
+    A breadth-first pass from every root (employee without a manager) fixes
+    ``depth`` and a spanning tree; walking that order backwards is a
+    post-order pass that sums ``totalReports`` and ``maxDepthBelow`` up the
+    tree, so an employee with two managers is counted once. Roots and
+    reports are visited in id order, so the spanning tree does not depend on
+    the order the database returns them in. Employees only reachable through
+    a cycle keep ``None`` for everything but ``directReports``.
+
+    ``dfsIn`` numbers the spanning tree in pre-order and ``dfsOut`` is the
+    last number reserved for the employee's subtree, so ``x`` is below ``y``
+    when ``y.dfsIn < x.dfsIn <= y.dfsOut``. Numbering leaves gaps, and the
+    ``previous`` ``(dfsIn, dfsOut)`` of every employee are kept where they
+    still nest (see _label_intervals), so a small import rewrites few labels.
+    ``dfsExact`` is true when every MANAGES edge leaving the subtree stays
+    inside the interval, i.e. the interval is exactly the set reachable from
+    the employee; a second manager or a cycle elsewhere in the reporting
+    line makes it false.
+    """
+    children: Dict[int, List[int]] = {i: [] for i in sorted(ids)}
+    has_manager = set()
+    for source, target in edges:
+        if source in children and target in children:
+            children[source].append(target)
+            has_manager.add(target)
+    for reports in children.values():
+        reports.sort()
+
+    depth: Dict[int, int] = {}
+    tree_parent: Dict[int, int] = {}
+    order: List[int] = []
+    queue = deque()
+    for i in children:
+        if i not in has_manager:
+            depth[i] = 0
+            queue.append(i)
+    while queue:
+        i = queue.popleft()
+        order.append(i)
+        for child in children[i]:
+            if child not in depth:
+                depth[child] = depth[i] + 1
+                tree_parent[child] = i
+                queue.append(child)
+
+    tree_children: Dict[int, List[int]] = {i: [] for i in order}
+    for i in order:
+        if i in tree_parent:
+            tree_children[tree_parent[i]].append(i)
+    total = dict.fromkeys(order, 0)
+    below = dict.fromkeys(order, 0)
+    for i in reversed(order):
+        parent = tree_parent.get(i)
+        if parent is not None:
+            total[parent] += 1 + total[i]
+            below[parent] = max(below[parent], below[i] + 1)
+
+    stored = {i: (first, last) for i, (first, last) in (previous or {}).items()
+              if first is not None and last is not None and first <= last}
+    labels = _label_intervals(order, tree_parent, tree_children, total, stored)
+    # Smallest and largest dfsIn of any MANAGES target inside the subtree
+    low = {i: min((labels[child][0] for child in children[i]), default=math.inf) for i in order}
+    high = {i: max((labels[child][0] for child in children[i]), default=-math.inf) for i in order}
+    for i in reversed(order):
+        parent = tree_parent.get(i)
+        if parent is not None:
+            low[parent] = min(low[parent], low[i])
+            high[parent] = max(high[parent], high[i])
+
+    aggregates = {}
+    for i, reports in children.items():
+        first, last = labels.get(i, (None, None))
+        aggregates[i] = {
+            'directReports': len(reports),
+            'totalReports': total.get(i),
+            'depth': depth.get(i),
+            'maxDepthBelow': below.get(i),
+            'dfsIn': first,
+            'dfsOut': last,
+            'dfsExact': first is not None and low[i] > first and high[i] <= last,
+        }
+    return aggregates
+
+
+def refresh_aggregates(driver, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Recompute the aggregates of every employee and write back the ones that changed.
+
+    Returns the number of employees updated. Runs after every import, so an
+    unchanged org costs two reads and no writes; adding or moving someone
+    rewrites their managers' stats and, mostly, only their own interval labels.
+    """
+    started = time.perf_counter()
+    with driver.session() as session:
+        with observe_query('aggregates_load', 'sync'):
+            stored = {record['id']: tuple(record[field] for field in STORED_FIELDS)
+                      for record in session.run(LOAD_AGGREGATES_QUERY)}
+            edges = [(record['source'], record['target']) for record in session.run(LOAD_EDGES_QUERY)]
+        first, last = STORED_FIELDS.index('dfsIn'), STORED_FIELDS.index('dfsOut')
+        aggregates = compute_aggregates(stored, edges, {i: (values[first], values[last]) for i, values in stored.items()})
+        changed = [
+            {'id': i, **values} for i, values in aggregates.items()
+            if tuple(values[field] for field in STORED_FIELDS) != stored[i]
+        ]
+        for batch in chunked(changed, batch_size):
+            with observe_query('aggregates_write', 'sync'):
+                session.execute_write(run_batch, SET_AGGREGATES, batch)
+    logger.info(
+        f"Updated org aggregates of {len(changed)} of {len(stored)} employees "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return len(changed)
+
+
+def invalidate_intervals(driver) -> int:
+    """Mark every interval label inexact so subtree reads traverse instead of range-scanning.
+
+    For writes to MANAGES edges that are not followed by a successful
+    refresh_aggregates; the next refresh relabels everyone. Returns the
+    number of employees cleared.
+    """
+    with driver.session() as session:
+        with observe_query('aggregates_invalidate', 'sync'):
+            cleared = session.run(CLEAR_EXACT_INTERVALS).single()['cleared']
+    logger.warning(f"Cleared the interval labels of {cleared} employees until the next aggregates refresh")
+    return cleared
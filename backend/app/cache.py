@@ -0,0 +1,88 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("SUBTREE_CACHE_MAX_ENTRIES", "256"))
+# Memory bound expressed as the total number of nodes + links held across entries
+DEFAULT_MAX_ITEMS = int(os.getenv("SUBTREE_CACHE_MAX_ITEMS", "200000"))
+
+
+class SubtreeCache:
+    """LRU cache of /employee responses, invalidated by an import generation counter.
+
+    Every successful import bumps ``generation``; entries are keyed by it, so a
+    bump makes all older entries unreachable and they are dropped eagerly.
+    Safe to share between the event loop and import worker threads.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_items: int = DEFAULT_MAX_ITEMS):
+        self.max_entries = max_entries
+        self.max_items = max_items
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _weight(value: Dict[str, Any]) -> int:
+        return len(value.get('nodes', ())) + len(value.get('links', ())) + 1
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get((self.generation, key))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((self.generation, key))
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Dict[str, Any], generation: Optional[int] = None):
+        """Store ``value``; pass the generation read before querying so a
+        response computed across an import is not cached under the new one."""
+        weight = self._weight(value)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if weight > self.max_items:
+                return
+            full_key = (self.generation, key)
+            old = self._entries.pop(full_key, None)
+            if old is not None:
+                self._items -= old[1]
+            self._entries[full_key] = (value, weight)
+            self._items += weight
+            while self._entries and (len(self._entries) > self.max_entries or self._items > self.max_items):
+                _, (_, evicted_weight) = self._entries.popitem(last=False)
+                self._items -= evicted_weight
+                self.evictions += 1
+
+    def invalidate(self) -> int:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._items = 0
+            return self.generation
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._items = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'generation': self.generation,
+                'entries': len(self._entries),
+                'items': self._items,
+                'max_entries': self.max_entries,
+                'max_items': self.max_items,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
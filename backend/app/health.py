@@ -0,0 +1,73 @@
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from loguru import logger
+from app.metrics import observe_query
+
+READINESS_CACHE_SECONDS = float(os.getenv("READINESS_CACHE_SECONDS", "5"))
+READINESS_TIMEOUT_SECONDS = float(os.getenv("READINESS_TIMEOUT_SECONDS", "2"))
+
+COMPONENTS_QUERY = "CALL dbms.components() YIELD name, versions, edition RETURN name, versions, edition"
+
+
+class ReadinessProbe:
+    """Runs a connectivity check at most once per ``ttl`` seconds.
+
+    Load balancers probe every few seconds per instance; between checks the
+    last outcome, success or failure, is served from memory. A check that
+    takes longer than ``timeout`` counts as a failure.
+    """
+
+    def __init__(self, check: Callable[[], Awaitable[None]], ttl: float = READINESS_CACHE_SECONDS,
+                 timeout: float = READINESS_TIMEOUT_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.check = check
+        self.ttl = ttl
+        self.timeout = timeout
+        self.clock = clock
+        self._result: Optional[Tuple[bool, Optional[str]]] = None
+        self._checked_at: Optional[float] = None
+
+    async def status(self) -> Tuple[bool, Optional[str]]:
+        """Return ``(ready, error)``, re-checking only once the cached outcome has expired."""
+        if self._checked_at is not None and self.clock() - self._checked_at < self.ttl:
+            return self._result
+        try:
+            await asyncio.wait_for(self.check(), self.timeout)
+            result = (True, None)
+        except asyncio.TimeoutError:
+            result = (False, f"Connectivity check timed out after {self.timeout:g}s")
+        except Exception as e:
+            result = (False, str(e))
+        if not result[0]:
+            logger.warning(f"Readiness check failed: {result[1]}")
+        self._result = result
+        self._checked_at = self.clock()
+        return result
+
+    def invalidate(self):
+        self._result = None
+        self._checked_at = None
+
+
+class ComponentInfo:
+    """Database name, version and edition, fetched once and kept until invalidated."""
+
+    def __init__(self):
+        self._info: Optional[Dict] = None
+
+    async def get(self, driver) -> Dict:
+        if self._info is None:
+            async with driver.session() as session:
+                with observe_query('health_components'):
+                    result = await session.run(COMPONENTS_QUERY)
+                    record = await result.single()
+            self._info = {
+                "name": record["name"],
+                "version": record["versions"][0],
+                "edition": record["edition"],
+            }
+        return self._info
+
+    def invalidate(self):
+        self._info = None
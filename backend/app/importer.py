@@ -0,0 +1,483 @@
+import csv
+import hashlib
+import io
+import os
+import time
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set
+from loguru import logger
+from app.metrics import IMPORT_ROWS, observe_query
+from app.validation import ImportValidationError, ValidationReport, validate_org
+
+DEFAULT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "5000"))
+# Log one in every N imported rows at DEBUG; 0 turns per-row logging off
+IMPORT_LOG_SAMPLE_EVERY = int(os.getenv("IMPORT_LOG_SAMPLE_EVERY", "1000"))
+
+# Phase 1: create/update every employee node of the batch in one statement
+MERGE_EMPLOYEES = (
+    "UNWIND $rows AS row "
+    "MERGE (e:Employee {email: row.email}) "
+    "SET e.firstName = row.first, e.lastName = row.last, e.fullName = row.full, "
+    "e.phone = row.phone, e.address = row.address, "
+    "e.rowHash = row.rowHash, e.managerKey = row.managerKey"
+)
+
+# Phase 2: all employee nodes exist, so only the manager side may still need creating.
+# Managers given by name are resolved to an email first, so no node is ever merged on fullName.
+MERGE_MANAGES_BY_EMAIL = (
+    "UNWIND $rows AS row "
+    "MATCH (e:Employee {email: row.email}) "
+    "MERGE (m:Employee {email: row.managerEmail}) "
+    "MERGE (m)-[:MANAGES]->(e)"
+)
+
+
+# Manager names not found in the file, looked up among existing employees
+LOOKUP_MANAGER_NAMES = (
+    "UNWIND $names AS name "
+    "MATCH (e:Employee {fullName: name}) WHERE e.email IS NOT NULL "
+    "RETURN name, collect(DISTINCT e.email) AS emails"
+)
+
+MAX_REPORTED_NAMES = 100
+
+# Manager emails given in the file but not on any of its rows, looked up before validating
+LOOKUP_EMAILS = (
+    "UNWIND $emails AS email "
+    "MATCH (e:Employee {email: email}) "
+    "RETURN e.email AS email"
+)
+
+# Diff mode: stored fingerprints of everything that has an email
+EXISTING_FINGERPRINTS = (
+    "MATCH (e:Employee) WHERE e.email IS NOT NULL "
+    "RETURN e.email AS email, e.rowHash AS rowHash, e.managerKey AS managerKey"
+)
+
+# Diff mode: a manager move replaces the incoming MANAGES edge
+DELETE_MANAGES = (
+    "UNWIND $rows AS row "
+    "MATCH (:Employee)-[r:MANAGES]->(e:Employee {email: row.email}) "
+    "DELETE r"
+)
+
+DELETE_EMPLOYEES = (
+    "UNWIND $rows AS row "
+    "MATCH (e:Employee {email: row.email}) "
+    "DETACH DELETE e"
+)
+
+# Metric labels for the batched writes
+QUERY_NAMES = {
+    MERGE_EMPLOYEES: 'import_merge_employees',
+    MERGE_MANAGES_BY_EMAIL: 'import_merge_manages',
+    DELETE_MANAGES: 'import_delete_manages',
+    DELETE_EMPLOYEES: 'import_delete_employees',
+}
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+    # Diff mode categories; ``imported`` counts rows read from the file
+    inserted: int = 0
+    updated: int = 0
+    moved: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    # Manager names that could not be turned into an email; their edges are skipped
+    ambiguous_managers: List[str] = field(default_factory=list)
+    unresolved_managers: List[str] = field(default_factory=list)
+    validation: Optional[ValidationReport] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return float(self.imported)
+        return self.imported / self.elapsed_seconds
+
+
+def parse_row(row: Dict[str, str]) -> Dict[str, str]:
+    """Normalize one CSV row into the parameter map used by the import queries."""
+    first = row.get('First Name') or row.get('first_name') or ''
+    last = row.get('Last Name') or row.get('last_name') or ''
+    full = (first + ' ' + last).strip() or row.get('Full Name') or ''
+    email = row.get('Email') or row.get('email') or ''
+    return {
+        'first': first,
+        'last': last,
+        'full': full,
+        # Employees without an email are keyed by their full name
+        'email': email if email else full,
+        'phone': row.get('Phone') or row.get('phone') or '',
+        'address': row.get('Address') or row.get('address') or '',
+        'manager': (row.get('Manager Name') or row.get('Manager') or row.get('manager_name') or '').strip(),
+        'managerEmail': (row.get('manager_email') or '').strip(),
+    }
+
+
+
+
+class NameIndex:
+    """Maps full names to emails so managers given by name can be resolved locally.
+
+    A name seen with two different emails is ambiguous and resolves to None.
+    """
+
+    def __init__(self):
+        self.emails: Dict[str, str] = {}
+        self.ambiguous: Dict[str, set] = {}
+
+    def add(self, full: str, email: str):
+        if not full:
+            return
+        if full in self.ambiguous:
+            self.ambiguous[full].add(email)
+            return
+        known = self.emails.get(full)
+        if known is None:
+            self.emails[full] = email
+        elif known != email:
+            self.ambiguous[full] = {known, email}
+            del self.emails[full]
+
+    def resolve(self, name: str) -> Optional[str]:
+        return self.emails.get(name)
+
+
+def resolve_manager_email(params: Dict[str, str], names: NameIndex) -> Optional[str]:
+    """manager_email if given, otherwise the email the manager's name resolves to."""
+    if params['managerEmail']:
+        return params['managerEmail']
+    if params['manager']:
+        return names.resolve(params['manager'])
+    return None
+
+
+def manager_key(params: Dict[str, str], names: Optional[NameIndex] = None) -> str:
+    """The resolved manager, so writing a manager by name or by email gives the same key.
+
+    Names that do not resolve keep a ``name:`` key; once they do, the key
+    changes and the next diff import writes the edge.
+    """
+    manager_email = resolve_manager_email(params, names) if names is not None else params['managerEmail']
+    if manager_email:
+        return 'email:' + manager_email.lower()
+    if params['manager']:
+        return 'name:' + params['manager'].lower()
+    return ''
+
+
+def fingerprint(params: Dict[str, str], names: Optional[NameIndex] = None) -> Dict[str, str]:
+    """Add ``rowHash`` (normalized fields + manager key) and ``managerKey`` to parsed params."""
+    key = manager_key(params, names)
+    normalized = [params[field].strip() for field in ('first', 'last', 'full', 'email', 'phone', 'address')]
+    normalized.append(key)
+    params['rowHash'] = hashlib.sha1('\x1f'.join(normalized).encode('utf-8')).hexdigest()
+    params['managerKey'] = key
+    return params
+
+
+class CsvSource:
+    """Re-iterable view over a binary CSV file that decodes it incrementally.
+
+    Each iteration rewinds the file and yields ``csv.DictReader`` rows lazily,
+    so only the decoder buffer and the current row are held in memory no
+    matter how large the upload spool is.
+    """
+
+    def __init__(self, fileobj: BinaryIO, encoding: str = 'utf-8'):
+        self.fileobj = fileobj
+        self.encoding = encoding
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        self.fileobj.seek(0)
+        text = io.TextIOWrapper(self.fileobj, encoding=self.encoding, newline='')
+        try:
+            yield from csv.DictReader(text)
+        finally:
+            # Hand the underlying file back to its owner instead of closing it
+            text.detach()
+
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_batch(tx, query: str, rows: List[Dict]):
+    """Transaction function for ``session.execute_write``: one UNWIND query over ``$rows``."""
+    tx.run(query, rows=rows).consume()
+
+
+def _log_row(n: int, params: Dict[str, str]):
+    if IMPORT_LOG_SAMPLE_EVERY and n % IMPORT_LOG_SAMPLE_EVERY == 0:
+        # Positional args, not an f-string: loguru formats only if a sink takes DEBUG
+        logger.debug("Importing row {}: {}", n, params['email'])
+
+
+def _manager_params(params: Dict[str, str], names: NameIndex) -> Optional[Dict[str, str]]:
+    manager_email = resolve_manager_email(params, names)
+    if manager_email:
+        return {'email': params['email'], 'managerEmail': manager_email}
+    return None
+
+
+def resolve_managers(session, rows: Iterable[Dict[str, str]], result: ImportResult) -> NameIndex:
+    """Read-only first pass: index the file's names, then look up the rest in the graph.
+
+    Names present in the file win over names already in the database. Manager
+    names that are ambiguous or unknown are recorded on ``result`` before any
+    write happens, and their edges are skipped.
+    """
+    names = NameIndex()
+    manager_names = set()
+    for row in rows:
+        params = parse_row(row)
+        names.add(params['full'], params['email'])
+        if params['manager'] and not params['managerEmail']:
+            manager_names.add(params['manager'])
+
+    missing = sorted(name for name in manager_names if names.resolve(name) is None and name not in names.ambiguous)
+    if missing:
+        with observe_query('import_lookup_managers', 'sync'):
+            for record in session.run(LOOKUP_MANAGER_NAMES, names=missing):
+                for email in record['emails']:
+                    names.add(record['name'], email)
+
+    ambiguous = sorted(name for name in manager_names if name in names.ambiguous)
+    unresolved = sorted(name for name in manager_names if names.resolve(name) is None and name not in names.ambiguous)
+    result.ambiguous_managers = ambiguous[:MAX_REPORTED_NAMES]
+    result.unresolved_managers = unresolved[:MAX_REPORTED_NAMES]
+    if ambiguous:
+        logger.warning(f"{len(ambiguous)} manager names match several employees, edges skipped: {ambiguous[:10]}")
+    if unresolved:
+        logger.warning(f"{len(unresolved)} manager names match no employee, edges skipped: {unresolved[:10]}")
+    return names
+
+
+def validate_rows(session, rows: Iterable[Dict[str, str]], names: NameIndex, result: ImportResult,
+                  on_invalid: str = 'reject') -> Set[str]:
+    """Read-only pass: build the file's parent map and validate it before anything is written.
+
+    The report lands on ``result.validation``. With ``on_invalid='reject'``
+    blocking issues (self-management, cycles) mark it rejected and the caller
+    raises; with ``'quarantine'`` the returned emails keep their node writes
+    but not their MANAGES edges.
+    """
+    entries = []
+    emails = set()
+    given = set()
+    # Managers resolved by name are known to exist, in the file or the database
+    known = set()
+    for n, row in enumerate(rows, 1):
+        params = parse_row(row)
+        manager = resolve_manager_email(params, names)
+        entries.append((n, params['email'], params['managerEmail'] or params['manager'], manager))
+        emails.add(params['email'])
+        if params['managerEmail']:
+            given.add(params['managerEmail'])
+        elif manager:
+            known.add(manager)
+
+    # Explicit emails may point anywhere
+    missing = sorted(given - emails - known)
+    if missing:
+        with observe_query('import_lookup_emails', 'sync'):
+            known.update(record['email'] for record in session.run(LOOKUP_EMAILS, emails=missing))
+
+    report, blocked = validate_org(entries, known)
+    result.validation = report
+    if report.counts:
+        logger.warning(f"Import validation: {report.summary()} in {report.elapsed_ms:.1f} ms")
+    if report.blocking:
+        if on_invalid == 'reject':
+            report.action = 'rejected'
+            return set()
+        report.action = 'quarantined'
+        report.quarantined = len(blocked)
+    return blocked
+
+
+def _withhold_edge(params: Dict[str, str]) -> Dict[str, str]:
+    # No fingerprint, so the next import (full or diff) writes this row's edge again
+    params['rowHash'] = None
+    params['managerKey'] = None
+    return params
+
+
+def _check_validation(result: ImportResult):
+    if result.validation is not None and result.validation.action == 'rejected':
+        raise ImportValidationError(result.validation)
+
+
+class _BatchWriter:
+    """Buffers parameter maps per query and writes each full buffer in its own transaction."""
+
+    def __init__(self, session, result: ImportResult, batch_size: int,
+                 on_batch: Optional[Callable[[ImportResult], None]]):
+        self.session = session
+        self.result = result
+        self.batch_size = batch_size
+        self.on_batch = on_batch
+        self.started = time.perf_counter()
+        self.pending: Dict[str, List[Dict[str, str]]] = {}
+
+    def add(self, query: str, params: Dict[str, str]):
+        batch = self.pending.setdefault(query, [])
+        batch.append(params)
+        if len(batch) >= self.batch_size:
+            self.write(query, batch)
+            self.pending[query] = []
+
+    def flush(self):
+        for query, batch in self.pending.items():
+            if batch:
+                self.write(query, batch)
+        self.pending = {}
+
+    def write(self, query: str, batch: List[Dict[str, str]]):
+        name = QUERY_NAMES.get(query, 'import_batch')
+        with observe_query(name, 'sync'):
+            self.session.execute_write(run_batch, query, batch)
+        IMPORT_ROWS.labels(name).inc(len(batch))
+        self.result.batches += 1
+        self.result.elapsed_seconds = time.perf_counter() - self.started
+        if self.on_batch:
+            self.on_batch(self.result)
+
+
+def _log_result(result: ImportResult, batch_size: int):
+    logger.info(
+        f"Imported {result.imported} rows in {result.batches} batches "
+        f"({result.rows_per_second:.0f} rows/s, batch size {batch_size})"
+    )
+
+
+def import_employees(driver, rows: Iterable[Dict[str, str]], batch_size: int = DEFAULT_BATCH_SIZE,
+                     on_batch: Optional[Callable[[ImportResult], None]] = None,
+                     on_invalid: str = 'reject') -> ImportResult:
+    """Write CSV rows to Neo4j in UNWIND batches, nodes first and relationships second.
+
+    Managers are resolved to emails and the reporting lines validated in
+    read-only passes first (see ``resolve_managers`` and ``validate_rows``);
+    a rejected file raises ``ImportValidationError`` before any write. ``rows`` is iterated once per phase, so it must be re-iterable (a list or a
+    ``CsvSource``); at most one batch of parameters is buffered per query.
+    Each batch runs in its own explicit write transaction so a failed batch is
+    retried by the driver without replaying the whole file. ``on_batch`` is
+    called with the running totals after every committed batch.
+    """
+    result = ImportResult()
+
+    with driver.session() as session:
+        names = resolve_managers(session, rows, result)
+        withheld = validate_rows(session, rows, names, result, on_invalid)
+        if on_batch:
+            on_batch(result)
+        _check_validation(result)
+        writer = _BatchWriter(session, result, batch_size, on_batch)
+        for row in rows:
+            result.imported += 1
+            params = fingerprint(parse_row(row), names)
+            _log_row(result.imported, params)
+            if params['email'] in withheld:
+                _withhold_edge(params)
+            writer.add(MERGE_EMPLOYEES, params)
+        writer.flush()
+
+        for row in rows:
+            manager = _manager_params(parse_row(row), names)
+            if manager and manager['email'] not in withheld:
+                writer.add(MERGE_MANAGES_BY_EMAIL, manager)
+        writer.flush()
+        result.elapsed_seconds = time.perf_counter() - writer.started
+
+    _log_result(result, batch_size)
+    return result
+
+
+def import_employees_diff(driver, rows: Iterable[Dict[str, str]], batch_size: int = DEFAULT_BATCH_SIZE,
+                          delete_missing: bool = False,
+                          on_batch: Optional[Callable[[ImportResult], None]] = None,
+                          on_invalid: str = 'reject') -> ImportResult:
+    """Write only the rows whose fingerprint differs from the one stored on the node.
+
+    Rows are classified as inserted (no node with that email), moved (manager
+    changed), updated (any other field changed) or unchanged. Only inserted,
+    moved and updated rows are written; moved rows get their old MANAGES edge
+    replaced. With ``delete_missing`` employees absent from the file (and not
+    referenced as anyone's manager) are detach-deleted. Validation works as
+    in ``import_employees``; a quarantined row keeps its current MANAGES edge.
+    """
+    result = ImportResult()
+
+    with driver.session() as session:
+        with observe_query('import_existing_fingerprints', 'sync'):
+            existing = {
+                record['email']: (record['rowHash'], record['managerKey'])
+                for record in session.run(EXISTING_FINGERPRINTS)
+            }
+        names = resolve_managers(session, rows, result)
+        withheld = validate_rows(session, rows, names, result, on_invalid)
+        if on_batch:
+            on_batch(result)
+        _check_validation(result)
+        writer = _BatchWriter(session, result, batch_size, on_batch)
+
+        # Phase 1: classify every row and upsert changed nodes
+        needs_edge = set()
+        for row in rows:
+            result.imported += 1
+            params = fingerprint(parse_row(row), names)
+            _log_row(result.imported, params)
+            stored = existing.pop(params['email'], None)
+            if stored is None:
+                result.inserted += 1
+                needs_edge.add(params['email'])
+            elif stored[0] == params['rowHash']:
+                result.unchanged += 1
+                continue
+            elif stored[1] != params['managerKey'] and params['email'] not in withheld:
+                result.moved += 1
+                needs_edge.add(params['email'])
+                writer.add(DELETE_MANAGES, {'email': params['email']})
+            else:
+                result.updated += 1
+            if params['email'] in withheld:
+                _withhold_edge(params)
+            writer.add(MERGE_EMPLOYEES, params)
+        writer.flush()
+
+        # Phase 2: edges for new employees and manager moves only
+        referenced = set()
+        for row in rows:
+            manager = _manager_params(parse_row(row), names)
+            if manager:
+                referenced.add(manager['managerEmail'])
+                if manager['email'] in needs_edge and manager['email'] not in withheld:
+                    writer.add(MERGE_MANAGES_BY_EMAIL, manager)
+        writer.flush()
+
+        # Phase 3: whatever is left in ``existing`` was not in the file
+        if delete_missing:
+            for email in existing:
+                if email not in referenced:
+                    result.deleted += 1
+                    writer.add(DELETE_EMPLOYEES, {'email': email})
+            writer.flush()
+        result.elapsed_seconds = time.perf_counter() - writer.started
+
+    _log_result(result, batch_size)
+    logger.info(
+        f"Diff import: {result.inserted} inserted, {result.updated} updated, {result.moved} moved, "
+        f"{result.unchanged} unchanged, {result.deleted} deleted"
+    )
+    return result
@@ -0,0 +1,116 @@
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from loguru import logger
+from app.importer import ImportResult
+from app.validation import ValidationReport
+
+MAX_RETAINED_JOBS = 100
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class ImportJob:
+    job_id: str
+    filename: str
+    status: str = "queued"
+    rows_processed: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0
+    inserted: int = 0
+    updated: int = 0
+    moved: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    ambiguous_managers: List[str] = field(default_factory=list)
+    unresolved_managers: List[str] = field(default_factory=list)
+    validation: Optional[ValidationReport] = None
+    errors: List[str] = field(default_factory=list)
+    created_at: datetime = field(default_factory=_now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def record(self, result: ImportResult):
+        """Copy importer progress onto the job; called after every batch."""
+        self.rows_processed = result.imported
+        self.batches = result.batches
+        self.elapsed_seconds = round(result.elapsed_seconds, 3)
+        self.rows_per_second = round(result.rows_per_second, 1)
+        self.inserted = result.inserted
+        self.updated = result.updated
+        self.moved = result.moved
+        self.unchanged = result.unchanged
+        self.deleted = result.deleted
+        self.ambiguous_managers = result.ambiguous_managers
+        self.unresolved_managers = result.unresolved_managers
+        self.validation = result.validation
+
+
+class ImportJobManager:
+    """Runs import jobs in the background, one at a time per database.
+
+    Every database gets a single-worker executor, so concurrent uploads queue
+    behind each other instead of contending for locks on the same MERGEs.
+    """
+
+    def __init__(self, max_retained: int = MAX_RETAINED_JOBS):
+        self.max_retained = max_retained
+        self._jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, filename: str, run: Callable[[ImportJob], ImportResult], database: Optional[str] = None) -> ImportJob:
+        job = ImportJob(job_id=uuid.uuid4().hex, filename=filename)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self.max_retained:
+                self._jobs.popitem(last=False)
+            key = database or "default"
+            executor = self._executors.get(key)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"import-{key}")
+                self._executors[key] = executor
+        executor.submit(self._execute, job, run)
+        logger.info(f"Queued import job {job.job_id} for {filename}")
+        return job
+
+    def _execute(self, job: ImportJob, run: Callable[[ImportJob], ImportResult]):
+        job.status = "running"
+        job.started_at = _now()
+        try:
+            job.record(run(job))
+            job.status = "succeeded"
+            logger.info(f"Import job {job.job_id} finished: {job.rows_processed} rows")
+        except Exception as e:
+            job.status = "failed"
+            job.errors.append(str(e))
+            logger.error(f"Import job {job.job_id} failed: {str(e)}")
+        finally:
+            job.finished_at = _now()
+            job.done.set()
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[ImportJob]:
+        job = self.get(job_id)
+        if job:
+            job.done.wait(timeout)
+        return job
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=wait)
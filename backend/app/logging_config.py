@@ -0,0 +1,30 @@
+import os
+import sys
+from loguru import logger
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# "text" for humans, "json" for log shipping (one serialized record per line)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+# Empty disables the file sink
+LOG_FILE = os.getenv("LOG_FILE", "app.log")
+LOG_FILE_ROTATION = os.getenv("LOG_FILE_ROTATION", "500 MB")
+
+CONSOLE_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | {message}"
+FILE_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {message}"
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT, log_file: str = LOG_FILE,
+                      enqueue: bool = True):
+    """Replace loguru's default handler with the configured sinks.
+
+    With ``enqueue`` every sink is written by loguru's background thread, so
+    a request or import batch only pays for putting the record on a queue,
+    never for the stdout or file write itself.
+    """
+    logger.remove()
+    serialize = fmt == "json"
+    logger.add(sys.stdout, level=level, format=CONSOLE_FORMAT, serialize=serialize,
+               colorize=not serialize, enqueue=enqueue)
+    if log_file:
+        logger.add(log_file, level=level, format=FILE_FORMAT, serialize=serialize,
+                   rotation=LOG_FILE_ROTATION, enqueue=enqueue)
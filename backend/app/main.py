@@ -1,33 +1,72 @@
 import json
 import boto3
-import io
-import csv
+import hashlib
 import os
-from typing import List, Optional
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Literal, Optional, Union
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, UploadFile, File, HTTPException, Query, status, Header, Depends
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Request, Response, status, Header, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
-from neo4j import GraphDatabase
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from pydantic import BaseModel, ConfigDict, Field
+from neo4j import AsyncGraphDatabase, GraphDatabase
 from tenacity import retry, stop_after_attempt, wait_exponential
 from loguru import logger
-import sys
+from app.aggregates import invalidate_intervals, refresh_aggregates
+from app.cache import SubtreeCache
+from app.health import ComponentInfo, ReadinessProbe
+from app.importer import DEFAULT_BATCH_SIZE, CsvSource, import_employees, import_employees_diff
+from app.jobs import ImportJob, ImportJobManager
+from app.logging_config import configure_logging
+from app.metrics import POOL_MAX_SIZE, REQUEST_LATENCY, RESULT_SIZE, observe_query, register_cache
+from app.queries import (CHAINS_QUERY, DEFAULT_MAX_NODES, EMPLOYEE_BY_ID_QUERY, IS_UNDER_QUERY, MAX_DEPTH,
+                         SEARCH_QUERY, SUBTREE_RANGE_QUERY, build_search_query, build_subtree_query, build_subtree_rows_query, build_subtrees_query,
+                         links_from_row, node_to_dict, subtree_from_record, to_columnar)
+from app.schema import MIGRATIONS, MigrationStatus, apply_migrations, get_index_status, get_schema_version
+from app.secret_cache import SecretCache
+from app.snapshot import SnapshotManager
+from app.validation import ImportValidationError
 
-# Configure logging
-logger.remove()  # Remove default handler
-logger.add(sys.stdout, format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | {message}")
-logger.add("app.log", rotation="500 MB", format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {message}")
+# Configure logging (LOG_LEVEL, LOG_FORMAT, LOG_FILE)
+configure_logging()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Application starting up")
-    neo4j_conn.connect()  # Verify connection at startup
+    await neo4j_conn.connect_async()  # Verify connection at startup
+    try:
+        await apply_migrations(neo4j_conn.async_driver, migration_status)
+    except Exception as e:
+        # Reads still work, slower, but search needs its index; /readyz and /admin/schema
+        # report what is blocked. Retried on next start
+        logger.error(f"Schema migration failed: {str(e)}")
+    try:
+        # Version info does not change while we are connected, so /health never queries it again
+        await component_info.get(neo4j_conn.async_driver)
+    except Exception as e:
+        logger.warning(f"Could not read database components: {str(e)}")
+    if org_snapshot.enabled:
+        try:
+            await run_in_threadpool(org_snapshot.refresh, neo4j_conn.get_driver(), subtree_cache.generation)
+        except Exception as e:
+            # Reads fall back to Cypher until the next import reloads the snapshot
+            logger.error(f"Failed to load org snapshot: {str(e)}")
     yield
     # Shutdown
     logger.info("Application shutting down")
+    import_jobs.shutdown()
     neo4j_conn.close()
+    await neo4j_conn.close_async()
+    # Drain records still queued for the background sink writer
+    await logger.complete()
 
 app = FastAPI(
     title="OrgChart API",
@@ -38,6 +77,7 @@ app = FastAPI(
     openapi_tags=[
         {"name": "health", "description": "Health check endpoints"},
         {"name": "employees", "description": "Employee data management endpoints"},
+        {"name": "admin", "description": "Administrative endpoints (require X-API-Key)"},
     ],
     lifespan=lifespan
 )
@@ -49,6 +89,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+GZIP_MIN_SIZE = int(os.getenv('GZIP_MIN_SIZE', '1024'))
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, to keep cardinality bounded
+        route = request.scope.get('route')
+        REQUEST_LATENCY.labels(request.method, route.path if route else 'unmatched', str(status_code)).observe(
+            time.perf_counter() - started)
+
 class HealthResponse(BaseModel):
     status: str = Field(..., description="Current health status of the API", json_schema_extra={"example": "healthy"})
     database: dict = Field(..., description="Neo4j database connection details", json_schema_extra={"example": {
@@ -58,18 +115,105 @@ class HealthResponse(BaseModel):
         "edition": "aura"
     }})
 
-class UploadResponse(BaseModel):
-    status: str = Field(..., description="Upload operation status", json_schema_extra={"example": "ok"})
-    imported: int = Field(..., description="Number of employees imported", json_schema_extra={"example": 5})
+class ProbeResponse(BaseModel):
+    status: str = Field(..., description="`alive` or `ready`", json_schema_extra={"example": "ready"})
+
+class ReadinessResponse(ProbeResponse):
+    pending_migrations: List[str] = Field([], description="Schema migrations that failed on startup and the ones blocked behind them",
+                                          json_schema_extra={"example": ["v2 (Full-text index on Employee.fullName and Employee.email for search): pending: blocked by v1"]})
+
+class ImportIssue(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    kind: str = Field(..., description="self_manager, cycle, orphan, multiple_managers or multiple_roots", json_schema_extra={"example": "cycle"})
+    row: int = Field(..., description="1-based data row of the CSV", json_schema_extra={"example": 42})
+    email: str = Field(..., description="Employee the issue was found on", json_schema_extra={"example": "jane@example.com"})
+    manager: Optional[str] = Field(None, description="Manager email or name as resolved from the row", json_schema_extra={"example": "john@example.com"})
+
+class ImportValidation(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    rows: int = Field(..., description="Rows validated", json_schema_extra={"example": 100})
+    roots: int = Field(..., description="Rows without a manager", json_schema_extra={"example": 1})
+    counts: Dict[str, int] = Field(..., description="Issues per kind", json_schema_extra={"example": {"cycle": 3}})
+    issues: List[ImportIssue] = Field(..., description="First 100 issues")
+    action: str = Field(..., description="passed, rejected (nothing written) or quarantined (MANAGES edges of blocked rows withheld)", json_schema_extra={"example": "rejected"})
+    quarantined: int = Field(..., description="Employees whose MANAGES edges were withheld", json_schema_extra={"example": 0})
+    elapsed_ms: float = Field(..., description="Validation time in milliseconds", json_schema_extra={"example": 3.2})
+
+class ImportJobStatus(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    job_id: str = Field(..., description="Import job identifier", json_schema_extra={"example": "3f2b9c0e5a8d4c1f9e7b6a5d4c3b2a10"})
+    filename: str = Field(..., description="Uploaded file name", json_schema_extra={"example": "employees.csv"})
+    status: str = Field(..., description="queued, running, succeeded or failed", json_schema_extra={"example": "running"})
+    rows_processed: int = Field(..., description="Number of employees imported so far", json_schema_extra={"example": 5})
+    batches: int = Field(..., description="Number of write transactions issued", json_schema_extra={"example": 2})
+    elapsed_seconds: float = Field(..., description="Wall-clock import time in seconds", json_schema_extra={"example": 0.42})
+    rows_per_second: float = Field(..., description="Import throughput", json_schema_extra={"example": 11.9})
+    inserted: int = Field(..., description="Diff mode: employees created", json_schema_extra={"example": 1})
+    updated: int = Field(..., description="Diff mode: employees whose fields changed", json_schema_extra={"example": 3})
+    moved: int = Field(..., description="Diff mode: employees whose manager changed", json_schema_extra={"example": 1})
+    unchanged: int = Field(..., description="Diff mode: rows skipped because nothing changed", json_schema_extra={"example": 95})
+    deleted: int = Field(..., description="Diff mode: employees removed because they were absent from the file", json_schema_extra={"example": 0})
+    ambiguous_managers: List[str] = Field(..., description="Manager names matching several employees; their MANAGES edges were skipped")
+    unresolved_managers: List[str] = Field(..., description="Manager names matching no employee; their MANAGES edges were skipped")
+    validation: Optional[ImportValidation] = Field(None, description="Reporting-line checks run before any write")
+    errors: List[str] = Field(..., description="Errors raised by the import")
+    created_at: datetime = Field(..., description="When the job was queued")
+    started_at: Optional[datetime] = Field(None, description="When the job started running")
+    finished_at: Optional[datetime] = Field(None, description="When the job finished")
+
+class CacheStatsResponse(BaseModel):
+    generation: int = Field(..., description="Import generation; bumped by every import", json_schema_extra={"example": 3})
+    entries: int = Field(..., description="Cached subtrees", json_schema_extra={"example": 12})
+    items: int = Field(..., description="Nodes and links held across entries", json_schema_extra={"example": 4200})
+    max_entries: int = Field(..., description="Entry limit", json_schema_extra={"example": 256})
+    max_items: int = Field(..., description="Node + link limit", json_schema_extra={"example": 200000})
+    hits: int = Field(..., description="Cache hits", json_schema_extra={"example": 950})
+    misses: int = Field(..., description="Cache misses", json_schema_extra={"example": 50})
+    evictions: int = Field(..., description="Entries evicted by the LRU bounds", json_schema_extra={"example": 0})
+
+class IndexStatus(BaseModel):
+    name: str = Field(..., description="Index name", json_schema_extra={"example": "employee_full_name"})
+    type: str = Field(..., description="Index type", json_schema_extra={"example": "RANGE"})
+    labelsOrTypes: Optional[List[str]] = Field(None, description="Indexed labels", json_schema_extra={"example": ["Employee"]})
+    properties: Optional[List[str]] = Field(None, description="Indexed properties", json_schema_extra={"example": ["fullName"]})
+    state: str = Field(..., description="Index state", json_schema_extra={"example": "ONLINE"})
+    populationPercent: float = Field(..., description="Population progress", json_schema_extra={"example": 100.0})
+
+class SchemaStatusResponse(BaseModel):
+    version: int = Field(..., description="Applied schema migration version", json_schema_extra={"example": 1})
+    latest_version: int = Field(..., description="Latest migration known to this build", json_schema_extra={"example": 1})
+    indexes: List[IndexStatus] = Field(..., description="Indexes and their population state")
+    pending: List[str] = Field([], description="Migrations not applied yet and why, e.g. `pending: blocked by v1`")
 
 class Node(BaseModel):
     id: int = Field(..., description="Neo4j node ID", json_schema_extra={"example": 1234})
-    fullName: str = Field(..., description="Employee's full name", json_schema_extra={"example": "John Doe"})
+    # Managers known only by email (created by MERGE on managerEmail) have no name
+    fullName: Optional[str] = Field(None, description="Employee's full name", json_schema_extra={"example": "John Doe"})
     firstName: Optional[str] = Field(None, description="Employee's first name", json_schema_extra={"example": "John"})
     lastName: Optional[str] = Field(None, description="Employee's last name", json_schema_extra={"example": "Doe"})
     email: Optional[str] = Field(None, description="Employee's email", json_schema_extra={"example": "john.doe@example.com"})
     phone: Optional[str] = Field(None, description="Employee's phone number", json_schema_extra={"example": "+1-555-123-4567"})
     address: Optional[str] = Field(None, description="Employee's address", json_schema_extra={"example": "123 Main St"})
+    directReports: Optional[int] = Field(None, description="Number of direct reports", json_schema_extra={"example": 4})
+    totalReports: Optional[int] = Field(None, description="Number of people rolling up to the employee", json_schema_extra={"example": 37})
+    depth: Optional[int] = Field(None, description="Levels below the top of the org chart", json_schema_extra={"example": 2})
+    maxDepthBelow: Optional[int] = Field(None, description="Levels in the employee's subtree", json_schema_extra={"example": 3})
+
+class EmployeeStats(BaseModel):
+    id: int = Field(..., description="Neo4j node ID", json_schema_extra={"example": 1234})
+    fullName: Optional[str] = Field(None, description="Employee's full name", json_schema_extra={"example": "John Doe"})
+    directReports: Optional[int] = Field(None, description="Number of direct reports", json_schema_extra={"example": 4})
+    totalReports: Optional[int] = Field(None, description="Number of people rolling up to the employee; null until computed or inside a cycle", json_schema_extra={"example": 37})
+    depth: Optional[int] = Field(None, description="Levels below the top of the org chart", json_schema_extra={"example": 2})
+    maxDepthBelow: Optional[int] = Field(None, description="Levels in the employee's subtree", json_schema_extra={"example": 3})
+
+class IsUnderResponse(BaseModel):
+    employee_id: int = Field(..., description="Neo4j node ID of the employee", json_schema_extra={"example": 5678})
+    manager_id: int = Field(..., description="Neo4j node ID of the possible manager", json_schema_extra={"example": 1234})
+    is_under: bool = Field(..., description="True when the manager is in the employee's reporting line", json_schema_extra={"example": True})
 
 class Link(BaseModel):
     from_id: int = Field(..., description="Source node ID", json_schema_extra={"example": 1234})
@@ -79,6 +223,73 @@ class Link(BaseModel):
 class EmployeeResponse(BaseModel):
     nodes: List[Node] = Field(..., description="List of employee nodes")
     links: List[Link] = Field(..., description="List of relationships between employees")
+    truncated: bool = Field(False, description="True when the subtree was cut off at max_nodes")
+
+class NodeColumns(BaseModel):
+    id: List[int] = Field(..., description="Neo4j node IDs")
+    fullName: List[Optional[str]] = Field(..., description="Full names, aligned with id")
+    firstName: List[Optional[str]] = Field(..., description="First names, aligned with id")
+    lastName: List[Optional[str]] = Field(..., description="Last names, aligned with id")
+    email: List[Optional[str]] = Field(..., description="Emails, aligned with id")
+    phone: List[Optional[str]] = Field(..., description="Phone numbers, aligned with id")
+    address: List[Optional[str]] = Field(..., description="Addresses, aligned with id")
+    directReports: List[Optional[int]] = Field(..., description="Direct reports, aligned with id")
+    totalReports: List[Optional[int]] = Field(..., description="Total reports, aligned with id")
+    depth: List[Optional[int]] = Field(..., description="Depth from the root, aligned with id")
+    maxDepthBelow: List[Optional[int]] = Field(..., description="Levels below, aligned with id")
+
+class ColumnarEmployeeResponse(BaseModel):
+    columns: NodeColumns = Field(..., description="One array per node field; index i of every array is node i")
+    links: List[List[int]] = Field(..., description="MANAGES links as [manager index, report index] pairs into the node arrays",
+                                   json_schema_extra={"example": [[0, 1], [0, 2]]})
+    truncated: bool = Field(False, description="True when the subtree was cut off at max_nodes")
+
+class ChainResponse(BaseModel):
+    id: int = Field(..., description="Neo4j node ID of the employee", json_schema_extra={"example": 1234})
+    chain: List[Node] = Field(..., description="The employee followed by each manager up to the root")
+
+class ChainsRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=5000, description="Neo4j node IDs", json_schema_extra={"example": [1234, 5678]})
+
+class ChainsResponse(BaseModel):
+    chains: List[ChainResponse] = Field(..., description="Management chain per requested employee, in request order")
+    missing: List[int] = Field(..., description="Requested IDs that do not exist")
+
+class SubtreesRequest(BaseModel):
+    names: List[str] = Field([], max_length=500, description="Full names of root employees", json_schema_extra={"example": ["Jennifer Smith"]})
+    emails: List[str] = Field([], max_length=500, description="Emails of root employees", json_schema_extra={"example": ["robert.johnson@company.com"]})
+    ids: List[int] = Field([], max_length=500, description="Neo4j node IDs of root employees", json_schema_extra={"example": [1234]})
+    depth: Optional[int] = Field(None, ge=0, le=MAX_DEPTH, description="Maximum number of reporting levels below each root")
+    max_nodes: int = Field(DEFAULT_MAX_NODES, ge=1, le=100000, description="Maximum number of nodes per root")
+
+class RootRef(BaseModel):
+    by: Literal['name', 'email', 'id'] = Field(..., description="How the root was requested", json_schema_extra={"example": "name"})
+    key: Union[int, str] = Field(..., description="The requested name, email or ID", json_schema_extra={"example": "Jennifer Smith"})
+
+class RootMembership(RootRef):
+    id: int = Field(..., description="Neo4j node ID of the root", json_schema_extra={"example": 1234})
+    members: List[int] = Field(..., description="IDs of the root and everyone in its subtree")
+    truncated: bool = Field(False, description="True when this subtree was cut off at max_nodes")
+
+class SubtreesResponse(BaseModel):
+    nodes: List[Node] = Field(..., description="Employees of all requested subtrees, each once")
+    links: List[Link] = Field(..., description="Relationships between the returned employees")
+    roots: List[RootMembership] = Field(..., description="Membership of every resolved root, in request order")
+    missing: List[RootRef] = Field(..., description="Requested roots that do not exist")
+
+class SearchHit(BaseModel):
+    id: int = Field(..., description="Neo4j node ID", json_schema_extra={"example": 1234})
+    fullName: Optional[str] = Field(None, description="Employee's full name", json_schema_extra={"example": "Jennifer Smith"})
+    email: Optional[str] = Field(None, description="Employee's email", json_schema_extra={"example": "jennifer.smith@company.com"})
+    score: float = Field(..., description="Full-text relevance score", json_schema_extra={"example": 2.4})
+
+class SearchResponse(BaseModel):
+    results: List[SearchHit] = Field(..., description="Best matches first")
+
+class SubtreePage(BaseModel):
+    nodes: List[Node] = Field(..., description="Employee nodes of this page, ordered by id")
+    links: List[Link] = Field(..., description="Relationships from managers in the subtree to the nodes of this page")
+    next_cursor: Optional[int] = Field(None, description="Cursor for the next page; null on the last page", json_schema_extra={"example": 5678})
 
 @retry(
     stop=stop_after_attempt(1),
@@ -153,19 +364,59 @@ def get_admin_api_key():
                 detail="Could not retrieve admin API key"
             )
 
+ADMIN_KEY_CACHE_TTL = float(os.getenv('ADMIN_KEY_CACHE_TTL_SECONDS', '300'))
+# How long a rotated-out key keeps working once this instance has seen the new one
+ADMIN_KEY_ROTATION_OVERLAP = float(os.getenv('ADMIN_KEY_ROTATION_OVERLAP_SECONDS', '300'))
+NEO4J_CREDENTIALS_CACHE_TTL = float(os.getenv('NEO4J_CREDENTIALS_CACHE_TTL_SECONDS', '3600'))
+
+admin_api_key_cache = SecretCache('admin_api_key', get_admin_api_key,
+                                  ttl=ADMIN_KEY_CACHE_TTL, overlap=ADMIN_KEY_ROTATION_OVERLAP)
+neo4j_credentials_cache = SecretCache('neo4j_credentials', get_neo4j_credentials, ttl=NEO4J_CREDENTIALS_CACHE_TTL)
+
+NEO4J_MAX_POOL_SIZE = int(os.getenv('NEO4J_MAX_POOL_SIZE', '50'))
+NEO4J_ACQUISITION_TIMEOUT = float(os.getenv('NEO4J_CONNECTION_ACQUISITION_TIMEOUT', '10'))
+POOL_MAX_SIZE.labels('async').set(NEO4J_MAX_POOL_SIZE)
+POOL_MAX_SIZE.labels('sync').set(NEO4J_MAX_POOL_SIZE)
+
 class Neo4jConnection:
+    """Holds the async driver used by request handlers and the sync driver used by import jobs."""
+
     def __init__(self):
         self.driver = None
+        self.async_driver = None
+
+    @staticmethod
+    def _driver_config():
+        return {
+            'max_connection_pool_size': NEO4J_MAX_POOL_SIZE,
+            'connection_acquisition_timeout': NEO4J_ACQUISITION_TIMEOUT,
+        }
 
     def connect(self):
         if not self.driver:
             try:
                 logger.info("Initializing Neo4j connection")
-                uri, user, password = get_neo4j_credentials()
-                self.driver = GraphDatabase.driver(uri, auth=(user, password))
+                uri, user, password = neo4j_credentials_cache.get()
+                self.driver = GraphDatabase.driver(uri, auth=(user, password), **self._driver_config())
                 logger.info("Successfully connected to Neo4j")
             except Exception as e:
                 logger.error(f"Failed to connect to Neo4j: {str(e)}")
+                neo4j_credentials_cache.invalidate()
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Database connection failed: {str(e)}"
+                )
+
+    async def connect_async(self):
+        if not self.async_driver:
+            try:
+                logger.info("Initializing async Neo4j connection")
+                uri, user, password = await run_in_threadpool(neo4j_credentials_cache.get)
+                self.async_driver = AsyncGraphDatabase.driver(uri, auth=(user, password), **self._driver_config())
+                logger.info("Successfully connected to Neo4j (async)")
+            except Exception as e:
+                logger.error(f"Failed to connect to Neo4j: {str(e)}")
+                neo4j_credentials_cache.invalidate()
                 raise HTTPException(
                     status_code=500,
                     detail=f"Database connection failed: {str(e)}"
@@ -177,47 +428,79 @@ class Neo4jConnection:
             self.driver = None
             logger.info("Neo4j connection closed")
 
+    async def close_async(self):
+        if self.async_driver:
+            await self.async_driver.close()
+            self.async_driver = None
+            logger.info("Async Neo4j connection closed")
+
     def get_driver(self):
         if not self.driver:
             self.connect()
         return self.driver
 
+    async def get_async_driver(self):
+        if not self.async_driver:
+            await self.connect_async()
+        return self.async_driver
+
 neo4j_conn = Neo4jConnection()
+import_jobs = ImportJobManager()
+subtree_cache = SubtreeCache()
+org_snapshot = SnapshotManager()
+register_cache(subtree_cache.stats)
+
+async def _verify_connectivity():
+    driver = await neo4j_conn.get_async_driver()
+    with observe_query('health_verify_connectivity'):
+        await driver.verify_connectivity()
+
+readiness = ReadinessProbe(_verify_connectivity)
+component_info = ComponentInfo()
+migration_status = MigrationStatus()
 
 async def require_admin(x_api_key: Optional[str] = Header(None, alias='X-API-Key')):
     if not x_api_key:
         logger.warning("Missing X-API-Key header for admin operation")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing API key")
-    expected = get_admin_api_key()
-    if x_api_key != expected:
+    # Cached, constant-time check; only touches SSM on expiry or a possible rotation
+    if not await run_in_threadpool(admin_api_key_cache.matches, x_api_key):
         logger.warning("Invalid admin API key provided")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid API key")
     return True
 
+@app.get('/livez', response_model=ProbeResponse, tags=["health"],
+         summary="Liveness probe",
+         description="Returns 200 while the process can serve requests. Does no I/O.")
+async def liveness():
+    return {"status": "alive"}
+
+@app.get('/readyz', response_model=ReadinessResponse, tags=["health"],
+         summary="Readiness probe",
+         description="Verifies Neo4j connectivity with a short timeout. The outcome is cached for `READINESS_CACHE_SECONDS`.")
+async def readiness_check():
+    ready, error = await readiness.status()
+    if not ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Not ready: {error}"
+        )
+    # A failed migration does not stop reads, so it is reported rather than failing the probe
+    return {"status": "ready", "pending_migrations": migration_status.pending()}
+
 @app.get('/health', response_model=HealthResponse, tags=["health"],
          summary="Check API and database health",
-         description="Returns the health status of the API and Neo4j database connection.")
+         description="Returns the health status of the API and Neo4j database connection. "
+                     "Connectivity comes from the cached readiness check; version info is read once at startup.")
 async def health_check():
     try:
-        # Test database connection
-        driver = neo4j_conn.get_driver()
-        with driver.session() as session:
-            result = session.run("RETURN 1 as n")
-            result.single()
-        
-        # Get database info
-        with driver.session() as session:
-            result = session.run("CALL dbms.components() YIELD name, versions, edition RETURN name, versions, edition")
-            db_info = result.single()
-            
+        ready, error = await readiness.status()
+        if not ready:
+            raise Exception(error)
+        db_info = await component_info.get(await neo4j_conn.get_async_driver())
         return {
             "status": "healthy",
-            "database": {
-                "connected": True,
-                "name": db_info["name"],
-                "version": db_info["versions"][0],
-                "edition": db_info["edition"]
-            }
+            "database": {"connected": True, **db_info}
         }
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
@@ -226,10 +509,79 @@ async def health_check():
             detail=f"Health check failed: {str(e)}"
         )
 
-@app.post('/upload', response_model=UploadResponse, tags=["employees"],
+def _import_runner(path: str, batch_size: int, mode: str = 'full', delete_missing: bool = False,
+                   on_invalid: str = 'reject'):
+    def run(job: ImportJob):
+        written = True
+        try:
+            with open(path, 'rb') as fh:
+                driver = neo4j_conn.get_driver()
+                if mode == 'diff':
+                    return import_employees_diff(driver, CsvSource(fh), batch_size=batch_size,
+                                                 delete_missing=delete_missing, on_batch=job.record,
+                                                 on_invalid=on_invalid)
+                return import_employees(driver, CsvSource(fh), batch_size=batch_size, on_batch=job.record,
+                                        on_invalid=on_invalid)
+        except ImportValidationError:
+            # Rejected before the first write: caches, stats and the snapshot are still current
+            written = False
+            raise
+        finally:
+            os.remove(path)
+            if written:
+                # Before the generation bump, or nodes read meanwhile are cached with pre-import stats
+                try:
+                    refresh_aggregates(neo4j_conn.get_driver(), batch_size)
+                except Exception as e:
+                    # Stats stay stale until the next import, but stale intervals would drop moved employees
+                    logger.error(f"Failed to refresh org aggregates: {str(e)}")
+                    try:
+                        invalidate_intervals(neo4j_conn.get_driver())
+                    except Exception as e:
+                        logger.error(f"Failed to clear interval labels: {str(e)}")
+                if org_snapshot.enabled:
+                    # Swap the snapshot in before the bump: a read in between caches the new org
+                    # under the old generation, which the bump discards, never the reverse
+                    try:
+                        org_snapshot.refresh(neo4j_conn.get_driver(), subtree_cache.generation + 1)
+                    except Exception as e:
+                        logger.error(f"Failed to reload org snapshot: {str(e)}")
+                        # Fall back to Cypher rather than serve the pre-import org
+                        org_snapshot.snapshot = None
+                # Even a failed import may have committed some batches, so cached trees are stale
+                subtree_cache.invalidate()
+    return run
+
+def _copy_upload(file: UploadFile) -> str:
+    # The upload spool is closed once the response is sent, so the job gets its own copy
+    with tempfile.NamedTemporaryFile(prefix='orgchart-import-', suffix='.csv', delete=False) as tmp:
+        file.file.seek(0)
+        shutil.copyfileobj(file.file, tmp)
+        return tmp.name
+
+@app.get('/cache/stats', response_model=CacheStatsResponse, tags=["health"],
+         summary="Subtree cache statistics",
+         description="Returns hit/miss counters and occupancy of the in-process /employee cache.")
+async def cache_stats():
+    return subtree_cache.stats()
+
+@app.get('/metrics', tags=["health"],
+         summary="Prometheus metrics",
+         description="Request latency per route, Neo4j query time per named query, pool usage, import rows, result sizes and cache counters.",
+         response_class=Response)
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.post('/upload', response_model=ImportJobStatus, status_code=status.HTTP_202_ACCEPTED, tags=["employees"],
           summary="Upload employee data CSV",
-          description="Upload a CSV file containing employee information. The file should include columns for First Name, Last Name, Email, Phone, Address, and Manager Name.")
-async def upload_csv(file: UploadFile = File(...), authorized: bool = Depends(require_admin)):
+          description="Upload a CSV file containing employee information. The file should include columns for First Name, Last Name, Email, Phone, Address, and Manager Name. "
+                      "The import runs in the background; poll `/imports/{job_id}` for progress.")
+async def upload_csv(file: UploadFile = File(...),
+                     batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=50000, description='Rows written per UNWIND transaction'),
+                     mode: Literal['full', 'diff'] = Query('full', description='`diff` writes only rows whose fingerprint changed'),
+                     delete_missing: bool = Query(False, description='Diff mode: delete employees absent from the file'),
+                     on_invalid: Literal['reject', 'quarantine'] = Query('reject', description='Self-managed rows or MANAGES cycles: `reject` the file before any write, or `quarantine` (import without those edges)'),
+                     authorized: bool = Depends(require_admin)):
     if not file.filename.endswith('.csv'):
         logger.warning(f"Invalid file type attempted: {file.filename}")
         raise HTTPException(
@@ -238,124 +590,87 @@ async def upload_csv(file: UploadFile = File(...), authorized: bool = Depends(re
         )
     
     try:
-        content = await file.read()
-        text = content.decode('utf-8')
-        reader = csv.DictReader(io.StringIO(text))
-        created = 0
-        
-        driver = neo4j_conn.get_driver()
-        with driver.session() as session:
-            for row in reader:
-                first = row.get('First Name') or row.get('first_name') or ''
-                last = row.get('Last Name') or row.get('last_name') or ''
-                full = (first + ' ' + last).strip() or row.get('Full Name') or ''
-                email = row.get('Email') or row.get('email') or ''
-                phone = row.get('Phone') or row.get('phone') or ''
-                address = row.get('Address') or row.get('address') or ''
-                manager = row.get('Manager Name') or row.get('Manager') or row.get('manager_name') or ''
-                manager_email = row.get('manager_email') or ''
-                
-                logger.debug(f"Processing employee: {full}")
-                
-                # Merge employee
-                session.run(
-                    "MERGE (e:Employee {email: $email}) "
-                    "SET e.firstName = $first, e.lastName = $last, e.fullName = $full, e.phone = $phone, e.address = $address",
-                    first=first, last=last, full=full, email=email if email else full, phone=phone, address=address
-                )
-                
-                # Create manager node and relationship
-                # Use manager_email if available, otherwise fall back to manager name
-                if manager_email:
-                    session.run(
-                        "MERGE (m:Employee {email: $managerEmail}) "
-                        "MERGE (e2:Employee {email: $email2}) "
-                        "MERGE (m)-[:MANAGES]->(e2)",
-                        managerEmail=manager_email, email2=email if email else full
-                    )
-                elif manager:
-                    session.run(
-                        "MERGE (m:Employee {fullName: $managerFull}) "
-                        "MERGE (e2:Employee {email: $email2}) "
-                        "MERGE (m)-[:MANAGES]->(e2)",
-                        managerFull=manager, email2=email if email else full
-                    )
-                created += 1
-                
-        logger.info(f"Successfully imported {created} employees from CSV")
-        return {"status": "ok", "imported": created}
+        path = await run_in_threadpool(_copy_upload, file)
+        job = import_jobs.submit(file.filename, _import_runner(path, batch_size, mode, delete_missing, on_invalid))
+        return ImportJobStatus.model_validate(job)
     
     except Exception as e:
-        logger.error(f"Error processing CSV upload: {str(e)}")
+        logger.error(f"Error queuing CSV upload: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing upload: {str(e)}"
         )
 
-@app.get('/employee', response_model=EmployeeResponse, tags=["employees"],
-         summary="Get employee org chart",
-         description="Retrieve an employee and their reporting structure by full name.")
-def get_employee(name: str = Query(..., description='Full name of employee to search')):
+@app.get('/imports/{job_id}', response_model=ImportJobStatus, tags=["employees"],
+         summary="Get import job status",
+         description="Returns the status, progress, throughput and errors of a background CSV import.")
+async def get_import_job(job_id: str, authorized: bool = Depends(require_admin)):
+    job = import_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return ImportJobStatus.model_validate(job)
+
+# Generations restart at 0 with the process, so ETags are salted per process
+ETAG_SALT = uuid.uuid4().hex
+
+def _etag(*parts) -> str:
+    # Weak: the same tree may be sent gzipped or not
+    return 'W/"' + hashlib.sha1(repr((ETAG_SALT,) + parts).encode()).hexdigest()[:20] + '"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or any(tag.removeprefix('W/') == etag.removeprefix('W/') for tag in tags)
+
+async def _load_subtree(name: str, depth: Optional[int], max_nodes: int, generation: int) -> Dict:
+    cache_key = (name, depth, max_nodes)
+    cached = subtree_cache.get(cache_key)
+    if cached is not None:
+        RESULT_SIZE.labels('employee').observe(len(cached['nodes']) + len(cached['links']))
+        return cached
+
+    snapshot = org_snapshot.snapshot
+    if snapshot is not None:
+        # Serve from the in-memory graph; Neo4j remains the source of truth
+        response = snapshot.subtree(name, depth, max_nodes) or {"nodes": [], "links": []}
+        subtree_cache.put(cache_key, response, generation)
+        RESULT_SIZE.labels('employee').observe(len(response['nodes']) + len(response['links']))
+        return response
+
     try:
         logger.info(f"Searching for employee: {name}")
-        # Return nodes and links for the sub-tree under the employee
-        # Updated query to support any employee, whether they manage others or not
-        query = (
-            "MATCH (e:Employee {fullName: $name}) "
-            "OPTIONAL MATCH p=(e)-[:MANAGES*0..]->(sub) "
-            "WITH COLLECT(nodes(p)) AS paths_nodes, COLLECT(relationships(p)) AS paths_rels, e "
-            "UNWIND paths_nodes AS nds UNWIND nds AS n WITH COLLECT(DISTINCT n) AS nodes, paths_rels, e "
-            "UNWIND paths_rels AS rls UNWIND rls AS r WITH nodes, COLLECT(DISTINCT r) AS rels, e "
-            "RETURN "
-            "CASE WHEN size(nodes) = 0 THEN [e] ELSE nodes END AS nodes, "
-            "rels "
-            "LIMIT 1"
-        )
-        
-        driver = neo4j_conn.get_driver()
-        with driver.session() as session:
-            result = session.run(query, name=name)
-            record = result.single()
+        driver = await neo4j_conn.get_async_driver()
+        async with driver.session() as session:
+            record = None
+            if depth is None:
+                # Whole subtree: one index range scan over the interval labels
+                with observe_query('subtree_range'):
+                    result = await session.run(SUBTREE_RANGE_QUERY, name=name, limit=max_nodes - 1)
+                    record = await result.single()
+            if depth is not None or (record and not record.get('exact')):
+                # Depth limits, second managers and cycles need the traversal
+                with observe_query('subtree'):
+                    result = await session.run(build_subtree_query(depth), name=name, limit=max_nodes - 1)
+                    record = await result.single()
             
             if not record:
-                # Let's also check what employees exist in the database to help with debugging
+                # Clients resolve exact names through /employees/search
                 logger.warning(f"No employee found with name: {name}")
-                all_employees_query = "MATCH (e:Employee) RETURN e.fullName AS fullName LIMIT 10"
-                all_employees_result = session.run(all_employees_query)
-                employee_names = [record["fullName"] for record in all_employees_result]
-                logger.info(f"Available employees: {employee_names}")
-                return {"nodes": [], "links": []}
-                
-            nodes_raw = record['nodes'] or []
-            rels_raw = record['rels'] or []
-            nodes = []
-            id_map = {}
-            
-            for n in nodes_raw:
-                nid = n.id
-                id_map[nid] = len(nodes)
-                nodes.append({
-                    'id': nid,
-                    'fullName': n.get('fullName'),
-                    'firstName': n.get('firstName'),
-                    'lastName': n.get('lastName'),
-                    'email': n.get('email'),
-                    'phone': n.get('phone'),
-                    'address': n.get('address')
-                })
+                response = {"nodes": [], "links": []}
+                subtree_cache.put(cache_key, response, generation)
+                return response
                 
-            links = []
-            for r in rels_raw:
-                start = r.start_node.id
-                end = r.end_node.id
-                links.append({
-                    'from_id': start,
-                    'to_id': end,
-                    'type': r.type
-                })
+            nodes, links = subtree_from_record(record)
+            truncated = bool(record.get('truncated'))
+            if truncated:
+                logger.warning(f"Subtree for {name} truncated at {max_nodes} nodes")
                 
             logger.info(f"Found {len(nodes)} nodes and {len(links)} relationships for {name}")
-            return {'nodes': nodes, 'links': links}
+            RESULT_SIZE.labels('employee').observe(len(nodes) + len(links))
+            response = {'nodes': nodes, 'links': links, 'truncated': truncated}
+            subtree_cache.put(cache_key, response, generation)
+            return response
             
     except Exception as e:
         logger.error(f"Error retrieving employee data: {str(e)}")
@@ -364,6 +679,280 @@ def get_employee(name: str = Query(..., description='Full name of employee to se
             detail=f"Error retrieving employee data: {str(e)}"
         )
 
+@app.get('/employee', response_model=Union[EmployeeResponse, ColumnarEmployeeResponse], tags=["employees"],
+         summary="Get employee org chart",
+         description="Retrieve an employee and their reporting structure by full name. "
+                     "Responses carry an ETag derived from the import generation and the query; "
+                     "send it back in `If-None-Match` to get `304 Not Modified` until the next import.",
+         responses={304: {"description": "The tree has not changed since the ETag was issued"}})
+async def get_employee(response: Response,
+                       name: str = Query(..., description='Full name of employee to search'),
+                       depth: Optional[int] = Query(None, ge=0, le=MAX_DEPTH, description='Maximum number of reporting levels below the employee'),
+                       max_nodes: int = Query(DEFAULT_MAX_NODES, ge=1, le=100000, description='Maximum number of nodes to return'),
+                       format: Literal['default', 'columnar'] = Query('default', description='`columnar`: parallel node arrays and links as index pairs'),
+                       if_none_match: Optional[str] = Header(None)):
+    generation = subtree_cache.generation
+    etag = _etag(generation, name, depth, max_nodes, format)
+    # Clients must revalidate, which is cheap: a matching ETag never reaches the cache or Neo4j
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+    subtree = await _load_subtree(name, depth, max_nodes, generation)
+    return to_columnar(subtree) if format == 'columnar' else subtree
+
+async def _resolve_chains(ids: List[int]) -> Dict[int, List[Dict]]:
+    snapshot = org_snapshot.snapshot
+    if snapshot is not None:
+        chains = {employee_id: snapshot.chain(employee_id, MAX_DEPTH) for employee_id in ids}
+        return {employee_id: chain for employee_id, chain in chains.items() if chain is not None}
+    driver = await neo4j_conn.get_async_driver()
+    async with driver.session() as session:
+        with observe_query('chains'):
+            result = await session.run(CHAINS_QUERY, ids=ids)
+            return {record['id']: [node_to_dict(n) for n in record['chain']] async for record in result}
+
+@app.get('/employee/{employee_id}/chain', response_model=ChainResponse, tags=["employees"],
+         summary="Get an employee's management chain",
+         description="Returns the ordered path from the employee up to the root of the org chart in a single bounded query.")
+async def get_management_chain(employee_id: int):
+    try:
+        chains = await _resolve_chains([employee_id])
+    except Exception as e:
+        logger.error(f"Error retrieving management chain: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving management chain: {str(e)}"
+        )
+    if employee_id not in chains:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found")
+    return {'id': employee_id, 'chain': chains[employee_id]}
+
+@app.get('/employee/{employee_id}/stats', response_model=EmployeeStats, tags=["employees"],
+         summary="Get headcount, span of control and depth of an employee",
+         description="Reads the aggregates precomputed after every import: direct reports, everyone rolling up to the employee, "
+                     "depth from the root and levels below. No traversal happens at request time.")
+async def get_employee_stats(employee_id: int):
+    snapshot = org_snapshot.snapshot
+    try:
+        if snapshot is not None:
+            stats = snapshot.stats(employee_id)
+        else:
+            driver = await neo4j_conn.get_async_driver()
+            async with driver.session() as session:
+                with observe_query('employee_stats'):
+                    result = await session.run(EMPLOYEE_BY_ID_QUERY, id=employee_id)
+                    record = await result.single()
+            stats = node_to_dict(record['e']) if record else None
+    except Exception as e:
+        logger.error(f"Error retrieving employee stats: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving employee stats: {str(e)}"
+        )
+    if stats is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found")
+    return stats
+
+@app.get('/employee/{employee_id}/is-under/{manager_id}', response_model=IsUnderResponse, tags=["employees"],
+         summary="Check whether an employee reports to a manager",
+         description="True when `manager_id` manages `employee_id` directly or indirectly. Compares the pre-order "
+                     "interval labels assigned after every import; only managers whose interval is not exact "
+                     "(second managers or cycles below them) need a bounded traversal.")
+async def is_under(employee_id: int, manager_id: int):
+    snapshot = org_snapshot.snapshot
+    try:
+        if snapshot is not None:
+            under = snapshot.is_under(employee_id, manager_id)
+        else:
+            driver = await neo4j_conn.get_async_driver()
+            async with driver.session() as session:
+                with observe_query('is_under'):
+                    result = await session.run(IS_UNDER_QUERY, employee_id=employee_id, manager_id=manager_id)
+                    record = await result.single()
+            under = record['under'] if record else None
+    except Exception as e:
+        logger.error(f"Error checking reporting line: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error checking reporting line: {str(e)}"
+        )
+    if under is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found")
+    return {'employee_id': employee_id, 'manager_id': manager_id, 'is_under': bool(under)}
+
+@app.post('/employees/chains', response_model=ChainsResponse, tags=["employees"],
+          summary="Get management chains for many employees",
+          description="Batched variant of `/employee/{id}/chain`: resolves every requested chain in one query.")
+async def get_management_chains(request: ChainsRequest):
+    ids = list(dict.fromkeys(request.ids))
+    try:
+        chains = await _resolve_chains(ids)
+    except Exception as e:
+        logger.error(f"Error retrieving management chains: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving management chain: {str(e)}"
+        )
+    RESULT_SIZE.labels('chains').observe(sum(len(chain) for chain in chains.values()))
+    return {
+        'chains': [{'id': employee_id, 'chain': chains[employee_id]} for employee_id in ids if employee_id in chains],
+        'missing': [employee_id for employee_id in ids if employee_id not in chains],
+    }
+
+async def _resolve_subtrees(roots: List[Dict], depth: Optional[int], max_nodes: int) -> Dict:
+    snapshot = org_snapshot.snapshot
+    if snapshot is not None:
+        return snapshot.subtrees([(root['by'], root['key']) for root in roots], depth, max_nodes)
+    driver = await neo4j_conn.get_async_driver()
+    async with driver.session() as session:
+        with observe_query('subtrees'):
+            result = await session.run(build_subtrees_query(depth), roots=roots, limit=max_nodes - 1)
+            record = await result.single()
+    if not record:
+        return {'nodes': [], 'links': [], 'roots': [], 'missing': [{'by': r['by'], 'key': r['key']} for r in roots]}
+    nodes, links = subtree_from_record(record)
+    # The query groups roots; restore request order and report the ones it did not find
+    found = {(root['by'], root['key']): root for root in record['roots']}
+    return {
+        'nodes': nodes,
+        'links': links,
+        'roots': [found[(r['by'], r['key'])] for r in roots if (r['by'], r['key']) in found],
+        'missing': [{'by': r['by'], 'key': r['key']} for r in roots if (r['by'], r['key']) not in found],
+    }
+
+@app.post('/employees/subtrees', response_model=SubtreesResponse, tags=["employees"],
+          summary="Get the subtrees of many employees",
+          description="Resolves several roots (by name, email or ID) in one query and returns the merged nodes and links, "
+                      "each employee once, with the member IDs of every root.")
+async def get_employee_subtrees(request: SubtreesRequest):
+    roots = [{'by': 'name', 'key': name, 'name': name} for name in dict.fromkeys(request.names)]
+    roots += [{'by': 'email', 'key': email, 'email': email} for email in dict.fromkeys(request.emails)]
+    roots += [{'by': 'id', 'key': employee_id, 'id': employee_id} for employee_id in dict.fromkeys(request.ids)]
+    if not roots:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No roots requested")
+    try:
+        response = await _resolve_subtrees(roots, request.depth, request.max_nodes)
+    except Exception as e:
+        logger.error(f"Error retrieving subtrees: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving employee data: {str(e)}"
+        )
+    RESULT_SIZE.labels('subtrees').observe(len(response['nodes']) + len(response['links']))
+    return response
+
+@app.get('/employees/search', response_model=SearchResponse, tags=["employees"],
+         summary="Search employees by name or email",
+         description="Typeahead search: case-insensitive prefix matching that tolerates one typo per word, backed by a Neo4j full-text index.")
+async def search_employees(q: str = Query(..., min_length=1, max_length=200, description='Partial name or email'),
+                           limit: int = Query(10, ge=1, le=50, description='Maximum number of results')):
+    lucene_query = build_search_query(q)
+    if not lucene_query:
+        return {"results": []}
+    try:
+        driver = await neo4j_conn.get_async_driver()
+        async with driver.session() as session:
+            with observe_query('search'):
+                result = await session.run(SEARCH_QUERY, query=lucene_query, limit=limit)
+                results = [
+                    {
+                        'id': record['node'].id,
+                        'fullName': record['node'].get('fullName'),
+                        'email': record['node'].get('email'),
+                        'score': record['score'],
+                    }
+                    async for record in result
+                ]
+        RESULT_SIZE.labels('search').observe(len(results))
+        return {"results": results}
+    except Exception as e:
+        logger.error(f"Error searching employees: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching employees: {str(e)}"
+        )
+
+@app.get('/employee/subtree', response_model=SubtreePage, tags=["employees"],
+         summary="Page through an employee's subtree",
+         description="Cursor-paginated subtree under the named employee. Pass the returned `next_cursor` to fetch the next page.")
+async def get_employee_subtree_page(name: str = Query(..., description='Full name of employee to search'),
+                                    depth: Optional[int] = Query(None, ge=0, le=MAX_DEPTH, description='Maximum number of reporting levels below the employee'),
+                                    limit: int = Query(1000, ge=1, le=10000, description='Nodes per page'),
+                                    cursor: int = Query(-1, description='Cursor returned by the previous page')):
+    try:
+        driver = await neo4j_conn.get_async_driver()
+        async with driver.session() as session:
+            with observe_query('subtree_page'):
+                result = await session.run(build_subtree_rows_query(depth, paged=True),
+                                           name=name, cursor=cursor, limit=limit)
+                nodes = []
+                links = []
+                async for record in result:
+                    nodes.append(node_to_dict(record['n']))
+                    links.extend(links_from_row(record))
+        next_cursor = nodes[-1]['id'] if len(nodes) == limit else None
+        RESULT_SIZE.labels('subtree_page').observe(len(nodes) + len(links))
+        return {'nodes': nodes, 'links': links, 'next_cursor': next_cursor}
+    except Exception as e:
+        logger.error(f"Error retrieving subtree page: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving employee data: {str(e)}"
+        )
+
+@app.get('/employee/stream', tags=["employees"],
+         summary="Stream an employee's subtree as NDJSON",
+         description="Streams the subtree under the named employee as newline-delimited JSON: one `{\"node\": ...}` line per employee "
+                     "followed by `{\"link\": ...}` lines for its managers, emitted as rows are read from Neo4j.",
+         response_class=StreamingResponse)
+async def stream_employee_subtree(name: str = Query(..., description='Full name of employee to search'),
+                                  depth: Optional[int] = Query(None, ge=0, le=MAX_DEPTH, description='Maximum number of reporting levels below the employee')):
+    driver = await neo4j_conn.get_async_driver()
+
+    async def lines():
+        count = 0
+        try:
+            # Timed until the last row is sent, so a slow client shows up here too
+            async with driver.session() as session:
+                with observe_query('subtree_stream'):
+                    result = await session.run(build_subtree_rows_query(depth), name=name)
+                    async for record in result:
+                        yield json.dumps({'node': node_to_dict(record['n'])}) + '\n'
+                        count += 1
+                        for link in links_from_row(record):
+                            yield json.dumps({'link': link}) + '\n'
+                            count += 1
+            RESULT_SIZE.labels('subtree_stream').observe(count)
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            logger.error(f"Error streaming subtree for {name}: {str(e)}")
+            yield json.dumps({'error': f"Error retrieving employee data: {str(e)}"}) + '\n'
+
+    return StreamingResponse(lines(), media_type='application/x-ndjson')
+
+@app.get('/admin/schema', response_model=SchemaStatusResponse, tags=["admin"],
+         summary="Get schema migration and index state",
+         description="Returns the applied schema migration version, the state of every index and the migrations "
+                     "still pending, including any blocked behind one that failed on startup.")
+async def get_schema_status(authorized: bool = Depends(require_admin)):
+    try:
+        driver = await neo4j_conn.get_async_driver()
+        version = await get_schema_version(driver)
+        return {
+            "version": version,
+            "latest_version": MIGRATIONS[-1][0],
+            "indexes": await get_index_status(driver),
+            "pending": migration_status.pending(version),
+        }
+    except Exception as e:
+        logger.error(f"Error retrieving schema status: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving schema status: {str(e)}"
+        )
+
 @app.get('/')
 def index():
     return {'status': 'ok'}
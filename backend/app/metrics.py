@@ -0,0 +1,71 @@
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+
+# Sub-millisecond cache hits up to multi-second imports and full-tree reads
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1, 10, 100, 1000, 5000, 10000, 50000, 100000)
+
+REQUEST_LATENCY = Histogram(
+    'orgchart_http_request_duration_seconds', 'HTTP request latency until the response headers are sent',
+    ['method', 'route', 'status'], buckets=LATENCY_BUCKETS,
+)
+QUERY_LATENCY = Histogram(
+    'orgchart_neo4j_query_duration_seconds', 'Neo4j query time including reading the result',
+    ['query'], buckets=LATENCY_BUCKETS,
+)
+QUERY_ERRORS = Counter('orgchart_neo4j_query_errors_total', 'Neo4j queries that raised', ['query'])
+QUERIES_IN_FLIGHT = Gauge(
+    'orgchart_neo4j_queries_in_flight', 'Queries currently holding a pooled connection', ['driver'],
+)
+POOL_MAX_SIZE = Gauge('orgchart_neo4j_pool_max_size', 'Configured connection pool size per driver', ['driver'])
+RESULT_SIZE = Histogram(
+    'orgchart_result_size_items', 'Nodes plus links (or hits) returned per request',
+    ['endpoint'], buckets=SIZE_BUCKETS,
+)
+IMPORT_ROWS = Counter('orgchart_import_rows_total', 'Rows written by import batches', ['query'])
+
+
+@contextmanager
+def observe_query(name: str, driver: str = 'async'):
+    """Time a Cypher call, from ``session.run`` until its result has been read.
+
+    Works in sync and async code alike: wrap the ``run`` call and the
+    consumption of its result. Auto-commit queries hold a pooled connection
+    for exactly this span, so the in-flight gauge doubles as pool usage.
+    """
+    in_flight = QUERIES_IN_FLIGHT.labels(driver)
+    in_flight.inc()
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        QUERY_ERRORS.labels(name).inc()
+        raise
+    finally:
+        QUERY_LATENCY.labels(name).observe(time.perf_counter() - started)
+        in_flight.dec()
+
+
+class CacheCollector:
+    """Exports the counters of a ``SubtreeCache`` at scrape time."""
+
+    def __init__(self, stats: Callable[[], Dict[str, int]]):
+        self.stats = stats
+
+    def collect(self):
+        stats = self.stats()
+        for key in ('hits', 'misses', 'evictions'):
+            counter = CounterMetricFamily(f'orgchart_subtree_cache_{key}', f'Subtree cache {key}')
+            counter.add_metric([], stats[key])
+            yield counter
+        for key in ('entries', 'items', 'generation'):
+            gauge = GaugeMetricFamily(f'orgchart_subtree_cache_{key}', f'Subtree cache {key}')
+            gauge.add_metric([], stats[key])
+            yield gauge
+
+
+def register_cache(stats: Callable[[], Dict[str, int]]):
+    REGISTRY.register(CacheCollector(stats))
@@ -0,0 +1,252 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_MAX_NODES = int(os.getenv("SUBTREE_MAX_NODES", "10000"))
+MAX_DEPTH = 50
+
+
+def build_subtree_query(depth: Optional[int] = None) -> str:
+    """Subtree under the employee named ``$name``, each node and edge returned once.
+
+    ``collect(DISTINCT sub)`` over the variable-length match lets the planner
+    prune already-visited nodes instead of enumerating one path per
+    descendant, and edges come from a single-hop expansion of the reachable
+    set rather than from every path's relationship list. ``$limit`` caps the
+    number of descendants returned; ``truncated`` reports whether it did.
+    """
+    # Variable-length bounds cannot be parameters, so depth is validated and inlined
+    bound = "" if depth is None else str(min(int(depth), MAX_DEPTH))
+    return (
+        "MATCH (e:Employee {fullName: $name}) "
+        "WITH e LIMIT 1 "
+        f"OPTIONAL MATCH (e)-[:MANAGES*0..{bound}]->(sub) "
+        "WITH e, [s IN collect(DISTINCT sub) WHERE s <> e] AS subs "
+        "WITH e, subs[..$limit] AS subs, size(subs) > $limit AS truncated "
+        "WITH [e] + subs AS nodes, truncated "
+        "UNWIND nodes AS n "
+        "OPTIONAL MATCH (n)-[r:MANAGES]->() "
+        "RETURN nodes, collect(r) AS rels, truncated"
+    )
+
+
+# Subtree as one range scan over the employee_dfs_in index, in pre-order so a
+# truncated tree never contains a node without its manager. Only valid when
+# the root's interval is exact (see app.aggregates); ``exact`` is false
+# otherwise and the caller falls back to build_subtree_query.
+SUBTREE_RANGE_QUERY = (
+    "MATCH (e:Employee {fullName: $name}) "
+    "WITH e LIMIT 1 "
+    "OPTIONAL MATCH (sub:Employee) "
+    "WHERE e.dfsExact AND sub.dfsIn > e.dfsIn AND sub.dfsIn <= e.dfsOut "
+    "WITH e, sub ORDER BY sub.dfsIn LIMIT $limit + 1 "
+    "WITH e, collect(sub) AS subs "
+    "WITH e, subs[..$limit] AS subs, size(subs) > $limit AS truncated "
+    "WITH [e] + subs AS nodes, truncated, coalesce(e.dfsExact, false) AS exact "
+    "UNWIND nodes AS n "
+    "OPTIONAL MATCH (n)-[r:MANAGES]->() "
+    "RETURN nodes, collect(r) AS rels, truncated, exact"
+)
+
+
+def build_subtrees_query(depth: Optional[int] = None) -> str:
+    """Subtrees under every entry of ``$roots`` in one round-trip, shared nodes once.
+
+    Each root map carries one of ``name``, ``email`` or ``id`` (plus ``by``
+    and ``key`` echoed back); a name matching several employees resolves to
+    the lowest id. Returns one row: ``roots`` with per-root member ids and
+    ``truncated`` (``$limit`` applies per root), the distinct ``nodes`` and
+    their outgoing ``rels``. No row when no root exists.
+    """
+    bound = "" if depth is None else str(min(int(depth), MAX_DEPTH))
+    return (
+        "UNWIND $roots AS root "
+        "CALL { "
+        "WITH root MATCH (e:Employee {fullName: root.name}) RETURN e "
+        "UNION "
+        "WITH root MATCH (e:Employee {email: root.email}) RETURN e "
+        "UNION "
+        "WITH root MATCH (e:Employee) WHERE id(e) = root.id RETURN e "
+        "} "
+        "WITH root, e ORDER BY id(e) "
+        "WITH root, collect(e)[0] AS e "
+        "CALL { "
+        "WITH e "
+        f"OPTIONAL MATCH (e)-[:MANAGES*0..{bound}]->(sub) "
+        "WITH e, [s IN collect(DISTINCT sub) WHERE s <> e] AS subs "
+        "RETURN [e] + subs[..$limit] AS members, size(subs) > $limit AS truncated "
+        "} "
+        "WITH collect({by: root.by, key: root.key, id: id(e), members: [m IN members | id(m)], "
+        "truncated: truncated}) AS roots, collect(members) AS memberLists "
+        "UNWIND memberLists AS memberList "
+        "UNWIND memberList AS n "
+        "WITH roots, collect(DISTINCT n) AS nodes "
+        "UNWIND nodes AS n "
+        "OPTIONAL MATCH (n)-[r:MANAGES]->() "
+        "RETURN roots, nodes, collect(r) AS rels"
+    )
+
+
+def build_subtree_rows_query(depth: Optional[int] = None, paged: bool = False) -> str:
+    """One row per subtree member with the ids of its managers inside the subtree.
+
+    Rows are produced as the query runs, so callers can stream them or
+    page through them (``paged``: ``id(n) > $cursor``, ``$limit`` rows ordered
+    by id) without materializing the whole tree on the server.
+
+    Without ``depth`` and with an exact interval (see app.aggregates), members
+    come from a range scan over ``dfsIn`` and managers are checked against the
+    interval; otherwise both need a ``MANAGES*`` traversal, one more per row.
+    Either way every page still reads the whole subtree to order it by id, so
+    paging through ``S`` employees costs ``O(S * S / limit)`` reads; stream
+    whole trees instead.
+    """
+    bound = "" if depth is None else str(min(int(depth), MAX_DEPTH))
+    page = "WHERE id(n) > $cursor WITH e, n ORDER BY id(n) LIMIT $limit " if paged else ""
+    order = " ORDER BY id(n)" if paged else ""
+    if depth is not None:
+        members = f"MATCH (e)-[:MANAGES*0..{bound}]->(n) "
+        inside = f"EXISTS {{ MATCH (e)-[:MANAGES*0..{bound}]->(m) }}"
+    else:
+        members = (
+            "CALL { "
+            "WITH e WITH e WHERE e.dfsExact "
+            "MATCH (n:Employee) WHERE n.dfsIn >= e.dfsIn AND n.dfsIn <= e.dfsOut "
+            "RETURN n "
+            "UNION "
+            "WITH e WITH e WHERE NOT coalesce(e.dfsExact, false) "
+            "MATCH (e)-[:MANAGES*0..]->(n) "
+            "RETURN n "
+            "} "
+        )
+        inside = ("CASE WHEN e.dfsExact THEN m.dfsIn >= e.dfsIn AND m.dfsIn <= e.dfsOut "
+                  "ELSE EXISTS { MATCH (e)-[:MANAGES*0..]->(m) } END")
+    return (
+        "MATCH (e:Employee {fullName: $name}) "
+        "WITH e LIMIT 1 "
+        f"{members}"
+        "WITH DISTINCT e, n "
+        f"{page}"
+        "OPTIONAL MATCH (m:Employee)-[:MANAGES]->(n) "
+        f"WHERE n <> e AND {inside} "
+        f"RETURN n, collect(id(m)) AS managerIds{order}"
+    )
+
+
+def links_from_row(record) -> List[Dict]:
+    to_id = record['n'].id
+    return [{'from_id': from_id, 'to_id': to_id, 'type': 'MANAGES'} for from_id in record['managerIds'] or []]
+
+
+# Longest upward MANAGES path from each employee, i.e. the chain up to the root.
+# The literal bound keeps a cyclic reporting line from running away, and a path
+# never repeats an employee. With several managers, equally long paths are
+# ranked by their ids in order, the same rule as OrgSnapshot.chain.
+CHAINS_QUERY = (
+    "UNWIND $ids AS id "
+    "MATCH (e:Employee) WHERE id(e) = id "
+    "CALL { "
+    "WITH e "
+    f"MATCH p = (e)<-[:MANAGES*0..{MAX_DEPTH}]-(:Employee) "
+    "WHERE all(n IN nodes(p) WHERE single(m IN nodes(p) WHERE m = n)) "
+    "RETURN p ORDER BY length(p) DESC, [n IN nodes(p) | id(n)] LIMIT 1 "
+    "} "
+    "RETURN id, nodes(p) AS chain"
+)
+
+EMPLOYEE_BY_ID_QUERY = "MATCH (e:Employee) WHERE id(e) = $id RETURN e"
+
+# Two integer comparisons when the manager's interval is exact; otherwise a
+# hit inside the interval is still a real path, and only a miss needs the
+# bounded traversal.
+IS_UNDER_QUERY = (
+    "MATCH (a:Employee) WHERE id(a) = $employee_id "
+    "MATCH (b:Employee) WHERE id(b) = $manager_id "
+    "RETURN CASE "
+    "WHEN a = b THEN false "
+    "WHEN b.dfsIn < a.dfsIn AND a.dfsIn <= b.dfsOut THEN true "
+    "WHEN b.dfsExact THEN false "
+    f"ELSE EXISTS {{ MATCH (b)-[:MANAGES*1..{MAX_DEPTH}]->(a) }} "
+    "END AS under"
+)
+
+SEARCH_QUERY = (
+    "CALL db.index.fulltext.queryNodes('employee_search', $query, {limit: $limit}) "
+    "YIELD node, score "
+    "RETURN node, score"
+)
+
+
+def build_search_query(text: str) -> Optional[str]:
+    """Lucene query with typeahead semantics for the ``employee_search`` index.
+
+    Every term must match either as a prefix or within one edit, so
+    ``"jen smi"`` and ``"jenifer"`` both find "Jennifer Smith". Only word
+    characters are kept, which also strips Lucene's special characters.
+    """
+    terms = re.findall(r"\w+", text.lower())
+    if not terms:
+        return None
+    clauses = []
+    for term in terms:
+        # Edit distance on one- or two-letter terms matches nearly everything
+        clause = f"{term}*" if len(term) < 3 else f"({term}* OR {term}~1)"
+        clauses.append(f"+{clause}")
+    return " ".join(clauses)
+
+
+def node_to_dict(n) -> Dict:
+    return {
+        'id': n.id,
+        'fullName': n.get('fullName'),
+        'firstName': n.get('firstName'),
+        'lastName': n.get('lastName'),
+        'email': n.get('email'),
+        'phone': n.get('phone'),
+        'address': n.get('address'),
+        # Maintained by app.aggregates after every import
+        'directReports': n.get('directReports'),
+        'totalReports': n.get('totalReports'),
+        'depth': n.get('depth'),
+        'maxDepthBelow': n.get('maxDepthBelow'),
+    }
+
+
+NODE_FIELDS = ('id', 'fullName', 'firstName', 'lastName', 'email', 'phone', 'address',
+               'directReports', 'totalReports', 'depth', 'maxDepthBelow')
+
+
+def to_columnar(response: Dict) -> Dict:
+    """Column-oriented form of a subtree: one array per node field, links as index pairs.
+
+    Keys are sent once instead of once per node, and every link becomes two
+    small integers (positions in the node arrays) instead of an object.
+    """
+    nodes = response['nodes']
+    position = {node['id']: i for i, node in enumerate(nodes)}
+    return {
+        'columns': {field: [node.get(field) for node in nodes] for field in NODE_FIELDS},
+        'links': [[position[link['from_id']], position[link['to_id']]] for link in response['links']],
+        'truncated': response.get('truncated', False),
+    }
+
+
+def subtree_from_record(record) -> Tuple[List[Dict], List[Dict]]:
+    """Convert a subtree record into node and link dicts.
+
+    Relationships leaving the returned node set (children below the depth
+    limit or beyond the node cap) are dropped here with a set lookup.
+    """
+    nodes = [node_to_dict(n) for n in record['nodes'] or []]
+    node_ids = {node['id'] for node in nodes}
+    links = []
+    for r in record['rels'] or []:
+        start = r.start_node.id
+        end = r.end_node.id
+        if start in node_ids and end in node_ids:
+            links.append({
+                'from_id': start,
+                'to_id': end,
+                'type': r.type
+            })
+    return nodes, links
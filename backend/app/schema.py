@@ -0,0 +1,122 @@
+from typing import Dict, List, Optional
+from loguru import logger
+from app.metrics import observe_query
+
+# Ordered, append-only list of (version, description, statements). Every
+# statement must be idempotent so a migration interrupted half-way can rerun.
+MIGRATIONS = [
+    (1, "Unique Employee.email and range index on Employee.fullName", [
+        "CREATE CONSTRAINT employee_email_unique IF NOT EXISTS "
+        "FOR (e:Employee) REQUIRE e.email IS UNIQUE",
+        "CREATE INDEX employee_full_name IF NOT EXISTS "
+        "FOR (e:Employee) ON (e.fullName)",
+    ]),
+    (2, "Full-text index on Employee.fullName and Employee.email for search", [
+        "CREATE FULLTEXT INDEX employee_search IF NOT EXISTS "
+        "FOR (e:Employee) ON EACH [e.fullName, e.email]",
+    ]),
+    (3, "Range index on Employee.dfsIn for interval subtree scans", [
+        "CREATE INDEX employee_dfs_in IF NOT EXISTS "
+        "FOR (e:Employee) ON (e.dfsIn)",
+    ]),
+]
+
+CURRENT_VERSION_QUERY = (
+    "OPTIONAL MATCH (v:SchemaVersion {id: 'orgchart'}) "
+    "RETURN coalesce(v.version, 0) AS version"
+)
+
+SET_VERSION_QUERY = (
+    "MERGE (v:SchemaVersion {id: 'orgchart'}) "
+    "SET v.version = $version, v.description = $description, v.appliedAt = datetime()"
+)
+
+INDEX_STATUS_QUERY = (
+    "SHOW INDEXES YIELD name, type, labelsOrTypes, properties, state, populationPercent "
+    "RETURN name, type, labelsOrTypes, properties, state, populationPercent "
+    "ORDER BY name"
+)
+
+
+class MigrationStatus:
+    """Remembers the migration that failed on startup; every later one waits behind it."""
+
+    def __init__(self):
+        self.failed_version: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def record(self, version: int, error: str):
+        self.failed_version = version
+        self.error = error
+
+    def clear(self):
+        self.failed_version = None
+        self.error = None
+
+    def pending(self, current: Optional[int] = None) -> List[str]:
+        """One line per migration above ``current`` saying why it is not applied.
+
+        Without ``current`` only a recorded failure and what it blocks are listed.
+        """
+        if current is None:
+            if self.failed_version is None:
+                return []
+            current = self.failed_version - 1
+        lines = []
+        for version, description, _ in MIGRATIONS:
+            if version <= current:
+                continue
+            if self.failed_version is None:
+                lines.append(f"v{version} ({description}): pending")
+            elif version == self.failed_version:
+                lines.append(f"v{version} ({description}): failed: {self.error}")
+            else:
+                lines.append(f"v{version} ({description}): pending: blocked by v{self.failed_version}")
+        return lines
+
+
+async def get_schema_version(driver) -> int:
+    async with driver.session() as session:
+        with observe_query('schema_version'):
+            result = await session.run(CURRENT_VERSION_QUERY)
+            record = await result.single()
+            return int(record["version"]) if record else 0
+
+
+async def apply_migrations(driver, status: Optional[MigrationStatus] = None) -> int:
+    """Bring the database schema up to the latest migration and return its version.
+
+    Migrations run in order, so a failing one (e.g. duplicate emails blocking
+    the unique constraint) stops the rest; it is recorded on ``status`` and
+    re-raised.
+    """
+    current = await get_schema_version(driver)
+    for version, description, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        logger.info(f"Applying schema migration {version}: {description}")
+        try:
+            # Schema commands cannot share a transaction with writes, so each runs on its own
+            async with driver.session() as session:
+                with observe_query('schema_migration'):
+                    for statement in statements:
+                        result = await session.run(statement)
+                        await result.consume()
+                    result = await session.run(SET_VERSION_QUERY, version=version, description=description)
+                    await result.consume()
+        except Exception as e:
+            if status is not None:
+                status.record(version, str(e))
+            raise
+        current = version
+    if status is not None:
+        status.clear()
+    logger.info(f"Schema is at version {current}")
+    return current
+
+
+async def get_index_status(driver) -> List[Dict]:
+    async with driver.session() as session:
+        with observe_query('index_status'):
+            result = await session.run(INDEX_STATUS_QUERY)
+            return await result.data()
@@ -0,0 +1,113 @@
+import hmac
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+from loguru import logger
+
+
+class SecretCache:
+    """Caches a secret fetched from SSM (or the environment) for ``ttl`` seconds.
+
+    Once an entry is older than ``(1 - refresh_ahead) * ttl`` it is refreshed
+    on a background thread while the cached value keeps being served. When a
+    refresh returns a new value, the previous one stays valid for ``overlap``
+    seconds so clients holding the old key survive a rotation.
+    """
+
+    def __init__(self, name: str, fetch: Callable[[], Any], ttl: float, overlap: float = 0.0,
+                 refresh_ahead: float = 0.2, min_refresh_interval: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.fetch = fetch
+        self.ttl = ttl
+        self.overlap = overlap
+        self.refresh_ahead = refresh_ahead
+        self.min_refresh_interval = min_refresh_interval
+        self.clock = clock
+        self._value: Optional[Any] = None
+        self._fetched_at: Optional[float] = None
+        self._previous: List[Tuple[Any, float]] = []
+        # Last re-check forced by a mismatch, successful or not
+        self._rechecked_at: Optional[float] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def refresh(self) -> Any:
+        value = self.fetch()
+        now = self.clock()
+        with self._lock:
+            if self._value is not None and value != self._value:
+                logger.info(f"Secret {self.name} changed; previous value accepted for {self.overlap:.0f}s")
+                if self.overlap > 0:
+                    self._previous.append((self._value, now + self.overlap))
+            self._value = value
+            self._fetched_at = now
+        return value
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the cached value; the next expiry retries synchronously
+                logger.warning(f"Background refresh of {self.name} failed: {str(e)}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name=f"refresh-{self.name}", daemon=True).start()
+
+    def get(self) -> Any:
+        value, fetched_at = self._value, self._fetched_at
+        if value is None:
+            return self.refresh()
+        age = self.clock() - fetched_at
+        if age >= self.ttl:
+            return self.refresh()
+        if age >= self.ttl * (1 - self.refresh_ahead):
+            self._refresh_in_background()
+        return value
+
+    def valid_values(self) -> List[Any]:
+        current = self.get()
+        now = self.clock()
+        with self._lock:
+            self._previous = [(value, expires) for value, expires in self._previous if expires > now]
+            return [current] + [value for value, _ in self._previous]
+
+    @staticmethod
+    def _matches_any(candidate: str, values: List[Any]) -> bool:
+        # Compare against every value in constant time so timing reveals nothing
+        matched = False
+        for value in values:
+            matched |= hmac.compare_digest(candidate.encode(), str(value).encode())
+        return matched
+
+    def matches(self, candidate: str) -> bool:
+        if self._matches_any(candidate, self.valid_values()):
+            return True
+        # The secret may have been rotated since the last fetch; re-check at a bounded rate
+        now = self.clock()
+        with self._lock:
+            last = max(self._fetched_at or 0.0, self._rechecked_at or 0.0)
+            if self._fetched_at is None or now - last < self.min_refresh_interval:
+                return False
+            # Recorded before fetching so a failing SSM is not retried by every request
+            self._rechecked_at = now
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Re-check of {self.name} failed: {str(e)}")
+            return False
+        return self._matches_any(candidate, self.valid_values())
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+            self._fetched_at = None
+            self._rechecked_at = None
+            self._previous = []
@@ -0,0 +1,281 @@
+import os
+import threading
+import time
+from array import array
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from loguru import logger
+from app.metrics import observe_query
+
+SNAPSHOT_ENABLED = os.getenv("ORG_SNAPSHOT_ENABLED", "false").lower() in ("1", "true", "yes")
+
+LOAD_NODES_QUERY = (
+    "MATCH (e:Employee) "
+    "RETURN id(e) AS id, e.fullName AS fullName, e.firstName AS firstName, e.lastName AS lastName, "
+    "e.email AS email, e.phone AS phone, e.address AS address, "
+    "e.directReports AS directReports, e.totalReports AS totalReports, e.depth AS depth, "
+    "e.maxDepthBelow AS maxDepthBelow, e.dfsIn AS dfsIn, e.dfsOut AS dfsOut, e.dfsExact AS dfsExact"
+)
+
+LOAD_EDGES_QUERY = (
+    "MATCH (m:Employee)-[:MANAGES]->(e:Employee) "
+    "RETURN id(m) AS source, id(e) AS target"
+)
+
+
+# Fields returned to clients; the interval labels are only used for lookups
+RECORD_FIELDS = ('id', 'fullName', 'firstName', 'lastName', 'email', 'phone', 'address',
+                 'directReports', 'totalReports', 'depth', 'maxDepthBelow')
+
+
+class EmployeeRecord:
+    __slots__ = RECORD_FIELDS + ('dfsIn', 'dfsOut', 'dfsExact')
+
+    def __init__(self, id, fullName=None, firstName=None, lastName=None, email=None, phone=None, address=None,
+                 directReports=None, totalReports=None, depth=None, maxDepthBelow=None,
+                 dfsIn=None, dfsOut=None, dfsExact=None):
+        self.id = id
+        self.fullName = fullName
+        self.firstName = firstName
+        self.lastName = lastName
+        self.email = email
+        self.phone = phone
+        self.address = address
+        self.directReports = directReports
+        self.totalReports = totalReports
+        self.depth = depth
+        self.maxDepthBelow = maxDepthBelow
+        self.dfsIn = dfsIn
+        self.dfsOut = dfsOut
+        self.dfsExact = dfsExact
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in RECORD_FIELDS}
+
+
+class OrgSnapshot:
+    """Immutable, array-backed copy of the Employee/MANAGES graph.
+
+    Employees are renumbered to dense indexes 0..n-1; ``child_offsets`` and
+    ``children`` form a CSR adjacency list, so the direct reports of index
+    ``i`` are ``children[child_offsets[i]:child_offsets[i + 1]]``.
+    """
+
+    def __init__(self, records: List[EmployeeRecord], edges: Iterable[Tuple[int, int]], generation: int = 0):
+        self.records = records
+        self.generation = generation
+        self.loaded_at = time.time()
+        self.index = index = {record.id: i for i, record in enumerate(records)}
+        self.by_name: Dict[str, int] = {}
+        self.by_email: Dict[str, int] = {}
+        for i, record in enumerate(records):
+            if record.fullName is not None:
+                self.by_name.setdefault(record.fullName, i)
+            if record.email is not None:
+                self.by_email[record.email] = i
+
+        pairs = [(index[source], index[target]) for source, target in edges
+                 if source in index and target in index]
+        counts = array('q', bytes(8 * (len(records) + 1)))
+        for source, _ in pairs:
+            counts[source + 1] += 1
+        for i in range(len(records)):
+            counts[i + 1] += counts[i]
+        self.child_offsets = counts
+        self.children = array('q', bytes(8 * len(pairs)))
+        fill = array('q', counts)
+        for source, target in pairs:
+            self.children[fill[source]] = target
+            fill[source] += 1
+
+        # The reverse adjacency list: managers of index i
+        counts = array('q', bytes(8 * (len(records) + 1)))
+        for _, target in pairs:
+            counts[target + 1] += 1
+        for i in range(len(records)):
+            counts[i + 1] += counts[i]
+        self.manager_offsets = counts
+        self.managers = array('q', bytes(8 * len(pairs)))
+        fill = array('q', counts)
+        for source, target in pairs:
+            self.managers[fill[target]] = source
+            fill[target] += 1
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.children)
+
+    def _children(self, i: int):
+        return self.children[self.child_offsets[i]:self.child_offsets[i + 1]]
+
+    def stats(self, employee_id: int) -> Optional[Dict]:
+        i = self.index.get(employee_id)
+        return None if i is None else self.records[i].to_dict()
+
+    def is_under(self, employee_id: int, manager_id: int) -> Optional[bool]:
+        """Whether ``manager_id`` manages ``employee_id`` directly or indirectly.
+
+        Answered from the interval labels when the manager's interval is
+        exact, with a walk of the manager's subtree otherwise. ``None`` when
+        either employee is unknown.
+        """
+        i = self.index.get(employee_id)
+        j = self.index.get(manager_id)
+        if i is None or j is None:
+            return None
+        if i == j:
+            return False
+        employee, manager = self.records[i], self.records[j]
+        if None not in (employee.dfsIn, manager.dfsIn, manager.dfsOut):
+            if manager.dfsIn < employee.dfsIn <= manager.dfsOut:
+                return True
+            if manager.dfsExact:
+                return False
+        _, members, _ = self._walk(j, None, len(self.records))
+        return i in members
+
+    def resolve(self, by: str, key: Any) -> Optional[int]:
+        """Index of the employee with the given ``id``, ``email`` or ``name``."""
+        if by == 'id':
+            return self.index.get(key)
+        if by == 'email':
+            return self.by_email.get(key)
+        return self.by_name.get(key)
+
+    def _walk(self, root: int, depth: Optional[int], max_nodes: int) -> Tuple[List[int], Set[int], bool]:
+        """Breadth-first indexes under ``root``, capped at ``max_nodes``.
+
+        Truncation happens level by level, so a truncated tree never contains
+        a node whose manager was cut.
+        """
+        members = {root}
+        order = [root]
+        queue = deque([(root, 0)])
+        truncated = False
+        while queue and not truncated:
+            i, level = queue.popleft()
+            if depth is not None and level >= depth:
+                continue
+            for child in self._children(i):
+                if child in members:
+                    continue
+                if len(order) >= max_nodes:
+                    truncated = True
+                    break
+                members.add(child)
+                order.append(child)
+                queue.append((child, level + 1))
+        return order, members, truncated
+
+    def _nodes_and_links(self, order: List[int], members: Set[int]) -> Tuple[List[Dict], List[Dict]]:
+        records = self.records
+        nodes = [records[i].to_dict() for i in order]
+        links = [
+            {'from_id': records[i].id, 'to_id': records[child].id, 'type': 'MANAGES'}
+            for i in order for child in self._children(i) if child in members
+        ]
+        return nodes, links
+
+    def subtree(self, name: str, depth: Optional[int] = None, max_nodes: int = 10000) -> Optional[Dict]:
+        """Breadth-first subtree under ``name`` in the same shape as /employee."""
+        root = self.by_name.get(name)
+        if root is None:
+            return None
+        order, members, truncated = self._walk(root, depth, max_nodes)
+        nodes, links = self._nodes_and_links(order, members)
+        return {'nodes': nodes, 'links': links, 'truncated': truncated}
+
+    def subtrees(self, roots: List[Tuple[str, Any]], depth: Optional[int] = None,
+                 max_nodes: int = 10000) -> Dict:
+        """Subtrees of several ``(by, key)`` roots, each employee returned once.
+
+        ``roots`` in the result lists the member ids of every resolved root;
+        ``max_nodes`` applies per root.
+        """
+        order: List[int] = []
+        members: Set[int] = set()
+        memberships = []
+        missing = []
+        for by, key in roots:
+            root = self.resolve(by, key)
+            if root is None:
+                missing.append({'by': by, 'key': key})
+                continue
+            walk, _, truncated = self._walk(root, depth, max_nodes)
+            memberships.append({
+                'by': by, 'key': key, 'id': self.records[root].id,
+                'members': [self.records[i].id for i in walk], 'truncated': truncated,
+            })
+            for i in walk:
+                if i not in members:
+                    members.add(i)
+                    order.append(i)
+        nodes, links = self._nodes_and_links(order, members)
+        return {'nodes': nodes, 'links': links, 'roots': memberships, 'missing': missing}
+
+
+    def chain(self, employee_id: int, max_length: int = 50) -> Optional[List[Dict]]:
+        """Employee followed by each manager up to the root.
+
+        Same rule as CHAINS_QUERY: the longest upward path that repeats no
+        employee, with at most ``max_length`` managers; among equally long
+        paths the one with the smaller ids, compared in order, wins.
+        """
+        start = self.index.get(employee_id)
+        if start is None:
+            return None
+        best = [start]
+        path = [start]
+        best_ids = [employee_id]
+        on_path = {start}
+        # Iterative DFS over upward paths; with one manager each it is a single walk
+        stack = [iter(self.managers[self.manager_offsets[start]:self.manager_offsets[start + 1]])]
+        while stack:
+            manager = next(stack[-1], None)
+            if manager is None:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            if manager in on_path or len(path) > max_length:
+                continue
+            path.append(manager)
+            on_path.add(manager)
+            stack.append(iter(self.managers[self.manager_offsets[manager]:self.manager_offsets[manager + 1]]))
+            ids = [self.records[i].id for i in path]
+            if len(path) > len(best) or (len(path) == len(best) and ids < best_ids):
+                best, best_ids = list(path), ids
+        return [self.records[i].to_dict() for i in best]
+
+
+def load_snapshot(driver, generation: int = 0) -> OrgSnapshot:
+    with driver.session() as session:
+        with observe_query('snapshot_nodes', 'sync'):
+            records = [EmployeeRecord(**record.data()) for record in session.run(LOAD_NODES_QUERY)]
+        with observe_query('snapshot_edges', 'sync'):
+            edges = [(record['source'], record['target']) for record in session.run(LOAD_EDGES_QUERY)]
+    return OrgSnapshot(records, edges, generation)
+
+
+class SnapshotManager:
+    """Holds the current snapshot; readers take ``snapshot`` without locking."""
+
+    def __init__(self, enabled: bool = SNAPSHOT_ENABLED):
+        self.enabled = enabled
+        self.snapshot: Optional[OrgSnapshot] = None
+        self._lock = threading.Lock()
+
+    def refresh(self, driver, generation: int = 0) -> Optional[OrgSnapshot]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            started = time.perf_counter()
+            snapshot = load_snapshot(driver, generation)
+            self.snapshot = snapshot
+        logger.info(
+            f"Loaded org snapshot: {len(snapshot)} employees, {snapshot.edge_count} edges "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        return snapshot
@@ -0,0 +1,189 @@
+import time
+from dataclasses import dataclass, field
+from typing import Container, Dict, Iterable, List, Optional, Set, Tuple
+
+MAX_REPORTED_ISSUES = 100
+# Issues that make the MANAGES edges of a row unsafe to write; the others are reported only
+BLOCKING_ISSUES = ('self_manager', 'cycle')
+
+
+@dataclass
+class ValidationIssue:
+    kind: str
+    row: int
+    email: str
+    manager: Optional[str] = None
+
+
+@dataclass
+class ValidationReport:
+    rows: int = 0
+    roots: int = 0
+    # Issue counts per kind; ``issues`` keeps the first MAX_REPORTED_ISSUES
+    counts: Dict[str, int] = field(default_factory=dict)
+    issues: List[ValidationIssue] = field(default_factory=list)
+    # passed, rejected or quarantined
+    action: str = 'passed'
+    quarantined: int = 0
+    elapsed_ms: float = 0.0
+
+    def add(self, kind: str, row: int, email: str, manager: Optional[str] = None):
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        if len(self.issues) < MAX_REPORTED_ISSUES:
+            self.issues.append(ValidationIssue(kind, row, email, manager))
+
+    @property
+    def blocking(self) -> bool:
+        return any(self.counts.get(kind) for kind in BLOCKING_ISSUES)
+
+    def summary(self) -> str:
+        counts = ', '.join(f"{count} {kind}" for kind, count in sorted(self.counts.items()))
+        return f"{self.rows} rows validated: {counts or 'no issues'}"
+
+
+class ImportValidationError(ValueError):
+    """Raised before any write when the file fails validation in reject mode."""
+
+    def __init__(self, report: ValidationReport):
+        self.report = report
+        super().__init__(f"Import rejected, nothing was written. {report.summary()}")
+
+
+def _parent_cycles(parent: Dict[str, str]) -> List[List[str]]:
+    """Cycles when every employee has at most one manager: follow parent pointers once."""
+    walk_of: Dict[str, int] = {}
+    cycles = []
+    for walk, start in enumerate(parent):
+        if start in walk_of:
+            continue
+        path = []
+        node = start
+        while node is not None and node not in walk_of:
+            walk_of[node] = walk
+            path.append(node)
+            node = parent.get(node)
+        # Reaching a node of this same walk again closes a cycle
+        if node is not None and walk_of[node] == walk:
+            cycles.append(path[path.index(node):])
+    return cycles
+
+
+def _cycles(managers: Dict[str, List[str]]) -> List[List[str]]:
+    """Strongly connected components with more than one employee (Tarjan, iterative)."""
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    components = []
+    for start in managers:
+        if start in index:
+            continue
+        work = [(start, 0)]
+        while work:
+            node, position = work[-1]
+            if position == 0:
+                index[node] = low[node] = len(index)
+                stack.append(node)
+                on_stack.add(node)
+            successors = managers.get(node, ())
+            if position < len(successors):
+                work[-1] = (node, position + 1)
+                successor = successors[position]
+                if successor not in index:
+                    work.append((successor, 0))
+                elif successor in on_stack:
+                    low[node] = min(low[node], index[successor])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1:
+                    components.append(component)
+    return components
+
+
+def validate_org(entries: Iterable[Tuple[int, str, str, Optional[str]]],
+                 known_emails: Container[str] = frozenset()) -> Tuple[ValidationReport, Set[str]]:
+    """Check the reporting lines of a file in memory, in O(rows).
+
+    ``entries`` are ``(row, email, manager reference, resolved manager email)``
+    per CSV row; the reference is the manager name or email as written, empty
+    for employees without a manager. Finds:
+
+    - ``self_manager``: the row names the employee as their own manager
+    - ``cycle``: the employee is on a MANAGES cycle formed by the file's rows
+    - ``orphan``: the manager matches no single employee in the file or in
+      ``known_emails`` (the database)
+    - ``multiple_managers``: the same email appears with different managers
+    - ``multiple_roots``: reported for every root (an employee without a
+      manager on any of their rows) when the file has several
+
+    Returns the report and the emails whose MANAGES edges must not be
+    written. Cycles that only close through edges already in the database
+    are not visible here.
+    """
+    started = time.perf_counter()
+    report = ValidationReport()
+    rows: Dict[str, int] = {}
+    # First manager per employee; further distinct managers are rare and kept apart
+    parent: Dict[str, str] = {}
+    extra: Dict[str, List[str]] = {}
+    # First row without a manager per employee, and everyone given a manager on some row
+    unmanaged: Dict[str, int] = {}
+    managed: Set[str] = set()
+    blocked: Set[str] = set()
+    for row, email, reference, manager in entries:
+        report.rows += 1
+        if email not in rows:
+            rows[email] = row
+        if not reference:
+            unmanaged.setdefault(email, row)
+            continue
+        managed.add(email)
+        if manager is None:
+            report.add('orphan', row, email, reference)
+        elif manager == email:
+            report.add('self_manager', row, email, manager)
+            blocked.add(email)
+        else:
+            first = parent.setdefault(email, manager)
+            if first != manager and manager not in extra.get(email, ()):
+                extra.setdefault(email, []).append(manager)
+                report.add('multiple_managers', row, email, manager)
+
+    for email, manager in parent.items():
+        if manager not in rows and manager not in known_emails:
+            report.add('orphan', rows[email], email, manager)
+        for candidate in extra.get(email, ()):
+            if candidate not in rows and candidate not in known_emails:
+                report.add('orphan', rows[email], email, candidate)
+    roots = [(row, email) for email, row in unmanaged.items() if email not in managed]
+    report.roots = len(roots)
+    if len(roots) > 1:
+        for row, email in roots:
+            report.add('multiple_roots', row, email)
+
+    # Only edges between employees of the file can close a cycle here
+    if extra:
+        cycles = _cycles({email: [m for m in [manager] + extra.get(email, []) if m in rows]
+                          for email, manager in parent.items()})
+    else:
+        cycles = _parent_cycles({email: manager for email, manager in parent.items() if manager in rows})
+    for component in cycles:
+        members = set(component)
+        for email in sorted(component, key=rows.get):
+            manager = next(m for m in [parent[email]] + extra.get(email, []) if m in members)
+            report.add('cycle', rows[email], email, manager)
+        blocked |= members
+
+    report.elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+    return report, blocked
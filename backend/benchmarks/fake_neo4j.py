@@ -0,0 +1,312 @@
+"""
+In-process stand-in for the Neo4j drivers, for benchmarks without a database.
+
+FakeGraph keeps employees and MANAGES edges in dicts and answers exactly the
+queries the import pipeline, schema migrations, health checks, snapshot
+loader and /employee issue; anything else raises NotImplementedError.
+Timings against it measure the API, serialization and import batching, not
+Cypher, so compare fake runs only with other fake runs.
+"""
+import re
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+from app.aggregates import (AGGREGATE_FIELDS, CLEAR_EXACT_INTERVALS, INTERVAL_FIELDS, LOAD_AGGREGATES_QUERY,
+                            SET_AGGREGATES, STORED_FIELDS)
+from app.health import COMPONENTS_QUERY
+from app.importer import (DELETE_EMPLOYEES, DELETE_MANAGES, EXISTING_FINGERPRINTS, LOOKUP_EMAILS, LOOKUP_MANAGER_NAMES,
+                          MERGE_EMPLOYEES, MERGE_MANAGES_BY_EMAIL)
+from app.queries import SUBTREE_RANGE_QUERY
+from app.schema import CURRENT_VERSION_QUERY, MIGRATIONS, SET_VERSION_QUERY
+from app.snapshot import LOAD_EDGES_QUERY, LOAD_NODES_QUERY
+
+SCHEMA_STATEMENTS = {statement for _, _, statements in MIGRATIONS for statement in statements}
+PROPERTIES = {'first': 'firstName', 'last': 'lastName', 'full': 'fullName', 'phone': 'phone',
+              'address': 'address', 'rowHash': 'rowHash', 'managerKey': 'managerKey'}
+
+
+class FakeNode:
+    __slots__ = ('id', 'props')
+
+    def __init__(self, id: int, props: Dict):
+        self.id = id
+        self.props = props
+
+    def get(self, key, default=None):
+        return self.props.get(key, default)
+
+    def __getitem__(self, key):
+        return self.props[key]
+
+
+class FakeRelationship:
+    __slots__ = ('start_node', 'end_node', 'type')
+
+    def __init__(self, start_node: FakeNode, end_node: FakeNode):
+        self.start_node = start_node
+        self.end_node = end_node
+        self.type = 'MANAGES'
+
+
+class FakeRecord(dict):
+    def data(self):
+        return dict(self)
+
+
+class FakeGraph:
+    def __init__(self):
+        self.nodes: Dict[int, FakeNode] = {}
+        self.by_email: Dict[str, int] = {}
+        self.by_name: Dict[str, List[int]] = {}
+        self.children: Dict[int, Dict[int, None]] = {}
+        self.parents: Dict[int, Dict[int, None]] = {}
+        self.schema_version = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _merge(self, email: str) -> FakeNode:
+        node_id = self.by_email.get(email)
+        if node_id is None:
+            node_id = self._next_id
+            self._next_id += 1
+            self.nodes[node_id] = FakeNode(node_id, {'email': email})
+            self.by_email[email] = node_id
+            self.children[node_id] = {}
+            self.parents[node_id] = {}
+        return self.nodes[node_id]
+
+    def _set_name(self, node: FakeNode, name: Optional[str]):
+        old = node.props.get('fullName')
+        if old == name:
+            return
+        if old is not None:
+            self.by_name[old].remove(node.id)
+        if name is not None:
+            self.by_name.setdefault(name, []).append(node.id)
+        node.props['fullName'] = name
+
+    def _delete(self, node_id: int):
+        for child in self.children.pop(node_id):
+            del self.parents[child][node_id]
+        for parent in self.parents.pop(node_id):
+            del self.children[parent][node_id]
+        node = self.nodes.pop(node_id)
+        self._set_name(node, None)
+        del self.by_email[node.props['email']]
+
+    def _subtree(self, query: str, name: str, limit: int) -> List[FakeRecord]:
+        ids = self.by_name.get(name)
+        if not ids:
+            return []
+        bound = re.search(r'MANAGES\*0\.\.(\d*)', query).group(1)
+        max_depth = int(bound) if bound else None
+        root = min(ids)
+        seen = {root: 0}
+        queue = deque([root])
+        while queue:
+            current = queue.popleft()
+            if max_depth is not None and seen[current] >= max_depth:
+                continue
+            for child in self.children[current]:
+                if child not in seen:
+                    seen[child] = seen[current] + 1
+                    queue.append(child)
+        subs = [node_id for node_id in seen if node_id != root]
+        members = [root] + subs[:limit]
+        rels = [FakeRelationship(self.nodes[m], self.nodes[c]) for m in members for c in self.children[m]]
+        return [FakeRecord(nodes=[self.nodes[m] for m in members], rels=rels, truncated=len(subs) > limit)]
+
+    def _subtree_range(self, name: str, limit: int) -> List[FakeRecord]:
+        ids = self.by_name.get(name)
+        if not ids:
+            return []
+        root = self.nodes[min(ids)]
+        if not root.props.get('dfsExact'):
+            return [FakeRecord(nodes=[root], rels=[], truncated=False, exact=False)]
+        low, high = root.props['dfsIn'], root.props['dfsOut']
+        # No index here: a scan stands in for the range seek
+        subs = sorted((n for n in self.nodes.values()
+                       if n.props.get('dfsIn') is not None and low < n.props['dfsIn'] <= high),
+                      key=lambda n: n.props['dfsIn'])
+        members = [root] + subs[:limit]
+        rels = [FakeRelationship(m, self.nodes[c]) for m in members for c in self.children[m.id]]
+        return [FakeRecord(nodes=members, rels=rels, truncated=len(subs) > limit, exact=True)]
+
+    def run(self, query: str, params: Dict) -> List[FakeRecord]:
+        with self._lock:
+            return self._run(query, params)
+
+    def _run(self, query: str, params: Dict) -> List[FakeRecord]:
+        if query == MERGE_EMPLOYEES:
+            for row in params['rows']:
+                node = self._merge(row['email'])
+                for key, prop in PROPERTIES.items():
+                    if prop == 'fullName':
+                        self._set_name(node, row[key])
+                    else:
+                        node.props[prop] = row[key]
+            return []
+        if query == MERGE_MANAGES_BY_EMAIL:
+            for row in params['rows']:
+                if row['email'] in self.by_email:
+                    report = self.by_email[row['email']]
+                    manager = self._merge(row['managerEmail']).id
+                    self.children[manager][report] = None
+                    self.parents[report][manager] = None
+            return []
+        if query == LOOKUP_MANAGER_NAMES:
+            records = []
+            for name in params['names']:
+                emails = sorted({self.nodes[i].props['email'] for i in self.by_name.get(name, ())})
+                if emails:
+                    records.append(FakeRecord(name=name, emails=emails))
+            return records
+        if query == LOOKUP_EMAILS:
+            return [FakeRecord(email=email) for email in params['emails'] if email in self.by_email]
+        if query == EXISTING_FINGERPRINTS:
+            return [FakeRecord(email=n.props['email'], rowHash=n.props.get('rowHash'),
+                               managerKey=n.props.get('managerKey')) for n in self.nodes.values()]
+        if query == DELETE_MANAGES:
+            for row in params['rows']:
+                report = self.by_email.get(row['email'])
+                if report is not None:
+                    for manager in self.parents[report]:
+                        del self.children[manager][report]
+                    self.parents[report] = {}
+            return []
+        if query == DELETE_EMPLOYEES:
+            for row in params['rows']:
+                if row['email'] in self.by_email:
+                    self._delete(self.by_email[row['email']])
+            return []
+        if query == LOAD_NODES_QUERY:
+            return [FakeRecord(id=n.id, **{key: n.props.get(key) for key in
+                                           ('fullName', 'firstName', 'lastName', 'email', 'phone', 'address')
+                                           + AGGREGATE_FIELDS + INTERVAL_FIELDS})
+                    for n in self.nodes.values()]
+        if query == LOAD_AGGREGATES_QUERY:
+            return [FakeRecord(id=n.id, **{key: n.props.get(key) for key in STORED_FIELDS})
+                    for n in self.nodes.values()]
+        if query == SET_AGGREGATES:
+            for row in params['rows']:
+                if row['id'] in self.nodes:
+                    self.nodes[row['id']].props.update({key: row[key] for key in STORED_FIELDS})
+            return []
+        if query == CLEAR_EXACT_INTERVALS:
+            exact = [n for n in self.nodes.values() if n.props.get('dfsExact') is True]
+            for node in exact:
+                node.props['dfsExact'] = False
+            return [FakeRecord(cleared=len(exact))]
+        if query == SUBTREE_RANGE_QUERY:
+            return self._subtree_range(params['name'], params['limit'])
+        if query == LOAD_EDGES_QUERY:
+            return [FakeRecord(source=m, target=c) for m, children in self.children.items() for c in children]
+        if query.startswith('MATCH (e:Employee {fullName: $name}) WITH e LIMIT 1 OPTIONAL MATCH'):
+            return self._subtree(query, params['name'], params['limit'])
+        if query == CURRENT_VERSION_QUERY:
+            return [FakeRecord(version=self.schema_version)]
+        if query == SET_VERSION_QUERY:
+            self.schema_version = params['version']
+            return []
+        if query in SCHEMA_STATEMENTS:
+            return []
+        if query == COMPONENTS_QUERY:
+            return [FakeRecord(name='fake', versions=['5.0.0'], edition='in-process')]
+        raise NotImplementedError(f"FakeGraph does not answer: {query[:80]}")
+
+
+class FakeResult:
+    def __init__(self, records: List[FakeRecord]):
+        self.records = records
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def single(self):
+        return self.records[0] if self.records else None
+
+    def data(self):
+        return [record.data() for record in self.records]
+
+    def consume(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, graph: FakeGraph):
+        self.graph = graph
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def run(self, query, **params):
+        return FakeResult(self.graph.run(query, params))
+
+    def execute_write(self, fn, *args):
+        return fn(self, *args)
+
+    execute_read = execute_write
+
+
+class FakeDriver:
+    def __init__(self, graph: FakeGraph):
+        self.graph = graph
+
+    def session(self, **kwargs):
+        return FakeSession(self.graph)
+
+    def verify_connectivity(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeAsyncResult(FakeResult):
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for record in self.records:
+            yield record
+
+    async def single(self):
+        return FakeResult.single(self)
+
+    async def data(self):
+        return FakeResult.data(self)
+
+    async def consume(self):
+        pass
+
+
+class FakeAsyncSession:
+    def __init__(self, graph: FakeGraph):
+        self.graph = graph
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def run(self, query, **params):
+        return FakeAsyncResult(self.graph.run(query, params))
+
+
+class FakeAsyncDriver:
+    def __init__(self, graph: FakeGraph):
+        self.graph = graph
+
+    def session(self, **kwargs):
+        return FakeAsyncSession(self.graph)
+
+    async def verify_connectivity(self):
+        pass
+
+    async def close(self):
+        pass
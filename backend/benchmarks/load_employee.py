@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Concurrent load test for the /employee endpoint.
+
+Usage:
+  python benchmarks/load_employee.py --url http://localhost:8000 --name "Robert Johnson"
+  python benchmarks/load_employee.py --requests 2000 --concurrency 64
+
+Fires --requests GET /employee calls with --concurrency in flight at a time
+against a running backend and prints throughput and latency percentiles.
+Run it once against a build of the previous commit and once against the
+current one to compare; include a /health probe with --health to check that
+health checks stay responsive while the employee queries are running.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import httpx
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(url, name, total, concurrency, health):
+    latencies = []
+    health_latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            while True:
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                try:
+                    response = await client.get('/employee', params={'name': name})
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+                except httpx.HTTPError:
+                    errors += 1
+
+        async def prober():
+            while not queue.empty():
+                started = time.perf_counter()
+                await client.get('/health')
+                health_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.1)
+
+        started = time.perf_counter()
+        tasks = [worker() for _ in range(concurrency)]
+        if health:
+            tasks.append(prober())
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    report = {
+        'requests': total,
+        'concurrency': concurrency,
+        'errors': errors,
+        'elapsed_seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'latency_ms': {
+            'mean': round(statistics.mean(latencies) * 1000, 2) if latencies else 0.0,
+            'p50': round(percentile(latencies, 50) * 1000, 2),
+            'p95': round(percentile(latencies, 95) * 1000, 2),
+            'p99': round(percentile(latencies, 99) * 1000, 2),
+        },
+    }
+    if health:
+        report['health_p99_ms'] = round(percentile(health_latencies, 99) * 1000, 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--name', default='Robert Johnson', help='Employee full name to query')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--health', action='store_true', help='Probe /health while the load runs')
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.url, args.name, args.requests, args.concurrency, args.health))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
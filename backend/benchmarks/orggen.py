@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Synthetic org chart generator in the structured_employees.csv schema.
+
+Usage:
+  python benchmarks/orggen.py --size 10000 --fanout 6 --depth 8 --out org.csv
+  python benchmarks/orggen.py --size 50000 --duplicate-names 0.02 --manager-email --out org.csv
+
+Builds a single-rooted tree level by level: every manager gets between 1
+and 2 * fanout - 1 reports (fanout on average) until --size employees
+exist; when --depth levels are not enough, the remaining employees are
+spread over the managers of the last level. --duplicate-names reuses an
+existing full name for that fraction of employees, which makes their
+manager_name ambiguous exactly like real same-name colleagues.
+--manager-email adds the manager_email column so edges stay unambiguous.
+"""
+import argparse
+import csv
+import random
+from typing import Dict, List
+
+FIRST_NAMES = [
+    'James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda', 'David', 'Elizabeth',
+    'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah', 'Charles', 'Karen',
+    'Wei', 'Priya', 'Ahmed', 'Sofia', 'Lukas', 'Yuki', 'Olga', 'Mateo', 'Amara', 'Noah',
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+    'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin',
+    'Chen', 'Patel', 'Khan', 'Rossi', 'Muller', 'Tanaka', 'Ivanova', 'Silva', 'Okafor', 'Cohen',
+]
+FIELDS = ['first_name', 'last_name', 'email', 'phone', 'address', 'manager_name']
+
+
+def generate_org(size: int, fanout: int = 6, depth: int = 8, duplicate_names: float = 0.0,
+                 manager_email: bool = False, seed: int = 42) -> List[Dict[str, str]]:
+    """Return ``size`` CSV rows, managers before their reports."""
+    rng = random.Random(seed)
+    used = set()
+    rows: List[Dict[str, str]] = []
+
+    def add(manager: Dict[str, str]):
+        i = len(rows)
+        if rows and rng.random() < duplicate_names:
+            twin = rows[rng.randrange(len(rows))]
+            first, last = twin['first_name'], twin['last_name']
+        else:
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            base, n = last, 2
+            while f'{first} {last}' in used:
+                last = f'{base}{n}'
+                n += 1
+        used.add(f'{first} {last}')
+        row = {
+            'first_name': first,
+            'last_name': last,
+            'email': f'{first}.{last}.{i}@example.com'.lower(),
+            'phone': f'555-{i:07d}',
+            'address': f'{1000 + i} Corporate Way',
+            'manager_name': f"{manager['first_name']} {manager['last_name']}" if manager else '',
+        }
+        if manager_email:
+            row['manager_email'] = manager['email'] if manager else ''
+        rows.append(row)
+        return row
+
+    level = [add(None)]
+    for _ in range(1, depth):
+        if len(rows) >= size:
+            break
+        next_level = []
+        for manager in level:
+            for _ in range(rng.randint(1, 2 * fanout - 1)):
+                if len(rows) >= size:
+                    break
+                next_level.append(add(manager))
+        level = next_level
+    # Depth exhausted: widen the last managers' teams instead of adding levels
+    last_level = {id(row) for row in level}
+    managers = [row for row in rows if id(row) not in last_level] or level
+    while len(rows) < size:
+        add(managers[len(rows) % len(managers)])
+    return rows
+
+
+def write_csv(rows: List[Dict[str, str]], path: str):
+    fields = FIELDS + (['manager_email'] if rows and 'manager_email' in rows[0] else [])
+    with open(path, 'w', newline='') as fh:
+        writer = csv.DictWriter(fh, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def subtree_sizes(rows: List[Dict[str, str]]) -> Dict[str, int]:
+    """Number of employees under (and including) each email, following manager_email."""
+    sizes = {row['email']: 1 for row in rows}
+    # Rows are ordered managers first, so one reverse pass accumulates bottom-up
+    for row in reversed(rows):
+        manager = row.get('manager_email')
+        if manager:
+            sizes[manager] += sizes[row['email']]
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=10000, help='Number of employees (default: 10000)')
+    parser.add_argument('--fanout', type=int, default=6, help='Average direct reports per manager (default: 6)')
+    parser.add_argument('--depth', type=int, default=8, help='Maximum levels (default: 8)')
+    parser.add_argument('--duplicate-names', type=float, default=0.0, help='Fraction of reused full names')
+    parser.add_argument('--manager-email', action='store_true', help='Add a manager_email column')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default='org.csv')
+    args = parser.parse_args()
+
+    rows = generate_org(args.size, args.fanout, args.depth, args.duplicate_names, args.manager_email, args.seed)
+    write_csv(rows, args.out)
+    print(f"Wrote {len(rows)} employees to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
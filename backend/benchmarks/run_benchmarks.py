@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Benchmark /upload throughput, /employee latency and memory on a synthetic org.
+
+Usage:
+  python benchmarks/run_benchmarks.py --backend fake --size 20000 --out results.json
+  docker compose -f benchmarks/docker-compose.yml up -d
+  python benchmarks/run_benchmarks.py --backend neo4j --size 20000 --reset --out results.json
+
+The app runs in-process (FastAPI TestClient, so startup and shutdown hooks
+run). With --backend fake both Neo4j drivers are replaced by the in-memory
+FakeGraph from fake_neo4j.py; with --backend neo4j the app connects to
+NEO4J_URI (default bolt://localhost:7687, the compose file above) using
+ENVIRONMENT=local credentials. --reset deletes every Employee first, so
+point it only at a throwaway database.
+
+Steps: generate the org (see orggen.py), upload it and wait for the import
+job, then request /employee for roots whose subtrees are closest to each
+--subtree-sizes target, --iterations times cold (subtree cache cleared
+before every request) and warm. Process peak RSS comes from getrusage;
+--trace-memory adds Python heap peaks per phase from tracemalloc, which
+slows allocation-heavy code, so keep it off when comparing latencies.
+Results are written as JSON, one file per run, for comparing commits.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'benchmarks'))
+
+from orggen import generate_org, subtree_sizes, write_csv  # noqa: E402
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies):
+    millis = [latency * 1000 for latency in latencies]
+    return {
+        'count': len(millis),
+        'mean_ms': round(statistics.fmean(millis), 3) if millis else 0.0,
+        'p50_ms': round(percentile(millis, 50), 3),
+        'p90_ms': round(percentile(millis, 90), 3),
+        'p99_ms': round(percentile(millis, 99), 3),
+        'max_ms': round(max(millis), 3) if millis else 0.0,
+    }
+
+
+def pick_roots(rows, targets):
+    """Employee with a unique name whose subtree size is closest to each target."""
+    sizes = subtree_sizes(rows)
+    names = {}
+    for row in rows:
+        full = f"{row['first_name']} {row['last_name']}"
+        names[full] = None if full in names else row['email']
+    candidates = [(sizes[email], name) for name, email in names.items() if email]
+    roots = []
+    for target in targets:
+        size, name = min(candidates, key=lambda candidate: (abs(candidate[0] - target), candidate[1]))
+        roots.append({'target': target, 'name': name, 'subtree_size': size})
+    return roots
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def reset_database():
+    from neo4j import GraphDatabase
+    driver = GraphDatabase.driver(os.environ['NEO4J_URI'],
+                                  auth=(os.environ['NEO4J_USER'], os.environ['NEO4J_PASSWORD']))
+    with driver.session() as session:
+        session.run("MATCH (e:Employee) CALL { WITH e DETACH DELETE e } IN TRANSACTIONS OF 10000 ROWS").consume()
+    driver.close()
+
+
+def run(args):
+    from fastapi.testclient import TestClient
+    from app import main
+
+    main.org_snapshot.enabled = args.snapshot
+    rows = generate_org(args.size, args.fanout, args.depth, args.duplicate_names, manager_email=True, seed=args.seed)
+    roots = pick_roots(rows, [target for target in args.subtree_sizes if target <= args.size])
+    results = {'upload': None, 'employee': [], 'memory': {}}
+
+    with tempfile.TemporaryDirectory() as tmp, TestClient(main.app) as client:
+        path = os.path.join(tmp, 'org.csv')
+        write_csv(rows, path)
+        headers = {'X-API-Key': os.environ['ADMIN_API_KEY']}
+
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        with open(path, 'rb') as fh:
+            response = client.post('/upload', params={'batch_size': args.batch_size},
+                                   files={'file': ('org.csv', fh, 'text/csv')}, headers=headers)
+        response.raise_for_status()
+        job_id = response.json()['job_id']
+        main.import_jobs.wait(job_id, timeout=args.timeout)
+        job = client.get(f'/imports/{job_id}', headers=headers).json()
+        wall = time.perf_counter() - started
+        if job['status'] != 'succeeded':
+            raise SystemExit(f"Import job {job['status']}: {job['errors']}")
+        results['upload'] = {
+            'rows': job['rows_processed'],
+            'batches': job['batches'],
+            'batch_size': args.batch_size,
+            'import_seconds': job['elapsed_seconds'],
+            'rows_per_second': job['rows_per_second'],
+            'wall_seconds': round(wall, 3),
+        }
+        if tracemalloc.is_tracing():
+            results['memory']['upload_heap_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+            tracemalloc.reset_peak()
+        for root in roots:
+            params = {'name': root['name'], 'max_nodes': max(args.size, 1)}
+            entry = dict(root)
+            for mode in ('cold', 'warm'):
+                latencies = []
+                for _ in range(args.iterations):
+                    if mode == 'cold':
+                        main.subtree_cache.clear()
+                    started = time.perf_counter()
+                    response = client.get('/employee', params=params)
+                    latencies.append(time.perf_counter() - started)
+                    response.raise_for_status()
+                entry[mode] = summarize(latencies)
+            body = response.json()
+            entry['nodes'] = len(body['nodes'])
+            entry['links'] = len(body['links'])
+            entry['response_bytes'] = len(response.content)
+            results['employee'].append(entry)
+            print(f"  subtree {entry['nodes']:>7} nodes: cold p50 {entry['cold']['p50_ms']:.1f} ms, "
+                  f"p99 {entry['cold']['p99_ms']:.1f} ms; warm p50 {entry['warm']['p50_ms']:.2f} ms")
+        if tracemalloc.is_tracing():
+            results['memory']['employee_heap_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    results['memory']['max_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20, 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=['fake', 'neo4j'], default='fake')
+    parser.add_argument('--size', type=int, default=20000, help='Employees in the generated org')
+    parser.add_argument('--fanout', type=int, default=6)
+    parser.add_argument('--depth', type=int, default=8)
+    parser.add_argument('--duplicate-names', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--subtree-sizes', type=int, nargs='+', default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument('--iterations', type=int, default=50, help='Requests per subtree and mode')
+    parser.add_argument('--snapshot', action='store_true', help='Serve /employee from the in-memory snapshot')
+    parser.add_argument('--trace-memory', action='store_true', help='Record Python heap peaks with tracemalloc')
+    parser.add_argument('--reset', action='store_true', help='Delete all Employee nodes first (neo4j backend)')
+    parser.add_argument('--timeout', type=float, default=3600, help='Seconds to wait for the import job')
+    parser.add_argument('--out', default='benchmark-results.json')
+    args = parser.parse_args()
+
+    os.environ['ENVIRONMENT'] = 'local'
+    os.environ.setdefault('ADMIN_API_KEY', 'local-api-key')
+    os.environ.setdefault('NEO4J_URI', 'bolt://localhost:7687')
+    os.environ.setdefault('NEO4J_USER', 'neo4j')
+    os.environ.setdefault('NEO4J_PASSWORD', 'password')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    os.environ.setdefault('LOG_FILE', '')
+
+    if args.trace_memory:
+        tracemalloc.start()
+    print(f"Benchmarking {args.size} employees against the {args.backend} backend")
+    if args.backend == 'fake':
+        from fake_neo4j import FakeAsyncDriver, FakeDriver, FakeGraph
+        graph = FakeGraph()
+        with patch('neo4j.GraphDatabase.driver', return_value=FakeDriver(graph)), \
+                patch('neo4j.AsyncGraphDatabase.driver', return_value=FakeAsyncDriver(graph)):
+            results = run(args)
+    else:
+        if args.reset:
+            reset_database()
+        results = run(args)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'backend': args.backend,
+            'params': {key: value for key, value in vars(args).items() if key != 'out'},
+        },
+        **results,
+    }
+    with open(args.out, 'w') as fh:
+        json.dump(report, fh, indent=2)
+    upload = results['upload']
+    print(f"Imported {upload['rows']} rows at {upload['rows_per_second']:.0f} rows/s; "
+          f"peak RSS {results['memory']['max_rss_mb']} MB; results in {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Generate neo4j-admin import files from an employee CSV for offline bulk loads.
+
+Usage:
+  python bulk_import_files.py ../structured_employees.csv --out import/
+  neo4j-admin database import full --nodes=Employee=import/employees_header.csv,import/employees.csv \\
+      --relationships=MANAGES=import/manages_header.csv,import/manages.csv neo4j
+
+Accepts the same columns and aliases as POST /upload (`First Name`/`first_name`,
+`Manager Name`/`manager_name`, `manager_email`, ...). Managers given by name
+are resolved to emails in memory, so every relationship is keyed by email.
+The input is read twice in a streaming pass; only names and emails are kept
+in memory, never whole rows.
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from app.importer import NameIndex, fingerprint, parse_row, resolve_manager_email
+
+NODE_HEADER = ['email:ID(Employee)', 'firstName', 'lastName', 'fullName', 'phone', 'address',
+               'rowHash', 'managerKey', ':LABEL']
+REL_HEADER = [':START_ID(Employee)', ':END_ID(Employee)', ':TYPE']
+
+
+def read_rows(path, encoding):
+    with open(path, newline='', encoding=encoding) as fh:
+        yield from csv.DictReader(fh)
+
+
+def build_index(path, encoding):
+    """First pass: every employee email and a name -> email index."""
+    emails = set()
+    names = NameIndex()
+    for row in read_rows(path, encoding):
+        params = parse_row(row)
+        emails.add(params['email'])
+        names.add(params['full'], params['email'])
+    return emails, names
+
+
+def write_import_files(path, out_dir, encoding='utf-8'):
+    """Second pass: stream node and relationship files. Returns a summary dict."""
+    started = time.perf_counter()
+    emails, names = build_index(path, encoding)
+    os.makedirs(out_dir, exist_ok=True)
+    summary = {'nodes': 0, 'stub_managers': 0, 'relationships': 0, 'duplicate_rows': 0,
+               'unresolved_managers': 0, 'ambiguous_managers': 0}
+
+    for name, header in (('employees_header.csv', NODE_HEADER), ('manages_header.csv', REL_HEADER)):
+        with open(os.path.join(out_dir, name), 'w', newline='', encoding='utf-8') as fh:
+            csv.writer(fh).writerow(header)
+
+    written = set()
+    with open(os.path.join(out_dir, 'employees.csv'), 'w', newline='', encoding='utf-8') as nodes_fh, \
+            open(os.path.join(out_dir, 'manages.csv'), 'w', newline='', encoding='utf-8') as rels_fh:
+        nodes = csv.writer(nodes_fh)
+        rels = csv.writer(rels_fh)
+        for row in read_rows(path, encoding):
+            params = fingerprint(parse_row(row), names)
+            if params['email'] in written:
+                # neo4j-admin rejects duplicate IDs; like MERGE, the first row wins
+                summary['duplicate_rows'] += 1
+                continue
+            written.add(params['email'])
+            nodes.writerow([params['email'], params['first'], params['last'], params['full'], params['phone'],
+                            params['address'], params['rowHash'], params['managerKey'], 'Employee'])
+            summary['nodes'] += 1
+
+            manager_email = resolve_manager_email(params, names)
+            if not manager_email and params['manager']:
+                key = 'ambiguous_managers' if params['manager'] in names.ambiguous else 'unresolved_managers'
+                summary[key] += 1
+                print(f"Skipping manager '{params['manager']}' of {params['email']}: {key.split('_')[0]}",
+                      file=sys.stderr)
+                continue
+            if manager_email:
+                if manager_email not in emails and manager_email not in written:
+                    # Same as MERGE on manager_email: the manager exists only as a bare node
+                    nodes.writerow([manager_email, '', '', '', '', '', '', '', 'Employee'])
+                    written.add(manager_email)
+                    summary['stub_managers'] += 1
+                rels.writerow([manager_email, params['email'], 'MANAGES'])
+                summary['relationships'] += 1
+
+    summary['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('csv', help='Employee CSV in the /upload format')
+    parser.add_argument('--out', default='import', help='Output directory (default: import)')
+    parser.add_argument('--encoding', default='utf-8')
+    args = parser.parse_args()
+
+    try:
+        summary = write_import_files(args.csv, args.out, args.encoding)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    print(f"\nLoad with:\n  neo4j-admin database import full "
+          f"--nodes=Employee={args.out}/employees_header.csv,{args.out}/employees.csv "
+          f"--relationships=MANAGES={args.out}/manages_header.csv,{args.out}/manages.csv <database>")
+
+
+if __name__ == "__main__":
+    main()
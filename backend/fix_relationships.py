@@ -1,99 +1,212 @@
 #!/usr/bin/env python3
 """
-Script to fix existing relationships in the database by converting 
-name-based relationships to email-based relationships.
+Repair duplicate Employee nodes left behind by name-based imports.
+
+Older imports merged managers on `fullName`, which created phantom manager
+nodes (no email, or the full name stored as email) next to the real employee.
+This job merges every such phantom into the employee carrying a real email:
+its MANAGES edges are re-pointed to the real node and the phantom is deleted.
+Names shared by several employees with different real emails are distinct
+people and are only reported.
+
+Usage:
+  python fix_relationships.py --dry-run
+  python fix_relationships.py --batch-size 1000
+  python fix_relationships.py --restart
+
+Work is done page by page in name order; writes run in
+`CALL { ... } IN TRANSACTIONS OF N ROWS` batches and the last finished name is
+checkpointed, so an interrupted run resumes where it stopped. Interval labels
+are marked inexact before the first merge and recomputed at the end, so
+/employee traverses edges instead of trusting labels the merges invalidated.
 """
 
+import argparse
+import json
 import os
 import sys
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
+from app.aggregates import invalidate_intervals, refresh_aggregates
 
 # Load environment variables
 load_dotenv()
 
+DEFAULT_CHECKPOINT = '.fix_relationships.checkpoint.json'
+
+FIND_DUPLICATES = """
+    MATCH (e:Employee)
+    WHERE e.fullName IS NOT NULL AND e.fullName > $after
+    WITH e.fullName AS name, collect({id: id(e), email: e.email}) AS members
+    WHERE size(members) > 1
+    RETURN name, members
+    ORDER BY name
+    LIMIT $page_size
+"""
+
+COUNT_EDGES = """
+    MATCH (p:Employee)-[r:MANAGES]-()
+    WHERE id(p) IN $ids
+    RETURN count(r) AS edges
+"""
+
+# Re-point every MANAGES edge of the duplicate to the canonical node, then delete it
+MERGE_DUPLICATES = """
+    UNWIND $pairs AS pair
+    CALL {
+        WITH pair
+        MATCH (c:Employee) WHERE id(c) = pair.canonical
+        MATCH (p:Employee) WHERE id(p) = pair.duplicate
+        CALL {
+            WITH c, p
+            MATCH (p)-[r:MANAGES]->(report:Employee)
+            WHERE report <> c
+            MERGE (c)-[:MANAGES]->(report)
+            DELETE r
+        }
+        CALL {
+            WITH c, p
+            MATCH (boss:Employee)-[r:MANAGES]->(p)
+            WHERE boss <> c
+            MERGE (boss)-[:MANAGES]->(c)
+            DELETE r
+        }
+        DETACH DELETE p
+    } IN TRANSACTIONS OF $batch_size ROWS
+"""
+
+
 def get_driver():
     """Create and return a Neo4j driver instance."""
     uri = os.getenv('NEO4J_URI', 'bolt://localhost:7687')
     user = os.getenv('NEO4J_USER', 'neo4j')
     password = os.getenv('NEO4J_PASSWORD', 'password')
-    
+
     print(f"Connecting to Neo4j at {uri}")
     return GraphDatabase.driver(uri, auth=(user, password))
 
-def fix_relationships(driver):
-    """Fix relationships by converting name-based to email-based."""
+
+def is_real_email(name, email):
+    """Imports without an email key the node by full name; those are not real emails."""
+    return bool(email) and email != name and '@' in email
+
+
+def plan_merge(name, members):
+    """Return (canonical_id, duplicate_ids) for a same-name group, or None if it must not be merged."""
+    real = [m for m in members if is_real_email(name, m['email'])]
+    if len(real) > 1:
+        # Different people who share a name
+        return None
+    if real:
+        canonical = real[0]['id']
+    else:
+        # Prefer the node keyed by name (created from a CSV row) over a bare manager stub
+        keyed = [m for m in members if m['email'] == name]
+        canonical = min(m['id'] for m in (keyed or members))
+    return canonical, sorted(m['id'] for m in members if m['id'] != canonical)
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return {'after': '', 'merged': 0, 'conflicts': 0}
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def save_checkpoint(path, state):
+    # Write-then-rename so an interruption never leaves a torn checkpoint
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as fh:
+        json.dump(state, fh)
+    os.replace(tmp, path)
+
+
+def fix_relationships(driver, batch_size=1000, page_size=500, dry_run=False,
+                      checkpoint_path=DEFAULT_CHECKPOINT, restart=False):
+    """Merge duplicate employees page by page. Returns the counters of this run."""
+    state = {'after': '', 'merged': 0, 'conflicts': 0} if restart or dry_run else load_checkpoint(checkpoint_path)
+    if state['after']:
+        print(f"Resuming after '{state['after']}' ({state['merged']} duplicates merged so far)")
+    summary = {'groups': 0, 'duplicates': 0, 'edges': 0, 'conflicts': 0}
+    # A resumed run starts with the labels an interrupted one already cleared
+    relabel = bool(state['merged'])
+
     with driver.session() as session:
-        # First, let's see how many MANAGES relationships currently exist
-        result = session.run("MATCH ()-[r:MANAGES]->() RETURN count(r) AS count")
-        initial_count = result.single()["count"]
-        print(f"Initial MANAGES relationships: {initial_count}")
-        
-        # Find all employees who are managers (have outgoing MANAGES relationships)
-        # and update their relationships to be email-based
-        result = session.run("""
-            MATCH (manager:Employee)-[r:MANAGES]->(report:Employee)
-            WHERE manager.email IS NOT NULL
-            MATCH (manager)
-            SET manager.manager_email = manager.email
-            RETURN count(manager) AS updated_managers
-        """)
-        managers_updated = result.single()["updated_managers"]
-        print(f"Updated {managers_updated} managers with manager_email property")
-        
-        # Create a mapping of full names to emails for employees
-        result = session.run("""
-            MATCH (e:Employee)
-            WHERE e.email IS NOT NULL AND e.fullName IS NOT NULL
-            RETURN e.fullName AS fullName, e.email AS email
-        """)
-        
-        name_to_email = {record["fullName"]: record["email"] for record in result}
-        print(f"Created mapping for {len(name_to_email)} employees")
-        
-        # Try to fix relationships that are based on names but should be based on emails
-        # This is a more complex operation that would require manual verification
-        print("\nTo completely fix the relationships, you would need to:")
-        print("1. Identify which employees should report to which managers based on business logic")
-        print("2. Delete existing incorrect relationships")
-        print("3. Create new relationships based on email addresses")
-        
-        # Show duplicate employees with same name but different emails
-        print("\nDuplicate employees with same name:")
-        result = session.run("""
-            MATCH (e:Employee)
-            WHERE e.fullName IS NOT NULL
-            WITH e.fullName AS name, collect(e) AS employees
-            WHERE size(employees) > 1
-            RETURN name, [emp IN employees | emp.email] AS emails
-        """)
-        
-        duplicates = list(result)
-        if duplicates:
-            for record in duplicates:
-                print(f"  {record['name']}: {record['emails']}")
-        else:
-            print("  No duplicate employees found")
+        while True:
+            page = list(session.run(FIND_DUPLICATES, after=state['after'], page_size=page_size))
+            if not page:
+                break
+
+            pairs = []
+            conflicts = 0
+            for record in page:
+                plan = plan_merge(record['name'], record['members'])
+                if plan is None:
+                    conflicts += 1
+                    emails = [m['email'] for m in record['members']]
+                    print(f"  Skipping '{record['name']}': several employees with real emails {emails}")
+                    continue
+                canonical, duplicates = plan
+                summary['groups'] += 1
+                pairs.extend({'canonical': canonical, 'duplicate': d} for d in duplicates)
+
+            summary['duplicates'] += len(pairs)
+            summary['conflicts'] += conflicts
+            if pairs:
+                ids = [pair['duplicate'] for pair in pairs]
+                summary['edges'] += session.run(COUNT_EDGES, ids=ids).single()['edges']
+                if not dry_run:
+                    if not relabel:
+                        invalidate_intervals(driver)
+                        relabel = True
+                    # IN TRANSACTIONS needs an auto-commit transaction, hence session.run
+                    session.run(MERGE_DUPLICATES, pairs=pairs, batch_size=batch_size).consume()
+
+            state['after'] = page[-1]['name']
+            if not dry_run:
+                state['merged'] += len(pairs)
+                state['conflicts'] += conflicts
+                save_checkpoint(checkpoint_path, state)
+            print(f"  Processed names up to '{state['after']}': {summary['duplicates']} duplicates so far")
+
+    if relabel:
+        summary['relabelled'] = refresh_aggregates(driver, batch_size)
+    if not dry_run and os.path.exists(checkpoint_path):
+        # A complete run starts from scratch next time
+        os.remove(checkpoint_path)
+    return summary
+
 
 def main():
     """Main function to run the relationship fix."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per write transaction (default: 1000)')
+    parser.add_argument('--page-size', type=int, default=500, help='Duplicate names per checkpointed page (default: 500)')
+    parser.add_argument('--dry-run', action='store_true', help='Only report what would be merged')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help='Checkpoint file for resuming')
+    parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint')
+    args = parser.parse_args()
+
     try:
         driver = get_driver()
-        
-        # Test connectivity
-        with driver.session() as session:
-            session.run("RETURN 1")
+        driver.verify_connectivity()
         print("Successfully connected to Neo4j!")
-        
-        # Fix relationships
-        fix_relationships(driver)
-        
+
+        summary = fix_relationships(driver, args.batch_size, args.page_size, args.dry_run,
+                                    args.checkpoint, args.restart)
+
         driver.close()
+        prefix = "Would merge" if args.dry_run else "Merged"
+        print(f"\n{prefix} {summary['duplicates']} duplicate nodes in {summary['groups']} name groups, "
+              f"re-pointing {summary['edges']} MANAGES relationships")
+        print(f"Skipped {summary['conflicts']} names shared by different employees")
+        if 'relabelled' in summary:
+            print(f"Recomputed org aggregates of {summary['relabelled']} employees")
         print("\nRelationship fix process completed!")
-        
+
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,13 +1,18 @@
 import pytest
 from fastapi.testclient import TestClient
-from app.main import app
+from app.main import app, admin_api_key_cache, component_info, neo4j_credentials_cache, readiness, subtree_cache
 import json
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 
 @pytest.fixture
-def test_client(mock_neo4j_driver, mock_neo4j_credentials):
+def test_client(mock_neo4j_driver, mock_neo4j_async_driver, mock_neo4j_credentials):
     # Ensure Neo4j driver and SSM credentials are mocked before the app starts up
     # Use TestClient as a context manager so startup/shutdown run for each test
+    subtree_cache.clear()
+    admin_api_key_cache.invalidate()
+    neo4j_credentials_cache.invalidate()
+    readiness.invalidate()
+    component_info.invalidate()
     with TestClient(app) as client:
         yield client
 
@@ -41,3 +46,16 @@ def mock_neo4j_driver():
         mock_ctx.__enter__.return_value = mock_session
         mock_driver.return_value.session.return_value = mock_ctx
         yield mock_driver, mock_session
+
+@pytest.fixture
+def mock_neo4j_async_driver():
+    with patch('neo4j.AsyncGraphDatabase.driver') as mock_driver:
+        mock_session = MagicMock()
+        # session.run() and result.single() are awaited by the request handlers
+        mock_session.run = AsyncMock()
+        mock_ctx = MagicMock()
+        mock_ctx.__aenter__.return_value = mock_session
+        mock_driver.return_value.session.return_value = mock_ctx
+        mock_driver.return_value.close = AsyncMock()
+        mock_driver.return_value.verify_connectivity = AsyncMock()
+        yield mock_driver, mock_session
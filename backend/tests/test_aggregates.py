@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock
+from app.aggregates import SET_AGGREGATES, compute_aggregates, refresh_aggregates
+
+def test_compute_aggregates():
+    # 1 -> 2 -> 4, 1 -> 3, 3 -> 4 (second manager), 5 <-> 6 (cycle, no root)
+    aggregates = compute_aggregates([1, 2, 3, 4, 5, 6], [(1, 2), (2, 4), (1, 3), (3, 4), (5, 6), (6, 5)])
+    # Every employee of a fresh subtree reserves one spare number at the end of its interval
+    assert aggregates[1] == {'directReports': 2, 'totalReports': 3, 'depth': 0, 'maxDepthBelow': 2,
+                             'dfsIn': 0, 'dfsOut': 11, 'dfsExact': True}
+    assert aggregates[2] == {'directReports': 1, 'totalReports': 1, 'depth': 1, 'maxDepthBelow': 1,
+                             'dfsIn': 1, 'dfsOut': 5, 'dfsExact': True}
+    assert aggregates[3]['totalReports'] == 0
+    assert aggregates[4]['depth'] == 2
+    assert aggregates[5] == {'directReports': 1, 'totalReports': None, 'depth': None, 'maxDepthBelow': None,
+                             'dfsIn': None, 'dfsOut': None, 'dfsExact': False}
+
+def test_intervals_nest_and_flag_escaping_edges():
+    # 1 -> 2 -> 3 -> 4, 1 -> 5, and 5 -> 3 makes 5's reach leave its interval
+    aggregates = compute_aggregates([1, 2, 3, 4, 5], [(1, 2), (2, 3), (3, 4), (1, 5), (5, 3)])
+    intervals = {i: (a['dfsIn'], a['dfsOut']) for i, a in aggregates.items()}
+    assert intervals == {1: (0, 16), 2: (1, 9), 3: (2, 6), 4: (3, 4), 5: (10, 11)}
+    assert [i for i, a in aggregates.items() if not a['dfsExact']] == [5]
+
+def test_labels_do_not_depend_on_query_order():
+    edges = [(1, 2), (2, 4), (1, 3), (3, 4), (1, 5)]
+    assert compute_aggregates([5, 3, 1, 4, 2], edges[::-1]) == compute_aggregates([1, 2, 3, 4, 5], edges)
+
+def test_new_and_moved_reports_reuse_stored_labels():
+    # 1 -> 2 -> 4, 1 -> 3
+    edges = [(1, 2), (2, 4), (1, 3)]
+    before = compute_aggregates([1, 2, 3, 4], edges)
+    previous = {i: (a['dfsIn'], a['dfsOut']) for i, a in before.items()}
+    assert compute_aggregates([1, 2, 3, 4], edges, previous) == before
+
+    # A new report of 1 lands in 1's spare numbers; nobody else is relabelled
+    after = compute_aggregates([1, 2, 3, 4, 5], edges + [(1, 5)], previous)
+    intervals = {i: (a['dfsIn'], a['dfsOut']) for i, a in after.items()}
+    assert {i: intervals[i] for i in previous} == previous
+    assert previous[1][0] < intervals[5][0] < intervals[5][1] <= previous[1][1]
+    assert all(a['dfsExact'] for a in after.values())
+
+    # Moving 4 under 3: 3 had no room for a report, so it moves into 1's spare numbers with 4
+    moved = compute_aggregates([1, 2, 3, 4], [(1, 2), (1, 3), (3, 4)], previous)
+    assert [i for i in previous if (moved[i]['dfsIn'], moved[i]['dfsOut']) != previous[i]] == [3, 4]
+    assert moved[3]['dfsIn'] < moved[4]['dfsIn'] <= moved[3]['dfsOut']
+
+def test_refresh_writes_only_changed_employees():
+    session = MagicMock()
+    session.run.side_effect = [
+        [
+            {'id': 1, 'directReports': 1, 'totalReports': 1, 'depth': 0, 'maxDepthBelow': 1,
+             'dfsIn': 0, 'dfsOut': 3, 'dfsExact': True},
+            {'id': 2, 'directReports': None, 'totalReports': None, 'depth': None, 'maxDepthBelow': None,
+             'dfsIn': None, 'dfsOut': None, 'dfsExact': None},
+        ],
+        [{'source': 1, 'target': 2}],
+    ]
+    driver = MagicMock()
+    driver.session.return_value.__enter__.return_value = session
+
+    assert refresh_aggregates(driver) == 1
+    _, query, rows = session.execute_write.call_args.args
+    assert query == SET_AGGREGATES
+    assert rows == [{'id': 2, 'directReports': 0, 'totalReports': 0, 'depth': 1, 'maxDepthBelow': 0,
+                     'dfsIn': 1, 'dfsOut': 2, 'dfsExact': True}]
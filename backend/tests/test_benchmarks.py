@@ -0,0 +1,46 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from fake_neo4j import FakeDriver, FakeGraph  # noqa: E402
+from orggen import generate_org, subtree_sizes  # noqa: E402
+from app.aggregates import invalidate_intervals, refresh_aggregates  # noqa: E402
+from app.importer import import_employees  # noqa: E402
+from app.queries import SUBTREE_RANGE_QUERY, build_subtree_query  # noqa: E402
+
+def test_generated_org_shape():
+    rows = generate_org(500, fanout=4, depth=3, duplicate_names=0.1, manager_email=True)
+    emails = {row['email'] for row in rows}
+    assert len(rows) == len(emails) == 500
+    assert [row['manager_email'] for row in rows].count('') == 1
+    assert all(row['manager_email'] in emails for row in rows[1:])
+    assert subtree_sizes(rows)[rows[0]['email']] == 500
+    names = [f"{row['first_name']} {row['last_name']}" for row in rows]
+    assert len(set(names)) < len(names)
+
+def test_fake_graph_answers_import_and_subtree_queries():
+    rows = generate_org(300, fanout=3, depth=5, manager_email=True)
+    graph = FakeGraph()
+    result = import_employees(FakeDriver(graph), rows, batch_size=50)
+
+    assert result.imported == 300
+    assert len(graph.nodes) == 300
+    root = f"{rows[0]['first_name']} {rows[0]['last_name']}"
+    record = graph.run(build_subtree_query(), {'name': root, 'limit': 1000})[0]
+    assert len(record['nodes']) == 300
+    assert len(record['rels']) == 299
+    assert not record['truncated']
+
+    assert refresh_aggregates(FakeDriver(graph)) == 300
+    assert record['nodes'][0]['totalReports'] == 299
+    assert refresh_aggregates(FakeDriver(graph)) == 0
+    # The interval scan returns the same subtree as the traversal
+    ranged = graph.run(SUBTREE_RANGE_QUERY, {'name': root, 'limit': 1000})[0]
+    assert ranged['exact']
+    assert {n.id for n in ranged['nodes']} == {n.id for n in record['nodes']}
+
+    # Cleared labels send reads back to the traversal until the next refresh
+    assert invalidate_intervals(FakeDriver(graph)) == 300
+    assert not graph.run(SUBTREE_RANGE_QUERY, {'name': root, 'limit': 1000})[0]['exact']
+    assert refresh_aggregates(FakeDriver(graph)) == 300
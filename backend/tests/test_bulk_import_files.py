@@ -0,0 +1,33 @@
+import csv
+from bulk_import_files import write_import_files
+
+def read(path):
+    with open(path, newline='') as fh:
+        return list(csv.reader(fh))
+
+def test_write_import_files(tmp_path):
+    source = tmp_path / "employees.csv"
+    source.write_text(
+        "First Name,Last Name,Email,Manager Name,manager_email\n"
+        "Robert,Johnson,robert@x.com,,\n"
+        "Jennifer,Smith,jennifer@x.com,Robert Johnson,\n"
+        "Lisa,Gray,lisa@x.com,,outside@x.com\n"
+        "Sam,Lee,sam@x.com,Nobody Known,\n"
+        "Robert,Johnson,robert@x.com,,\n"
+    )
+    out = tmp_path / "import"
+
+    summary = write_import_files(str(source), str(out))
+
+    assert summary["nodes"] == 4
+    assert summary["duplicate_rows"] == 1
+    assert summary["stub_managers"] == 1
+    assert summary["unresolved_managers"] == 1
+    assert read(out / "employees_header.csv")[0][0] == "email:ID(Employee)"
+    assert [row[0] for row in read(out / "employees.csv")] == [
+        "robert@x.com", "jennifer@x.com", "lisa@x.com", "outside@x.com", "sam@x.com"
+    ]
+    assert read(out / "manages.csv") == [
+        ["robert@x.com", "jennifer@x.com", "MANAGES"],
+        ["outside@x.com", "lisa@x.com", "MANAGES"],
+    ]
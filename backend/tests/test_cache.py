@@ -0,0 +1,36 @@
+from app.cache import SubtreeCache
+
+def tree(size):
+    return {"nodes": [{"id": i} for i in range(size)], "links": []}
+
+def test_lru_eviction_by_entries():
+    cache = SubtreeCache(max_entries=2, max_items=1000)
+    cache.put("a", tree(1))
+    cache.put("b", tree(1))
+    assert cache.get("a") is not None  # "b" becomes least recently used
+    cache.put("c", tree(1))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+
+def test_item_bound_and_oversized_entries():
+    cache = SubtreeCache(max_entries=10, max_items=10)
+    cache.put("big", tree(50))
+    assert cache.get("big") is None
+
+    cache.put("a", tree(5))
+    cache.put("b", tree(5))
+    assert cache.get("a") is None
+    assert cache.stats()["items"] <= 10
+
+def test_invalidate_and_stale_generation_put():
+    cache = SubtreeCache()
+    generation = cache.generation
+    cache.put("a", tree(1), generation)
+    cache.invalidate()
+
+    assert cache.get("a") is None
+    # A response computed before the import finished must not be cached
+    cache.put("a", tree(1), generation)
+    assert cache.get("a") is None
@@ -1,6 +1,8 @@
+import json
 import pytest
 from fastapi import status
 import io
+from app.main import import_jobs
 
 def create_mock_neo4j_node(node_id, **properties):
     # Build a lightweight mock object mimicking neo4j Node
@@ -20,8 +22,16 @@ def create_mock_relationship(start_node, rel_type, end_node):
             self.type = rel_type
     return SimpleRel(start_node, rel_type, end_node)
 
-def test_get_employee_success(test_client, mock_neo4j_credentials, mock_neo4j_driver):
-    mock_driver, mock_session = mock_neo4j_driver
+def wait_for_import(test_client, response):
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job_id = response.json()["job_id"]
+    import_jobs.wait(job_id, timeout=5)
+    job = test_client.get(f"/imports/{job_id}", headers={"X-API-Key": "test-admin-key"})
+    assert job.status_code == status.HTTP_200_OK
+    return job.json()
+
+def test_get_employee_success(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
     
     # Create mock nodes and relationships
     manager = create_mock_neo4j_node(1, fullName="John Doe", email="john@example.com")
@@ -44,8 +54,8 @@ def test_get_employee_success(test_client, mock_neo4j_credentials, mock_neo4j_dr
     assert data["nodes"][1]["fullName"] == "Jane Smith"
     assert data["links"][0]["type"] == "MANAGES"
 
-def test_get_employee_not_found(test_client, mock_neo4j_credentials, mock_neo4j_driver):
-    mock_driver, mock_session = mock_neo4j_driver
+def test_get_employee_not_found(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
     mock_session.run.return_value.single.return_value = None
     
     response = test_client.get("/employee?name=NonExistent")
@@ -54,8 +64,8 @@ def test_get_employee_not_found(test_client, mock_neo4j_credentials, mock_neo4j_
     assert data["nodes"] == []
     assert data["links"] == []
 
-def test_get_non_manager_employee(test_client, mock_neo4j_credentials, mock_neo4j_driver):
-    mock_driver, mock_session = mock_neo4j_driver
+def test_get_non_manager_employee(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
     
     # Create mock node for employee who is not a manager
     employee = create_mock_neo4j_node(1, fullName="Lisa Gray", email="lisa.gray@example.com")
@@ -92,10 +102,9 @@ Jane,Smith,jane@example.com,098-765-4321,456 Oak St,John Doe"""
         headers={"X-API-Key": "test-admin-key"}
     )
     
-    assert response.status_code == status.HTTP_200_OK
-    data = response.json()
-    assert data["status"] == "ok"
-    assert data["imported"] == 2
+    data = wait_for_import(test_client, response)
+    assert data["status"] == "succeeded"
+    assert data["rows_processed"] == 2
 
 def test_upload_requires_api_key(test_client, mock_neo4j_credentials, mock_neo4j_driver):
     file = io.BytesIO(b"First Name,Last Name\nA,B")
@@ -124,5 +133,430 @@ def test_upload_with_valid_api_key(test_client, mock_neo4j_credentials, mock_neo
         files={"file": ("test.csv", file, "text/csv")},
         headers={"X-API-Key": "test-admin-key"}
     )
+    assert wait_for_import(test_client, response)["rows_processed"] == 1
+
+def test_upload_csv_batches_rows_with_unwind(test_client, mock_neo4j_credentials, mock_neo4j_driver):
+    mock_driver, mock_session = mock_neo4j_driver
+
+    csv_content = """first_name,last_name,email,manager_name,manager_email
+Robert,Johnson,robert@example.com,,
+Jennifer,Smith,jennifer@example.com,,robert@example.com
+Michael,Brown,michael@example.com,Robert Johnson,"""
+    file = io.BytesIO(csv_content.encode())
+
+    response = test_client.post(
+        "/upload?batch_size=2",
+        files={"file": ("test.csv", file, "text/csv")},
+        headers={"X-API-Key": "test-admin-key"}
+    )
+
+    data = wait_for_import(test_client, response)
+    assert data["rows_processed"] == 3
+    # Two node batches (2 + 1 rows), then one batch of email-keyed MANAGES edges
+    assert data["batches"] == 3
+    assert "rows_per_second" in data
+
+    writes = mock_session.execute_write.call_args_list
+    queries = [call.args[1] for call in writes]
+    batches = [call.args[2] for call in writes]
+    assert all(q.startswith("UNWIND $rows") for q in queries)
+    assert [len(b) for b in batches] == [2, 1, 2]
+    # "Robert Johnson" is resolved to his email from the file instead of a MERGE on fullName
+    assert batches[2] == [
+        {"email": "jennifer@example.com", "managerEmail": "robert@example.com"},
+        {"email": "michael@example.com", "managerEmail": "robert@example.com"},
+    ]
+    assert all("fullName: row.manager" not in q for q in queries)
+
+def test_upload_returns_job_immediately_and_reports_failures(test_client, mock_neo4j_credentials, mock_neo4j_driver):
+    mock_driver, mock_session = mock_neo4j_driver
+    mock_session.execute_write.side_effect = Exception("Deadlock detected")
+
+    file = io.BytesIO(b"First Name,Last Name\nA,B")
+    response = test_client.post(
+        "/upload",
+        files={"file": ("test.csv", file, "text/csv")},
+        headers={"X-API-Key": "test-admin-key"}
+    )
+    assert response.json()["status"] in ("queued", "running", "failed")
+
+    data = wait_for_import(test_client, response)
+    assert data["status"] == "failed"
+    assert data["rows_processed"] == 0
+    assert "Deadlock detected" in data["errors"][0]
+
+def test_get_unknown_import_job(test_client, mock_neo4j_credentials, mock_neo4j_driver):
+    response = test_client.get("/imports/does-not-exist", headers={"X-API-Key": "test-admin-key"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+def test_get_employee_depth_and_truncation(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+
+    manager = create_mock_neo4j_node(1, fullName="John Doe", email="john@example.com")
+    employee = create_mock_neo4j_node(2, fullName="Jane Smith", email="jane@example.com")
+    below_cap = create_mock_neo4j_node(3, fullName="Cut Off", email="cut@example.com")
+    mock_session.run.return_value.single.return_value = {
+        "nodes": [manager, employee],
+        "rels": [
+            create_mock_relationship(manager, "MANAGES", employee),
+            # Edge to a node outside the returned set must not leak into links
+            create_mock_relationship(employee, "MANAGES", below_cap),
+        ],
+        "truncated": True
+    }
+
+    response = test_client.get("/employee?name=John%20Doe&depth=2&max_nodes=2")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["truncated"] is True
+    assert [link["to_id"] for link in data["links"]] == [2]
+
+    query = mock_session.run.call_args.args[0]
+    assert "[:MANAGES*0..2]" in query
+    assert "COLLECT(nodes(p))" not in query
+    assert mock_session.run.call_args.kwargs["limit"] == 1
+
+def test_get_employee_is_cached_until_next_import(test_client, mock_neo4j_credentials, mock_neo4j_driver, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_session.run.reset_mock()  # ignore startup schema checks
+    manager = create_mock_neo4j_node(1, fullName="John Doe", email="john@example.com")
+    mock_session.run.return_value.single.return_value = {"nodes": [manager], "rels": [], "exact": True}
+
+    first = test_client.get("/employee?name=John%20Doe")
+    second = test_client.get("/employee?name=John%20Doe")
+    assert first.json() == second.json()
+    assert mock_session.run.call_count == 1
+    stats = test_client.get("/cache/stats").json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+    # A different depth is a different cache entry
+    test_client.get("/employee?name=John%20Doe&depth=1")
+    assert mock_session.run.call_count == 2
+
+    file = io.BytesIO(b"First Name,Last Name\nA,B")
+    response = test_client.post(
+        "/upload",
+        files={"file": ("test.csv", file, "text/csv")},
+        headers={"X-API-Key": "test-admin-key"}
+    )
+    wait_for_import(test_client, response)
+
+    test_client.get("/employee?name=John%20Doe")
+    assert mock_session.run.call_count == 3
+    assert test_client.get("/cache/stats").json()["generation"] >= 1
+
+def test_import_refreshes_aggregates_before_invalidating(test_client, mock_neo4j_credentials, mock_neo4j_driver,
+                                                         monkeypatch):
+    from app import main
+    seen = []
+    monkeypatch.setattr(main, "refresh_aggregates", lambda driver, batch_size: seen.append(main.subtree_cache.generation))
+    before = main.subtree_cache.generation
+
+    file = io.BytesIO(b"First Name,Last Name\nA,B")
+    response = test_client.post(
+        "/upload",
+        files={"file": ("test.csv", file, "text/csv")},
+        headers={"X-API-Key": "test-admin-key"}
+    )
+    wait_for_import(test_client, response)
+
+    # A read between the refresh and the bump must not cache pre-import stats under the new generation
+    assert seen == [before]
+    assert main.subtree_cache.generation == before + 1
+
+def test_failed_aggregates_refresh_clears_interval_labels(test_client, mock_neo4j_credentials, mock_neo4j_driver,
+                                                          monkeypatch):
+    from app import main
+    cleared = []
+    def refresh(driver, batch_size):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(main, "refresh_aggregates", refresh)
+    monkeypatch.setattr(main, "invalidate_intervals", lambda driver: cleared.append(main.subtree_cache.generation))
+    before = main.subtree_cache.generation
+
+    file = io.BytesIO(b"First Name,Last Name\nA,B")
+    response = test_client.post(
+        "/upload",
+        files={"file": ("test.csv", file, "text/csv")},
+        headers={"X-API-Key": "test-admin-key"}
+    )
+    wait_for_import(test_client, response)
+
+    # Stale labels would leave moved employees out of range scans, so they are cleared before the bump
+    assert cleared == [before]
+
+def test_import_swaps_snapshot_before_invalidating(test_client, mock_neo4j_credentials, mock_neo4j_driver,
+                                                   monkeypatch):
+    from app import main
+    seen = []
+    def refresh(driver, generation):
+        seen.append((main.subtree_cache.generation, generation))
+        raise RuntimeError("boom")
+    monkeypatch.setattr(main.org_snapshot, "enabled", True)
+    monkeypatch.setattr(main.org_snapshot, "refresh", refresh)
+    monkeypatch.setattr(main.org_snapshot, "snapshot", object())
+    before = main.subtree_cache.generation
+
+    file = io.BytesIO(b"First Name,Last Name\nA,B")
+    response = test_client.post(
+        "/upload",
+        files={"file": ("test.csv", file, "text/csv")},
+        headers={"X-API-Key": "test-admin-key"}
+    )
+    wait_for_import(test_client, response)
+
+    # Loaded under the generation it is published with, before the bump makes it current
+    assert seen == [(before, before + 1)]
+    assert main.subtree_cache.generation == before + 1
+    # A failed reload must not keep serving the pre-import org
+    assert main.org_snapshot.snapshot is None
+
+def subtree_rows():
+    manager = create_mock_neo4j_node(1, fullName="John Doe", email="john@example.com")
+    employee = create_mock_neo4j_node(2, fullName="Jane Smith", email="jane@example.com")
+    return [{"n": manager, "managerIds": []}, {"n": employee, "managerIds": [1]}]
+
+def test_get_employee_subtree_page(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_session.run.return_value.__aiter__.return_value = subtree_rows()
+
+    response = test_client.get("/employee/subtree?name=John%20Doe&limit=2")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [n["id"] for n in data["nodes"]] == [1, 2]
+    assert data["links"] == [{"from_id": 1, "to_id": 2, "type": "MANAGES"}]
+    assert data["next_cursor"] == 2
+
+    response = test_client.get("/employee/subtree?name=John%20Doe&limit=10&cursor=2")
+    assert response.json()["next_cursor"] is None
+    assert mock_session.run.call_args.kwargs["cursor"] == 2
+    # Exact intervals spare every page the traversal and every row the manager walk
+    query = mock_session.run.call_args.args[0]
+    assert "n.dfsIn >= e.dfsIn AND n.dfsIn <= e.dfsOut" in query
+    assert "CASE WHEN e.dfsExact THEN m.dfsIn" in query
+
+def test_stream_employee_subtree_ndjson(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_session.run.return_value.__aiter__.return_value = subtree_rows()
+
+    response = test_client.get("/employee/stream?name=John%20Doe")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [list(line) for line in lines] == [["node"], ["node"], ["link"]]
+    assert lines[2]["link"] == {"from_id": 1, "to_id": 2, "type": "MANAGES"}
+
+def test_search_employees(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    jennifer = create_mock_neo4j_node(2, fullName="Jennifer Smith", email="jennifer.smith@company.com")
+    mock_session.run.return_value.__aiter__.return_value = [{"node": jennifer, "score": 2.5}]
+
+    response = test_client.get("/employees/search?q=Jen%20smi&limit=5")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["results"] == [
+        {"id": 2, "fullName": "Jennifer Smith", "email": "jennifer.smith@company.com", "score": 2.5}
+    ]
+    kwargs = mock_session.run.call_args.kwargs
+    assert kwargs["query"] == "+(jen* OR jen~1) +(smi* OR smi~1)"
+    assert kwargs["limit"] == 5
+
+def test_search_ignores_lucene_syntax(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_session.run.reset_mock()
+
+    response = test_client.get("/employees/search?q=%2A%3A%29")
+    assert response.json() == {"results": []}
+    mock_session.run.assert_not_called()
+
+def test_get_management_chain(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    root = create_mock_neo4j_node(1, fullName="Robert Johnson")
+    manager = create_mock_neo4j_node(2, fullName="Jennifer Smith")
+    employee = create_mock_neo4j_node(3, fullName="Lisa Gray")
+    mock_session.run.return_value.__aiter__.return_value = [{"id": 3, "chain": [employee, manager, root]}]
+
+    response = test_client.get("/employee/3/chain")
     assert response.status_code == status.HTTP_200_OK
-    assert response.json()["imported"] == 1
+    assert [n["fullName"] for n in response.json()["chain"]] == ["Lisa Gray", "Jennifer Smith", "Robert Johnson"]
+    assert mock_session.run.call_args.kwargs["ids"] == [3]
+
+    # A manager created only from manager_email has no name
+    stub = create_mock_neo4j_node(4, email="boss@example.com")
+    mock_session.run.return_value.__aiter__.return_value = [{"id": 3, "chain": [employee, stub]}]
+    response = test_client.get("/employee/3/chain")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["chain"][1]["fullName"] is None
+
+    mock_session.run.return_value.__aiter__.return_value = []
+    assert test_client.get("/employee/99/chain").status_code == status.HTTP_404_NOT_FOUND
+
+def test_get_management_chains_batched(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    root = create_mock_neo4j_node(1, fullName="Robert Johnson")
+    manager = create_mock_neo4j_node(2, fullName="Jennifer Smith")
+    mock_session.run.return_value.__aiter__.return_value = [
+        {"id": 2, "chain": [manager, root]},
+        {"id": 1, "chain": [root]},
+    ]
+
+    response = test_client.post("/employees/chains", json={"ids": [1, 2, 2, 42]})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [c["id"] for c in data["chains"]] == [1, 2]
+    assert data["missing"] == [42]
+    # Duplicate ids are resolved once, in a single query
+    assert mock_session.run.call_args.kwargs["ids"] == [1, 2, 42]
+
+def test_get_employee_etag_returns_304_until_next_import(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    from app.main import subtree_cache
+    mock_driver, mock_session = mock_neo4j_async_driver
+    manager = create_mock_neo4j_node(1, fullName="John Doe", email="john@example.com")
+    mock_session.run.return_value.single.return_value = {"nodes": [manager], "rels": []}
+
+    response = test_client.get("/employee?name=John%20Doe")
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    mock_session.run.reset_mock()
+
+    response = test_client.get("/employee?name=John%20Doe", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    mock_session.run.assert_not_called()
+
+    # Other parameters and later generations get a different tag
+    assert test_client.get("/employee?name=John%20Doe&depth=1", headers={"If-None-Match": etag}).status_code == 200
+    subtree_cache.invalidate()
+    response = test_client.get("/employee?name=John%20Doe", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+
+def test_get_employee_columnar_and_gzip(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    manager = create_mock_neo4j_node(1, fullName="John Doe", email="john@example.com")
+    reports = [create_mock_neo4j_node(i, fullName=f"Report {i}", email=f"report{i}@example.com") for i in range(2, 200)]
+    mock_session.run.return_value.single.return_value = {
+        "nodes": [manager] + reports,
+        "rels": [create_mock_relationship(manager, "MANAGES", report) for report in reports],
+    }
+
+    default = test_client.get("/employee?name=John%20Doe", headers={"Accept-Encoding": "gzip"})
+    assert default.headers["content-encoding"] == "gzip"
+
+    response = test_client.get("/employee?name=John%20Doe&format=columnar")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["columns"]["id"][:2] == [1, 2]
+    assert data["columns"]["fullName"][1] == "Report 2"
+    assert data["links"][:2] == [[0, 1], [0, 2]]
+    assert len(data["links"]) == 198
+    assert len(response.content) < len(default.content) / 2
+
+def test_get_employee_subtrees_in_one_query(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    manager = create_mock_neo4j_node(1, fullName="John Doe", email="john@example.com")
+    shared = create_mock_neo4j_node(2, fullName="Jane Smith", email="jane@example.com")
+    mock_session.run.return_value.single.return_value = {
+        "roots": [
+            {"by": "email", "key": "jane@example.com", "id": 2, "members": [2], "truncated": False},
+            {"by": "name", "key": "John Doe", "id": 1, "members": [1, 2], "truncated": False},
+        ],
+        "nodes": [manager, shared],
+        "rels": [create_mock_relationship(manager, "MANAGES", shared)],
+    }
+    mock_session.run.reset_mock()
+
+    response = test_client.post("/employees/subtrees", json={
+        "names": ["John Doe", "Ghost"], "emails": ["jane@example.com"], "depth": 2
+    })
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [n["id"] for n in data["nodes"]] == [1, 2]
+    assert len(data["links"]) == 1
+    assert [r["key"] for r in data["roots"]] == ["John Doe", "jane@example.com"]
+    assert data["missing"] == [{"by": "name", "key": "Ghost"}]
+    assert mock_session.run.call_count == 1
+    params = mock_session.run.call_args.kwargs
+    assert "UNWIND $roots" in mock_session.run.call_args.args[0]
+    assert [r["by"] for r in params["roots"]] == ["name", "name", "email"]
+
+def test_get_employee_subtrees_of_a_nameless_manager(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    # Created by MERGE on a report's manager_email, so it has no name
+    stub = create_mock_neo4j_node(1, email="boss@example.com")
+    report = create_mock_neo4j_node(2, fullName="Jane Smith", email="jane@example.com")
+    mock_session.run.return_value.single.return_value = {
+        "roots": [{"by": "email", "key": "boss@example.com", "id": 1, "members": [1, 2], "truncated": False}],
+        "nodes": [stub, report],
+        "rels": [create_mock_relationship(stub, "MANAGES", report)],
+    }
+
+    response = test_client.post("/employees/subtrees", json={"emails": ["boss@example.com"]})
+    assert response.status_code == status.HTTP_200_OK
+    assert [n["fullName"] for n in response.json()["nodes"]] == [None, "Jane Smith"]
+
+def test_get_employee_subtrees_requires_a_root(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    response = test_client.post("/employees/subtrees", json={"names": []})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_get_employee_stats(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    manager = create_mock_neo4j_node(1, fullName="John Doe", directReports=4, totalReports=37, depth=0, maxDepthBelow=3)
+    mock_session.run.return_value.single.return_value = {"e": manager}
+
+    response = test_client.get("/employee/1/stats")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "id": 1, "fullName": "John Doe", "directReports": 4, "totalReports": 37, "depth": 0, "maxDepthBelow": 3
+    }
+    assert mock_session.run.call_args.kwargs == {"id": 1}
+
+    mock_session.run.return_value.single.return_value = None
+    assert test_client.get("/employee/2/stats").status_code == status.HTTP_404_NOT_FOUND
+
+def test_get_employee_uses_interval_scan_and_falls_back(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_session.run.reset_mock()
+    manager = create_mock_neo4j_node(1, fullName="John Doe")
+    mock_session.run.return_value.single.return_value = {"nodes": [manager], "rels": [], "exact": True}
+
+    assert test_client.get("/employee?name=John%20Doe").status_code == status.HTTP_200_OK
+    assert mock_session.run.call_count == 1
+    assert "sub.dfsIn > e.dfsIn" in mock_session.run.call_args.args[0]
+
+    # Not exact (second manager or cycle below): same request through the traversal
+    mock_session.run.return_value.single.return_value = {"nodes": [manager], "rels": [], "exact": False}
+    assert test_client.get("/employee?name=John%20Doe&max_nodes=5").status_code == status.HTTP_200_OK
+    assert mock_session.run.call_count == 3
+    assert "[:MANAGES*0..]" in mock_session.run.call_args.args[0]
+
+def test_is_under(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_session.run.return_value.single.return_value = {"under": True}
+
+    response = test_client.get("/employee/2/is-under/1")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"employee_id": 2, "manager_id": 1, "is_under": True}
+    assert mock_session.run.call_args.kwargs == {"employee_id": 2, "manager_id": 1}
+
+    mock_session.run.return_value.single.return_value = None
+    assert test_client.get("/employee/2/is-under/404").status_code == status.HTTP_404_NOT_FOUND
+
+def test_upload_with_cycle_is_rejected_with_report(test_client, mock_neo4j_credentials, mock_neo4j_driver):
+    mock_driver, mock_session = mock_neo4j_driver
+    mock_session.execute_write.reset_mock()
+    file = io.BytesIO(b"First Name,Last Name,Email,manager_email\nBo,B,bo@x.com,cy@x.com\nCy,C,cy@x.com,bo@x.com\n")
+
+    response = test_client.post(
+        "/upload",
+        files={"file": ("cycle.csv", file, "text/csv")},
+        headers={"X-API-Key": "test-admin-key"}
+    )
+    job = wait_for_import(test_client, response)
+
+    assert job["status"] == "failed"
+    assert "rejected" in job["errors"][0]
+    assert job["validation"]["action"] == "rejected"
+    assert job["validation"]["counts"] == {"cycle": 2}
+    assert [issue["email"] for issue in job["validation"]["issues"]] == ["bo@x.com", "cy@x.com"]
+    mock_session.execute_write.assert_not_called()
@@ -0,0 +1,148 @@
+import os
+import pytest
+from app.aggregates import CLEAR_EXACT_INTERVALS, LOAD_AGGREGATES_QUERY
+from app.snapshot import LOAD_EDGES_QUERY
+from fix_relationships import fix_relationships, load_checkpoint, plan_merge, COUNT_EDGES, FIND_DUPLICATES
+
+def test_plan_merge_prefers_real_email():
+    members = [
+        {'id': 1, 'email': 'James Anderson'},
+        {'id': 2, 'email': 'james@x.com'},
+        {'id': 3, 'email': None},
+    ]
+    assert plan_merge('James Anderson', members) == (2, [1, 3])
+
+def test_plan_merge_without_email_keeps_name_keyed_node():
+    members = [{'id': 4, 'email': None}, {'id': 7, 'email': 'Lisa Gray'}]
+    assert plan_merge('Lisa Gray', members) == (7, [4])
+
+def test_plan_merge_skips_different_people():
+    members = [{'id': 1, 'email': 'james@x.com'}, {'id': 2, 'email': 'james2@x.com'}]
+    assert plan_merge('James Anderson', members) is None
+
+class FakeResult(list):
+    def single(self):
+        return self[0]
+
+    def consume(self):
+        pass
+
+class FakeSession:
+    """Serves pages of duplicate groups after ``$after`` and records writes."""
+
+    def __init__(self, groups, fail_on_write=None):
+        self.groups = groups
+        self.fail_on_write = fail_on_write
+        self.writes = []
+        # Number of merge writes done when the labels were cleared / recomputed
+        self.cleared = []
+        self.refreshed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def run(self, query, **params):
+        if query == FIND_DUPLICATES:
+            names = sorted(name for name in self.groups if name > params['after'])
+            return FakeResult({'name': name, 'members': self.groups[name]} for name in names[:params['page_size']])
+        if query == COUNT_EDGES:
+            return FakeResult([{'edges': len(params['ids'])}])
+        if query == CLEAR_EXACT_INTERVALS:
+            self.cleared.append(len(self.writes))
+            return FakeResult([{'cleared': 0}])
+        if query == LOAD_AGGREGATES_QUERY:
+            self.refreshed.append(len(self.writes))
+            return FakeResult()
+        if query == LOAD_EDGES_QUERY:
+            return FakeResult()
+        if len(self.writes) == self.fail_on_write:
+            raise RuntimeError("connection lost")
+        self.writes.append(params['pairs'])
+        for pair in params['pairs']:
+            # Merged groups no longer show up as duplicates
+            for name, members in list(self.groups.items()):
+                if any(m['id'] == pair['duplicate'] for m in members):
+                    del self.groups[name]
+        return FakeResult()
+
+class FakeDriver:
+    def __init__(self, session):
+        self._session = session
+
+    def session(self):
+        return self._session
+
+def groups():
+    return {
+        'Alice': [{'id': 1, 'email': 'alice@x.com'}, {'id': 2, 'email': 'Alice'}],
+        'Bob': [{'id': 3, 'email': 'bob@x.com'}, {'id': 4, 'email': 'bob2@x.com'}],
+        'Carol': [{'id': 5, 'email': 'carol@x.com'}, {'id': 6, 'email': None}],
+    }
+
+def test_dry_run_reports_without_writing(tmp_path):
+    session = FakeSession(groups())
+    checkpoint = tmp_path / "checkpoint.json"
+
+    summary = fix_relationships(FakeDriver(session), page_size=2, dry_run=True, checkpoint_path=str(checkpoint))
+
+    assert summary == {'groups': 2, 'duplicates': 2, 'edges': 2, 'conflicts': 1}
+    assert session.writes == []
+    assert session.cleared == session.refreshed == []
+    assert not checkpoint.exists()
+
+def test_interrupted_run_resumes_from_checkpoint(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    session = FakeSession(groups(), fail_on_write=1)
+
+    with pytest.raises(RuntimeError):
+        fix_relationships(FakeDriver(session), page_size=1, checkpoint_path=str(checkpoint))
+    assert load_checkpoint(str(checkpoint)) == {'after': 'Bob', 'merged': 1, 'conflicts': 1}
+    # Labels are cleared before the first merge and stay cleared until a run completes
+    assert session.cleared == [0]
+    assert session.refreshed == []
+
+    session.fail_on_write = None
+    summary = fix_relationships(FakeDriver(session), page_size=1, checkpoint_path=str(checkpoint))
+
+    assert summary['duplicates'] == 1
+    assert session.writes == [[{'canonical': 1, 'duplicate': 2}], [{'canonical': 5, 'duplicate': 6}]]
+    assert session.cleared == [0]
+    assert session.refreshed == [2]
+    assert not checkpoint.exists()
+
+@pytest.mark.skipif(not os.getenv("NEO4J_TEST_URI"), reason="NEO4J_TEST_URI not set")
+def test_merges_duplicates_in_neo4j(tmp_path):
+    from neo4j import GraphDatabase
+    driver = GraphDatabase.driver(
+        os.environ["NEO4J_TEST_URI"],
+        auth=(os.getenv("NEO4J_TEST_USER", "neo4j"), os.getenv("NEO4J_TEST_PASSWORD", "password")),
+    )
+    with driver.session() as session:
+        session.run("MATCH (e:Employee) WHERE e.fullName STARTS WITH 'Fixrel ' DETACH DELETE e").consume()
+        session.run(
+            "CREATE (real:Employee {fullName: 'Fixrel Boss', email: 'fixrel.boss@x.com'}) "
+            "CREATE (phantom:Employee {fullName: 'Fixrel Boss', email: 'Fixrel Boss'}) "
+            "CREATE (top:Employee {fullName: 'Fixrel Top', email: 'fixrel.top@x.com'}) "
+            "CREATE (report:Employee {fullName: 'Fixrel Report', email: 'fixrel.report@x.com'}) "
+            "CREATE (top)-[:MANAGES]->(phantom)-[:MANAGES]->(report)"
+        ).consume()
+
+    try:
+        fix_relationships(driver, batch_size=1, checkpoint_path=str(tmp_path / "checkpoint.json"))
+
+        with driver.session() as session:
+            record = session.run(
+                "MATCH (b:Employee {fullName: 'Fixrel Boss'}) "
+                "RETURN collect(b.email) AS emails, "
+                "exists { (:Employee {email: 'fixrel.top@x.com'})-[:MANAGES]->(b) } AS managed, "
+                "exists { (b)-[:MANAGES]->(:Employee {email: 'fixrel.report@x.com'}) } AS manages"
+            ).single()
+        assert record["emails"] == ["fixrel.boss@x.com"]
+        assert record["managed"] and record["manages"]
+    finally:
+        with driver.session() as session:
+            session.run("MATCH (e:Employee) WHERE e.fullName STARTS WITH 'Fixrel ' DETACH DELETE e").consume()
+        driver.close()
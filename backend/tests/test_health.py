@@ -1,8 +1,11 @@
+import asyncio
 import pytest
 from fastapi import status
+from app.health import ReadinessProbe
+from app.main import component_info, readiness
 
-def test_health_check_success(test_client, mock_neo4j_credentials, mock_neo4j_driver):
-    mock_driver, mock_session = mock_neo4j_driver
+def test_health_check_success(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
     
     # Mock Neo4j version query
     mock_session.run.return_value.single.return_value = {
@@ -10,6 +13,8 @@ def test_health_check_success(test_client, mock_neo4j_credentials, mock_neo4j_dr
         "versions": ["5.7.0"],
         "edition": "aura"
     }
+    # The startup read saw the unconfigured mock; fetch again with the values above
+    component_info.invalidate()
     
     response = test_client.get("/health")
     assert response.status_code == status.HTTP_200_OK
@@ -20,10 +25,100 @@ def test_health_check_success(test_client, mock_neo4j_credentials, mock_neo4j_dr
     assert data["database"]["version"] == "5.7.0"
     assert data["database"]["edition"] == "aura"
 
-def test_health_check_db_failure(test_client, mock_neo4j_credentials, mock_neo4j_driver):
-    mock_driver, mock_session = mock_neo4j_driver
-    mock_session.run.side_effect = Exception("Database connection failed")
+def test_health_check_is_cached(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_session.run.return_value.single.return_value = {"name": "neo4j", "versions": ["5.7.0"], "edition": "aura"}
+    component_info.invalidate()
+    test_client.get("/health")
+    mock_session.run.reset_mock()
+    mock_driver.return_value.verify_connectivity.reset_mock()
+
+    for _ in range(3):
+        assert test_client.get("/health").status_code == status.HTTP_200_OK
+    mock_session.run.assert_not_called()
+    mock_driver.return_value.verify_connectivity.assert_not_called()
+
+def test_health_check_db_failure(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_driver.return_value.verify_connectivity.side_effect = Exception("Database connection failed")
     
     response = test_client.get("/health")
     assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
     assert "Database connection failed" in response.json()["detail"]
+
+def test_livez_does_no_io(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_session.run.reset_mock()
+
+    response = test_client.get("/livez")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"status": "alive"}
+    mock_session.run.assert_not_called()
+    mock_driver.return_value.verify_connectivity.assert_not_called()
+
+def test_readyz(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+
+    response = test_client.get("/readyz")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"status": "ready", "pending_migrations": []}
+
+    readiness.invalidate()
+    mock_driver.return_value.verify_connectivity.side_effect = Exception("Unable to retrieve routing information")
+    response = test_client.get("/readyz")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert "routing information" in response.json()["detail"]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_readiness_probe_caches_until_ttl():
+    calls = []
+
+    async def check():
+        calls.append(1)
+
+    clock = FakeClock()
+    probe = ReadinessProbe(check, ttl=5, timeout=1, clock=clock)
+    assert asyncio.run(probe.status()) == (True, None)
+    clock.now = 4.9
+    asyncio.run(probe.status())
+    assert len(calls) == 1
+    clock.now = 5.0
+    asyncio.run(probe.status())
+    assert len(calls) == 2
+
+def test_readiness_probe_times_out():
+    async def check():
+        await asyncio.sleep(1)
+
+    ready, error = asyncio.run(ReadinessProbe(check, ttl=5, timeout=0.01).status())
+    assert not ready
+    assert "timed out" in error
+
+def test_async_driver_uses_pool_settings(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    kwargs = mock_driver.call_args.kwargs
+    assert kwargs["max_connection_pool_size"] > 0
+    assert kwargs["connection_acquisition_timeout"] > 0
+
+def test_metrics_exposes_request_and_query_timing(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_session.run.return_value.single.return_value = {
+        "name": "neo4j",
+        "versions": ["5.7.0"],
+        "edition": "aura"
+    }
+    test_client.get("/health")
+
+    response = test_client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    body = response.text
+    assert 'orgchart_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+    assert 'orgchart_neo4j_query_duration_seconds_count{query="health_components"}' in body
+    assert 'orgchart_neo4j_queries_in_flight{driver="async"} 0.0' in body
+    assert 'orgchart_subtree_cache_hits_total' in body
@@ -0,0 +1,162 @@
+import io
+import pytest
+from app.importer import (DELETE_EMPLOYEES, DELETE_MANAGES, MERGE_EMPLOYEES, MERGE_MANAGES_BY_EMAIL, CsvSource,
+                          fingerprint, import_employees, import_employees_diff, parse_row)
+from app.validation import ImportValidationError
+
+def test_csv_source_is_reiterable_and_leaves_file_open():
+    fileobj = io.BytesIO("first_name,last_name,email\nJosé,Núñez,jose@example.com\nA,B,\n".encode('utf-8'))
+    source = CsvSource(fileobj)
+
+    first_pass = [parse_row(row) for row in source]
+    second_pass = [parse_row(row) for row in source]
+
+    assert first_pass == second_pass
+    assert first_pass[0]['full'] == "José Núñez"
+    # Rows without an email are keyed by full name
+    assert first_pass[1]['email'] == "A B"
+    assert not fileobj.closed
+
+class RecordingSession:
+    """Sync session stand-in: serves stored fingerprints and records every batch written."""
+    def __init__(self, existing):
+        self.existing = existing
+        self.writes = []
+    def run(self, query, **params):
+        return [{"email": email, "rowHash": h, "managerKey": k} for email, (h, k) in self.existing.items()]
+    def execute_write(self, fn, query, rows):
+        self.writes.append((query, list(rows)))
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        return False
+
+class RecordingDriver:
+    def __init__(self, existing):
+        self.session_obj = RecordingSession(existing)
+    def session(self):
+        return self.session_obj
+
+def stored(row):
+    params = fingerprint(parse_row(row))
+    return params["rowHash"], params["managerKey"]
+
+def test_diff_import_writes_only_changes():
+    boss = {"first_name": "Robert", "last_name": "Johnson", "email": "robert@x.com", "manager_email": ""}
+    same = {"first_name": "Lisa", "last_name": "Gray", "email": "lisa@x.com", "manager_email": "robert@x.com"}
+    phone = {"first_name": "Sam", "last_name": "Lee", "email": "sam@x.com", "manager_email": "robert@x.com"}
+    move = {"first_name": "Ann", "last_name": "Bell", "email": "ann@x.com", "manager_email": "robert@x.com"}
+    existing = {
+        "robert@x.com": stored(boss),
+        "lisa@x.com": stored(same),
+        "sam@x.com": stored(phone),
+        "ann@x.com": stored(dict(move, manager_email="lisa@x.com")),
+        "gone@x.com": ("old", ""),
+    }
+    new = {"first_name": "New", "last_name": "Hire", "email": "new@x.com", "manager_email": "ann@x.com"}
+    rows = [boss, same, dict(phone, phone="555-1234"), move, new]
+
+    driver = RecordingDriver(existing)
+    result = import_employees_diff(driver, rows, batch_size=10, delete_missing=True)
+
+    assert (result.inserted, result.updated, result.moved, result.unchanged, result.deleted) == (1, 1, 1, 2, 1)
+    writes = {query: rows for query, rows in driver.session_obj.writes}
+    assert sorted(r["email"] for r in writes[MERGE_EMPLOYEES]) == ["ann@x.com", "new@x.com", "sam@x.com"]
+    assert writes[DELETE_MANAGES] == [{"email": "ann@x.com"}]
+    assert sorted(r["email"] for r in writes[MERGE_MANAGES_BY_EMAIL]) == ["ann@x.com", "new@x.com"]
+    assert writes[DELETE_EMPLOYEES] == [{"email": "gone@x.com"}]
+
+def test_fingerprint_ignores_manager_case():
+    a = fingerprint(parse_row({"first_name": "Lisa", "last_name": "Gray", "email": "lisa@x.com", "manager_name": "Robert Johnson"}))
+    b = fingerprint(parse_row({"first_name": "Lisa", "last_name": "Gray", "email": "lisa@x.com", "manager_name": "robert johnson"}))
+    assert a["rowHash"] == b["rowHash"]
+
+class LookupSession(RecordingSession):
+    def __init__(self, graph_names):
+        super().__init__({})
+        self.graph_names = graph_names
+        self.lookups = []
+    def run(self, query, **params):
+        self.lookups.append(params["names"])
+        return [{"name": n, "emails": self.graph_names[n]} for n in params["names"] if n in self.graph_names]
+
+def test_managers_resolved_by_name_before_writing():
+    rows = [
+        {"first_name": "Ann", "last_name": "Lee", "email": "ann1@x.com"},
+        {"first_name": "Ann", "last_name": "Lee", "email": "ann2@x.com"},
+        {"first_name": "Bob", "last_name": "Ray", "email": "bob@x.com", "manager_name": "Ann Lee"},
+        {"first_name": "Cy", "last_name": "Fox", "email": "cy@x.com", "manager_name": "Existing Boss"},
+        {"first_name": "Di", "last_name": "Orr", "email": "di@x.com", "manager_name": "Nobody"},
+        {"first_name": "Ed", "last_name": "Lim", "email": "ed@x.com", "manager_name": "Bob Ray"},
+    ]
+    driver = RecordingDriver({})
+    driver.session_obj = LookupSession({"Existing Boss": ["boss@x.com"]})
+
+    result = import_employees(driver, rows, batch_size=10)
+
+    assert result.ambiguous_managers == ["Ann Lee"]
+    assert result.unresolved_managers == ["Nobody"]
+    # Only names missing from the file are looked up, in one query
+    assert driver.session_obj.lookups == [["Existing Boss", "Nobody"]]
+    # A manager found by name in the database is not an orphan
+    assert {i.email for i in result.validation.issues if i.kind == "orphan"} == {"bob@x.com", "di@x.com"}
+    edges = [r for q, rows in driver.session_obj.writes if q == MERGE_MANAGES_BY_EMAIL for r in rows]
+    assert edges == [
+        {"email": "cy@x.com", "managerEmail": "boss@x.com"},
+        {"email": "ed@x.com", "managerEmail": "bob@x.com"},
+    ]
+
+def test_per_row_debug_logs_are_sampled(monkeypatch):
+    from loguru import logger
+    from app import importer
+    monkeypatch.setattr(importer, "IMPORT_LOG_SAMPLE_EVERY", 2)
+    messages = []
+    handler = logger.add(lambda message: messages.append(message.record["message"]), level="DEBUG",
+                         filter=lambda record: record["message"].startswith("Importing row"))
+    try:
+        for n in range(1, 6):
+            importer._log_row(n, {'email': f'e{n}@x.com'})
+    finally:
+        logger.remove(handler)
+    assert messages == ["Importing row 2: e2@x.com", "Importing row 4: e4@x.com"]
+
+def cyclic_rows():
+    return [
+        {"first_name": "Root", "last_name": "A", "email": "root@x.com"},
+        {"first_name": "Bo", "last_name": "B", "email": "bo@x.com", "manager_email": "cy@x.com"},
+        {"first_name": "Cy", "last_name": "C", "email": "cy@x.com", "manager_email": "bo@x.com"},
+        {"first_name": "Di", "last_name": "D", "email": "di@x.com", "manager_email": "root@x.com"},
+    ]
+
+def test_cycle_rejects_import_before_any_write():
+    driver = RecordingDriver({})
+    with pytest.raises(ImportValidationError) as error:
+        import_employees(driver, cyclic_rows(), batch_size=10)
+    assert driver.session_obj.writes == []
+    assert error.value.report.action == "rejected"
+    assert error.value.report.counts == {"cycle": 2}
+
+def test_quarantine_withholds_edges_and_fingerprints():
+    driver = RecordingDriver({})
+    result = import_employees(driver, cyclic_rows(), batch_size=10, on_invalid="quarantine")
+
+    assert result.validation.action == "quarantined"
+    assert result.validation.quarantined == 2
+    writes = {query: rows for query, rows in driver.session_obj.writes}
+    assert len(writes[MERGE_EMPLOYEES]) == 4
+    assert writes[MERGE_MANAGES_BY_EMAIL] == [{"email": "di@x.com", "managerEmail": "root@x.com"}]
+    # No fingerprint on quarantined rows, so a fixed file writes their edges
+    unhashed = [r["email"] for r in writes[MERGE_EMPLOYEES] if r["rowHash"] is None]
+    assert unhashed == ["bo@x.com", "cy@x.com"]
+
+def test_manager_given_by_name_or_email_is_the_same_fingerprint():
+    boss = {"first_name": "Robert", "last_name": "Johnson", "email": "robert@x.com"}
+    by_name = {"first_name": "Lisa", "last_name": "Gray", "email": "lisa@x.com", "manager_name": "Robert Johnson"}
+    by_email = dict(by_name, manager_email="robert@x.com")
+    driver = RecordingDriver({})
+    import_employees(driver, [boss, by_name], batch_size=10)
+    existing = {r["email"]: (r["rowHash"], r["managerKey"]) for q, rows in driver.session_obj.writes
+                if q == MERGE_EMPLOYEES for r in rows}
+
+    result = import_employees_diff(RecordingDriver(existing), [boss, by_email], batch_size=10)
+    assert (result.moved, result.unchanged) == (0, 2)
@@ -0,0 +1,17 @@
+import json
+from loguru import logger
+from app.logging_config import configure_logging
+
+def test_json_file_sink(tmp_path):
+    log_file = tmp_path / "app.log"
+    configure_logging(level="INFO", fmt="json", log_file=str(log_file), enqueue=True)
+    try:
+        logger.debug("hidden")
+        logger.info("Imported {} rows", 3)
+        logger.complete()
+    finally:
+        configure_logging(log_file="")
+
+    records = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [record["record"]["message"] for record in records] == ["Imported 3 rows"]
+    assert records[0]["record"]["level"]["name"] == "INFO"
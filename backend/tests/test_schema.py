@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from fastapi import status
+from unittest.mock import AsyncMock, MagicMock
+from app.schema import MIGRATIONS, MigrationStatus, apply_migrations
+
+def make_driver(current_version, fail_on=None):
+    session = MagicMock()
+    statements = []
+
+    async def run(query, **params):
+        statements.append(query)
+        if fail_on and fail_on in query:
+            raise RuntimeError("Unable to create Constraint: duplicate email")
+        result = MagicMock()
+        result.single = AsyncMock(return_value={"version": current_version})
+        result.consume = AsyncMock()
+        return result
+
+    session.run = run
+    ctx = MagicMock()
+    ctx.__aenter__.return_value = session
+    driver = MagicMock()
+    driver.session.return_value = ctx
+    return driver, statements
+
+def test_apply_migrations_from_empty_database():
+    driver, statements = make_driver(0)
+    version = asyncio.run(apply_migrations(driver))
+
+    assert version == MIGRATIONS[-1][0]
+    assert any("REQUIRE e.email IS UNIQUE" in s for s in statements)
+    assert any("ON (e.fullName)" in s for s in statements)
+    assert all("IF NOT EXISTS" in s for s in statements if s.startswith("CREATE"))
+
+def test_apply_migrations_is_noop_when_current():
+    driver, statements = make_driver(MIGRATIONS[-1][0])
+    version = asyncio.run(apply_migrations(driver))
+
+    assert version == MIGRATIONS[-1][0]
+    assert not any(s.startswith("CREATE") for s in statements)
+
+def test_failed_migration_reports_the_ones_blocked_behind_it():
+    driver, statements = make_driver(0, fail_on="REQUIRE e.email IS UNIQUE")
+    migration_status = MigrationStatus()
+    with pytest.raises(RuntimeError):
+        asyncio.run(apply_migrations(driver, migration_status))
+
+    assert not any("FULLTEXT" in s for s in statements)
+    pending = migration_status.pending()
+    assert pending[0].startswith("v1 ") and "failed: Unable to create Constraint" in pending[0]
+    assert [line.split(": ", 1)[1] for line in pending[1:]] == ["pending: blocked by v1"] * (len(MIGRATIONS) - 1)
+
+    driver, _ = make_driver(0)
+    asyncio.run(apply_migrations(driver, migration_status))
+    assert migration_status.pending() == []
+
+def test_readyz_and_schema_status_report_blocked_migrations(test_client, mock_neo4j_credentials, mock_neo4j_async_driver,
+                                                             monkeypatch):
+    from app import main
+    monkeypatch.setattr(main.migration_status, "failed_version", 1)
+    monkeypatch.setattr(main.migration_status, "error", "duplicate email")
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_session.run.return_value.single.return_value = {"version": 0}
+    mock_session.run.return_value.data.return_value = []
+
+    ready = test_client.get("/readyz").json()
+    assert ready["status"] == "ready"
+    assert "v2 (Full-text index on Employee.fullName and Employee.email for search): pending: blocked by v1" \
+        in ready["pending_migrations"]
+    schema = test_client.get("/admin/schema", headers={"X-API-Key": "test-admin-key"}).json()
+    assert schema["pending"] == ready["pending_migrations"]
+
+def test_schema_status_endpoint(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_session.run.return_value.single.return_value = {"version": 1}
+    mock_session.run.return_value.data.return_value = [{
+        "name": "employee_full_name", "type": "RANGE", "labelsOrTypes": ["Employee"],
+        "properties": ["fullName"], "state": "ONLINE", "populationPercent": 100.0
+    }]
+
+    response = test_client.get("/admin/schema", headers={"X-API-Key": "test-admin-key"})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["version"] == 1
+    assert data["indexes"][0]["state"] == "ONLINE"
+
+def test_schema_status_requires_api_key(test_client, mock_neo4j_credentials, mock_neo4j_async_driver):
+    response = test_client.get("/admin/schema")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,74 @@
+from fastapi import status
+from app.secret_cache import SecretCache
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    def __call__(self):
+        return self.now
+
+class StubSSM:
+    """Stands in for boto3's SSM client: returns the current parameter value and counts calls."""
+    def __init__(self, value):
+        self.value = value
+        self.error = None
+        self.calls = 0
+    def fetch(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+def test_value_is_cached_until_ttl():
+    clock, ssm = Clock(), StubSSM("key-1")
+    cache = SecretCache("test", ssm.fetch, ttl=60, refresh_ahead=0, clock=clock)
+
+    assert cache.get() == "key-1"
+    clock.now += 59
+    assert cache.get() == "key-1"
+    assert ssm.calls == 1
+    clock.now += 1
+    cache.get()
+    assert ssm.calls == 2
+
+def test_rotation_accepts_old_and_new_key_during_overlap():
+    clock, ssm = Clock(), StubSSM("old-key")
+    cache = SecretCache("test", ssm.fetch, ttl=60, overlap=300, refresh_ahead=0, min_refresh_interval=10, clock=clock)
+    assert cache.matches("old-key")
+
+    ssm.value = "new-key"  # scripts/rotate_admin_api_key.py overwrote the parameter
+    # Within the refresh interval the new key is not looked up yet
+    assert not cache.matches("new-key")
+    clock.now += 10
+    # A mismatch after the interval forces a refresh that picks up the rotation
+    assert cache.matches("new-key")
+    assert cache.matches("old-key")
+
+    clock.now += 301
+    assert not cache.matches("old-key")
+    assert cache.matches("new-key")
+
+def test_wrong_key_does_not_hammer_ssm():
+    clock, ssm = Clock(), StubSSM("key-1")
+    cache = SecretCache("test", ssm.fetch, ttl=60, refresh_ahead=0, min_refresh_interval=30, clock=clock)
+    for _ in range(100):
+        assert not cache.matches("guess")
+    assert ssm.calls == 1
+
+    # SSM unreachable: the re-check fails closed and is still rate-limited
+    ssm.error = RuntimeError("SSM unreachable")
+    clock.now += 30
+    for _ in range(100):
+        assert not cache.matches("guess")
+    assert ssm.calls == 2
+    assert cache.matches("key-1")
+
+def test_admin_key_fetched_once_across_requests(test_client, mock_neo4j_credentials, mock_neo4j_driver):
+    import boto3
+    before = boto3.client.return_value.get_parameter.call_count
+    for _ in range(3):
+        response = test_client.get("/imports/unknown", headers={"X-API-Key": "test-admin-key"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    calls = [c for c in boto3.client.return_value.get_parameter.call_args_list[before:]
+             if c.kwargs["Name"] == "orgchart_admin_api_key"]
+    assert len(calls) <= 1
@@ -0,0 +1,108 @@
+import pytest
+from fastapi import status
+from app.main import org_snapshot
+from app.snapshot import EmployeeRecord, OrgSnapshot
+
+def build_snapshot():
+    # 10 -> 11 -> 13, 10 -> 12, 12 -> 14 -> 10 (cycle back to the root)
+    records = [EmployeeRecord(id, fullName=name) for id, name in
+               [(10, "Root"), (11, "A"), (12, "B"), (13, "A1"), (14, "B1")]]
+    edges = [(10, 11), (10, 12), (11, 13), (12, 14), (14, 10)]
+    return OrgSnapshot(records, edges)
+
+def test_subtree_returns_each_node_and_edge_once():
+    tree = build_snapshot().subtree("Root")
+    assert [n["id"] for n in tree["nodes"]] == [10, 11, 12, 13, 14]
+    assert len(tree["links"]) == 5
+    assert tree["truncated"] is False
+
+def test_subtree_depth_and_truncation_are_breadth_first():
+    snapshot = build_snapshot()
+    assert [n["id"] for n in snapshot.subtree("Root", depth=1)["nodes"]] == [10, 11, 12]
+
+    tree = snapshot.subtree("Root", max_nodes=3)
+    assert tree["truncated"] is True
+    assert {n["id"] for n in tree["nodes"]} == {10, 11, 12}
+    assert {(l["from_id"], l["to_id"]) for l in tree["links"]} == {(10, 11), (10, 12)}
+
+def test_subtree_unknown_name():
+    assert build_snapshot().subtree("Nobody") is None
+
+@pytest.fixture
+def snapshot_mode():
+    org_snapshot.snapshot = build_snapshot()
+    yield org_snapshot
+    org_snapshot.snapshot = None
+
+def test_get_employee_served_from_snapshot(test_client, mock_neo4j_credentials, mock_neo4j_async_driver, snapshot_mode):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_session.run.reset_mock()
+
+    response = test_client.get("/employee?name=B")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [n["fullName"] for n in data["nodes"]] == ["B", "B1", "Root", "A", "A1"]
+    mock_session.run.assert_not_called()
+
+def test_is_under_uses_intervals_and_walks_when_inexact():
+    records = [EmployeeRecord(1, dfsIn=0, dfsOut=2, dfsExact=True), EmployeeRecord(2, dfsIn=1, dfsOut=1, dfsExact=True),
+               EmployeeRecord(3, dfsIn=2, dfsOut=2, dfsExact=True)]
+    snapshot = OrgSnapshot(records, [(1, 2), (1, 3)])
+    assert snapshot.is_under(2, 1) is True
+    assert snapshot.is_under(1, 2) is False
+    assert snapshot.is_under(2, 2) is False
+    assert snapshot.is_under(2, 404) is None
+
+    # Unlabelled cycle: falls back to walking the manager's subtree
+    cyclic = build_snapshot()
+    assert cyclic.is_under(10, 14) is True
+    assert cyclic.is_under(11, 12) is True
+
+def test_chain_follows_parents_and_stops_on_cycle():
+    snapshot = build_snapshot()
+    assert [n["id"] for n in snapshot.chain(13)] == [13, 11, 10, 14, 12]
+    assert snapshot.chain(999) is None
+
+def test_chain_with_two_managers_takes_the_longest_line():
+    # 5 reports to 3 (under 1) and to 2; 6 reports to the roots 2 and 4
+    records = [EmployeeRecord(i) for i in range(1, 7)]
+    snapshot = OrgSnapshot(records, [(1, 3), (3, 5), (2, 5), (4, 6), (2, 6)])
+    # Same rule as CHAINS_QUERY: longest path first, then the smaller ids
+    assert [n["id"] for n in snapshot.chain(5)] == [5, 3, 1]
+    assert [n["id"] for n in snapshot.chain(6)] == [6, 2]
+    assert [n["id"] for n in snapshot.chain(5, max_length=1)] == [5, 2]
+
+def test_chains_served_from_snapshot(test_client, mock_neo4j_credentials, mock_neo4j_async_driver, snapshot_mode):
+    response = test_client.post("/employees/chains", json={"ids": [11, 404]})
+    data = response.json()
+    assert [n["fullName"] for n in data["chains"][0]["chain"]] == ["A", "Root", "B1", "B"]
+    assert data["missing"] == [404]
+
+def test_subtrees_share_nodes_and_report_membership():
+    result = build_snapshot().subtrees([("name", "A"), ("id", 12), ("name", "Nobody")], depth=1)
+    assert [n["id"] for n in result["nodes"]] == [11, 13, 12, 14]
+    assert {(l["from_id"], l["to_id"]) for l in result["links"]} == {(11, 13), (12, 14)}
+    assert [(r["key"], r["members"]) for r in result["roots"]] == [("A", [11, 13]), (12, [12, 14])]
+    assert result["missing"] == [{"by": "name", "key": "Nobody"}]
+
+def test_subtrees_endpoint_served_from_snapshot(test_client, mock_neo4j_credentials, mock_neo4j_async_driver, snapshot_mode):
+    mock_driver, mock_session = mock_neo4j_async_driver
+    mock_session.run.reset_mock()
+
+    response = test_client.post("/employees/subtrees", json={"names": ["Root", "B"]})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert len(data["nodes"]) == 5
+    assert [r["members"] for r in data["roots"]] == [[10, 11, 12, 13, 14], [12, 14, 10, 11, 13]]
+    mock_session.run.assert_not_called()
+
+def test_subtrees_endpoint_serves_nameless_manager_from_snapshot(test_client, mock_neo4j_credentials,
+                                                                  mock_neo4j_async_driver):
+    org_snapshot.snapshot = OrgSnapshot([EmployeeRecord(20, email="boss@x.com"), EmployeeRecord(21, fullName="Jo")],
+                                        [(20, 21)])
+    try:
+        response = test_client.post("/employees/subtrees", json={"emails": ["boss@x.com"]})
+    finally:
+        org_snapshot.snapshot = None
+    assert response.status_code == status.HTTP_200_OK
+    assert [n["fullName"] for n in response.json()["nodes"]] == [None, "Jo"]
@@ -0,0 +1,47 @@
+from app.validation import validate_org
+
+def entries(*rows):
+    # (email, manager email) pairs; the manager reference is the email itself
+    return [(n, email, manager or '', manager) for n, (email, manager) in enumerate(rows, 1)]
+
+def test_valid_tree_passes():
+    report, blocked = validate_org(entries(("a", None), ("b", "a"), ("c", "b")))
+    assert report.counts == {}
+    assert report.roots == 1
+    assert not report.blocking
+    assert blocked == set()
+
+def test_self_manager_and_cycle_block_their_rows():
+    # d manages itself; e -> f -> g -> e; h reports into the cycle but is not on it
+    report, blocked = validate_org(entries(
+        ("a", None), ("d", "d"), ("e", "g"), ("f", "e"), ("g", "f"), ("h", "g"),
+    ))
+    assert report.blocking
+    assert report.counts == {"self_manager": 1, "cycle": 3}
+    assert blocked == {"d", "e", "f", "g"}
+    assert [(i.row, i.email, i.manager) for i in report.issues if i.kind == "cycle"] == [
+        (3, "e", "g"), (4, "f", "e"), (5, "g", "f"),
+    ]
+
+def test_orphans_roots_and_second_managers_are_reported_only():
+    rows = entries(("a", None), ("b", None), ("c", "a"), ("c", "b"), ("d", "db@x.com"), ("e", "gone@x.com"))
+    rows.append((7, "f", "Nobody Known", None))
+    report, blocked = validate_org(rows, known_emails={"db@x.com"})
+    assert report.counts == {"multiple_roots": 2, "multiple_managers": 1, "orphan": 2}
+    assert {i.email for i in report.issues if i.kind == "orphan"} == {"e", "f"}
+    assert not report.blocking
+    assert blocked == set()
+
+def test_roots_are_counted_per_employee():
+    # a has no manager on two rows; b has one on a later row, so only a is a root
+    report, _ = validate_org(entries(("a", None), ("a", None), ("b", None), ("b", "a")))
+    assert report.roots == 1
+    assert "multiple_roots" not in report.counts
+
+def test_long_chain_does_not_recurse():
+    n = 50000
+    rows = entries(*[(f"e{i}", f"e{i + 1}" if i + 1 < n else "e0") for i in range(n)])
+    report, blocked = validate_org(rows)
+    assert report.counts == {"cycle": n}
+    assert len(report.issues) == 100
+    assert len(blocked) == n
@@ -1,8 +1,17 @@
-import React, {useState} from 'react'
+import React, {useEffect, useState} from 'react'
 
 export default function SearchForm({apiUrl, onResult}){
   const [name, setName] = useState('')
   const [err, setErr] = useState('')
+  const [suggestions, setSuggestions] = useState([])
+  useEffect(()=>{
+    if(name.length < 2) return setSuggestions([])
+    const timer = setTimeout(async ()=>{
+      const res = await fetch(`${apiUrl}/employees/search?q=${encodeURIComponent(name)}`)
+      if(res.ok) setSuggestions((await res.json()).results)
+    }, 150)
+    return ()=>clearTimeout(timer)
+  }, [name, apiUrl])
   const onSearch = async (e)=>{
     e.preventDefault()
     if(!name) return setErr('Enter full name')
@@ -15,7 +24,10 @@ export default function SearchForm({apiUrl, onResult}){
     <div>
       <h3>Search Employee</h3>
       <form onSubmit={onSearch}>
-        <input value={name} onChange={(e)=>setName(e.target.value)} placeholder='First Last' />
+        <input value={name} onChange={(e)=>setName(e.target.value)} placeholder='First Last' list='employee-suggestions' />
+        <datalist id='employee-suggestions'>
+          {suggestions.map((s)=><option key={s.id} value={s.fullName}>{s.email}</option>)}
+        </datalist>
         <button type='submit'>Search</button>
       </form>
       <div style={{color:'red'}}>{err}</div>
@@ -11,8 +11,15 @@ export default function UploadForm({apiUrl}){
     const apiKey = localStorage.getItem('orgchart_admin_api_key')
     const headers = apiKey ? { 'X-API-Key': apiKey } : undefined
     const res = await fetch(apiUrl + '/upload', {method: 'POST', body: fd, headers})
-    const j = await res.json()
+    let j = await res.json()
     setMsg(JSON.stringify(j))
+    // The import runs in the background; poll until the job finishes
+    while(res.ok && (j.status === 'queued' || j.status === 'running')){
+      await new Promise((resolve)=>setTimeout(resolve, 1000))
+      const poll = await fetch(`${apiUrl}/imports/${j.job_id}`, {headers})
+      j = await poll.json()
+      setMsg(JSON.stringify(j))
+    }
   }
   return (
     <div>
@@ -7,6 +7,11 @@ Usage:
 
 This will generate a new API key, overwrite the existing SSM SecureString parameter, and optionally print the new key.
 Note: You must have AWS credentials with permission to put_parameter for the specified name.
+
+Backends cache the key for ADMIN_KEY_CACHE_TTL_SECONDS and pick up the new one
+on expiry (or as soon as a client presents it). After that they keep accepting
+the previous key for ADMIN_KEY_ROTATION_OVERLAP_SECONDS (default 300), so
+clients can switch over without failed uploads.
 """
 import argparse
 import secrets
@@ -32,6 +37,7 @@ try:
         Overwrite=True
     )
     print(f"Rotated key stored in SSM parameter: {args.name} (region={args.region})")
+    print("Backends keep accepting the previous key for ADMIN_KEY_ROTATION_OVERLAP_SECONDS after they pick up the new one")
     if args.print_key:
         print(f"New key: {new_key}")
 except Exception as e: